@@ -0,0 +1,242 @@
+"""
+일정 계산/Dash callback 성능 측정
+
+    python -m benchmarks.run --output benchmark.json
+    python -m benchmarks.run --quick --compare benchmark.json
+
+결과는 JSON 으로 저장하고, --compare 로 이전 결과와 비교한다.
+"""
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# show_schedule 측정이 기존 캐시를 쓰지 않도록 임시 파일 사용
+os.environ.setdefault(
+    "SCHEDULE_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "benchmark_cache.sqlite3")
+)
+# 서버 시작용 warm-up 은 측정에 섞이지 않도록 끈다 (bench_startup 에서 따로 측정)
+os.environ.setdefault("SCHEDULE_WARMUP", "off")
+
+from src import production  # noqa: E402
+
+# 연휴가 낀 시작일 (추석, 설날, 연말)
+HOLIDAY_HEAVY_STARTS = ["2022-09-08", "2023-01-20", "2023-09-27", "2024-02-08", "2024-12-24"]
+DEFAULT_DURATIONS = dict(
+    injection_time=1, curing_time=1, cooling_time=1, mold_reset_time=1,
+    mold_preheating_time=1, drying_time=1, outsourcing_time=1, final_touch_time=1,
+    working_time_min=9, working_time_max=16,
+)
+FLAG_NAMES = ["work_on_saturday", "work_on_sunday", "work_on_holiday", "three_day_shift"]
+
+
+def measure(function, repeat, number=1):
+    """function 을 number 번 호출하는 시간을 repeat 번 측정 [초]"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        "repeat": repeat,
+        "number": number,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+    }
+
+
+def bench_check_if_working_day(quick):
+    times = [
+        datetime.datetime(2022, 1, 1) + datetime.timedelta(hours=h) for h in range(0, 24 * 365, 7)
+    ]
+    results = []
+    for flags in itertools.product([False, True], repeat=4):
+        def run():
+            for t in times:
+                production.check_if_working_day(t, 9, 16, *flags)
+        timing = measure(run, repeat=3 if quick else 5)
+        timing["calls_per_second"] = len(times) / timing["min"]
+        results.append({
+            "name": "check_if_working_day",
+            "params": dict(zip(FLAG_NAMES, flags)),
+            **timing,
+        })
+    return results
+
+
+def bench_calculate_production_time(quick):
+    sizes = [1, 100, 1000] if quick else [1, 10, 100, 1000, 10000]
+    functions = [production.calculate_production_time, production.calculate_production_time_batch]
+    results = []
+    for function in functions:
+        for num_joints in sizes:
+            # 모든 근무 조건 조합은 중간 크기까지만, 가장 큰 크기는 기본 조건만 측정
+            flag_sets = (
+                itertools.product([False, True], repeat=4)
+                if num_joints <= 1000 else [(False, False, False, False)]
+            )
+            for flags in flag_sets:
+                for start_time in HOLIDAY_HEAVY_STARTS[:2] if quick else HOLIDAY_HEAVY_STARTS:
+                    timing = measure(
+                        lambda: function(
+                            num_joints, start_time, **DEFAULT_DURATIONS,
+                            **dict(zip(FLAG_NAMES, flags)),
+                        ),
+                        repeat=1 if num_joints >= 1000 else 3,
+                    )
+                    results.append({
+                        "name": function.__name__,
+                        "params": dict(
+                            num_joints=num_joints, start_time=start_time,
+                            **dict(zip(FLAG_NAMES, flags)),
+                        ),
+                        **timing,
+                    })
+    return results
+
+
+def bench_show_schedule(quick):
+    from plotly.io.json import to_json_plotly
+    from src import app
+
+    results = []
+    for num_joints in [1, 50, 200] if quick else [1, 50, 200, 1000]:
+        params = (
+            "154kV", num_joints, HOLIDAY_HEAVY_STARTS[0], 9, 16,
+            1, 1, 1, 1, 1, 1, 1, 1, False, False, False, False,
+        )
+
+        # cold: 캐시/checkpoint 없이 계산 + 그래프 생성 + 직렬화
+        def cold():
+            app.schedule_cache.clear()
+            app.incremental_scheduler = app.IncrementalScheduler()
+            to_json_plotly(app.show_schedule(*params))
+
+        # warm: 캐시에 있는 그래프 반환 + 직렬화
+        def warm():
+            to_json_plotly(app.show_schedule(*params))
+
+        for name, function in [("cold", cold), ("warm", warm)]:
+            timing = measure(function, repeat=3)
+            output = to_json_plotly(app.show_schedule(*params))
+            results.append({
+                "name": f"show_schedule_{name}",
+                "params": dict(num_joints=num_joints, plot_mode=app.PLOT_MODE),
+                "payload_bytes": len(output),
+                **timing,
+            })
+    return results
+
+
+def bench_startup(quick):
+    """새 프로세스에서 src.app import + warm-up 시간 (app.BOOT_TIMES)"""
+    code = (
+        "import json, time; started = time.perf_counter(); from src import app; "
+        "print(json.dumps({**app.BOOT_TIMES, 'total': time.perf_counter() - started}))"
+    )
+    results = []
+    for warmup in ["off", "sync"]:
+        runs = []
+        for _ in range(3 if quick else 5):
+            env = dict(os.environ, SCHEDULE_WARMUP=warmup,
+                       SCHEDULE_CACHE_PATH=os.path.join(tempfile.mkdtemp(), "startup.sqlite3"))
+            output = subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env,
+            ).stdout
+            runs.append(json.loads(output.splitlines()[-1]))
+        totals = [run["total"] for run in runs]
+        results.append({
+            "name": "app_startup",
+            "params": dict(warmup=warmup),
+            "repeat": len(runs),
+            "number": 1,
+            "min": min(totals),
+            "median": statistics.median(totals),
+            "mean": statistics.fmean(totals),
+            "import_seconds": statistics.median(run["import"] for run in runs),
+            "warmup_seconds": statistics.median(run.get("warmup", 0.0) for run in runs),
+        })
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    versions = {}
+    for package in ["numpy", "pandas", "holidays", "plotly", "dash"]:
+        try:
+            versions[package] = __import__(package).__version__
+        except ImportError:
+            versions[package] = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "packages": versions,
+    }
+
+
+def result_key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(results, baseline_path):
+    """이전 결과 대비 min 시간 비율 출력 (1 보다 크면 느려짐)"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {result_key(result): result for result in json.load(f)["results"]}
+    for result in results:
+        old = baseline.get(result_key(result))
+        if old is None:
+            continue
+        ratio = result["min"] / old["min"] if old["min"] else float("inf")
+        flag = "  <-- slower" if ratio > 1.2 else ""
+        print(f"{result['name']:40s} {json.dumps(result['params'], ensure_ascii=False)} "
+              f"{ratio:6.2f}x{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default="benchmark.json", help="결과 JSON 파일")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--quick", action="store_true", help="작은 크기만 측정")
+    parser.add_argument(
+        "--only", choices=["calendar", "schedule", "app", "startup"], action="append",
+        help="일부만 측정 (여러 번 지정 가능)",
+    )
+    args = parser.parse_args(argv)
+
+    suites = {
+        "calendar": bench_check_if_working_day,
+        "schedule": bench_calculate_production_time,
+        "app": bench_show_schedule,
+        "startup": bench_startup,
+    }
+    results = []
+    for name in args.only or suites:
+        print(f"running {name} ...", file=sys.stderr)
+        results.extend(suites[name](args.quick))
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"meta": metadata(), "results": results}, f, ensure_ascii=False, indent=1)
+    print(f"saved {len(results)} results to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+gunicorn 설정 (Procfile: gunicorn -c gunicorn.conf.py src.app:server)
+
+preload_app 이면 master 에서 app 을 한 번 import 하고 warm-up(달력, 기본 일정)까지
+마친 뒤 worker 를 fork 한다. worker 는 import 없이 바로 요청을 받고, 미리 만든
+달력 배열은 worker 끼리 copy-on-write 로 공유한다.
+GUNICORN_PRELOAD=0 이면 worker 마다 import 한다.
+
+worker 수, bind 주소는 gunicorn 기본값(WEB_CONCURRENCY, PORT 환경 변수)을 따른다.
+"""
+import gc
+import os
+import time
+
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1").lower() not in ("0", "false", "no")
+
+# fork 전에 master 에서 thread 를 띄우면 안 되므로 preload 에서는 warm-up 을 바로 실행
+if preload_app and os.environ.get("SCHEDULE_WARMUP", "sync") == "background":
+    os.environ["SCHEDULE_WARMUP"] = "sync"
+
+_started = time.perf_counter()
+
+
+def _boot_times():
+    from src import app
+    return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in app.BOOT_TIMES.items())
+
+
+def when_ready(server):
+    if preload_app:
+        # import 때 만든 객체를 GC 가 건드리지 않게 해 fork 후 page 복사를 줄인다
+        gc.freeze()
+        server.log.info("app preloaded (%s), ready in %.2fs", _boot_times(), time.perf_counter() - _started)
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        worker.log.info("worker %s loaded app (%s)", worker.pid, _boot_times())
@@ -0,0 +1,129 @@
+"""
+MES/ERP 연동용 일정 계산 API (app.py 의 /api/schedule, /api/schedule/batch)
+
+입력값은 calculate_production_time 과 같고 (cli 시나리오와 같은 규칙으로 변환,
+num_molds/working_time_mode 등은 없어도 된다) 결과는 compact JSON 또는 Arrow IPC stream.
+정수 입력값은 소수 부분이 없어야 하고, 참/거짓 입력값은 /export/schedule 처럼
+true/false 만 받는다.
+
+    JSON  : 접속재마다 공정 7개의 시작/종료 시간 ("YYYY-MM-DDTHH:MM:SS", 현지 시간)
+    Arrow : Scenario, Number, Process, Start, Finish (+ Mold) 열 (pyarrow 필요)
+
+같은 입력이면 같은 일정이 나오므로 ETag 는 입력값 + holidays 버전으로 만든다.
+If-None-Match 가 맞으면 계산하지 않고 304 를 돌려준다.
+"""
+import hashlib
+import json
+
+import numpy as np
+
+from . import metrics
+from .calendar_store import holidays_version
+from .production import FLAG_PARAMS, PROCESS_NAMES, calculate_schedule_arrays
+from .validation import DURATION_PARAMS, validate_schedule_inputs
+
+ARROW_MIMETYPE = "application/vnd.apache.arrow.stream"
+API_FORMATS = ["json", "arrow"]
+# 일정 계산 방식이나 응답 모양이 바뀌면 올려서 예전 ETag 를 무효로 만든다
+API_VERSION = 1
+# 참/거짓 입력값 (JSON true/false 또는 query string 의 "true"/"false")
+API_BOOLEAN_STRINGS = {"true": True, "false": False}
+
+
+def parse_api_params(data):
+    """
+    요청 값(dict, query string)을 calculate_schedule_arrays 입력값으로 변환
+
+    Raises
+    ------
+    ValueError : 없는 값, 잘못된 값 (메시지에 모든 오류)
+    """
+    from .cli import parse_scenario
+
+    if not hasattr(data, "get"):
+        raise ValueError("입력값은 JSON object 여야 합니다")
+    try:
+        params = parse_scenario(data, boolean_strings=API_BOOLEAN_STRINGS)
+    except (TypeError, ValueError) as error:
+        raise ValueError(str(error))
+    params.pop("scenario", None)
+    errors = validate_schedule_inputs(
+        params["num_joints"], params["start_time"], params["working_time_min"],
+        params["working_time_max"], params["num_molds"],
+        **{name: params[name] for name in DURATION_PARAMS},
+    )
+    if errors:
+        raise ValueError(" / ".join(errors))
+    return params
+
+
+def schedule_etag(scenarios, file_format):
+    """입력값 목록과 응답 형식으로 만든 ETag (따옴표 제외)"""
+    key = json.dumps([API_VERSION, holidays_version(), file_format, scenarios], sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+@metrics.timed("api_schedule")
+def run_scenarios(scenarios):
+    """
+    입력값 목록의 일정 (ScheduleArrays 목록, 입력 순서대로)
+
+    근무 조건이 같은 것끼리 이어서 계산해 달력 하나를 만들어 함께 쓴다.
+    """
+    def calendar_key(i):
+        scenario = scenarios[i]
+        return (scenario["working_time_min"], scenario["working_time_max"],
+                *(scenario[name] for name in FLAG_PARAMS))
+
+    schedules = [None] * len(scenarios)
+    for i in sorted(range(len(scenarios)), key=calendar_key):
+        schedules[i] = calculate_schedule_arrays(**scenarios[i])
+    return schedules
+
+
+def schedule_json(params, schedule):
+    """일정 1개의 JSON 응답 (dict)"""
+    result = {
+        "params": params,
+        "processes": PROCESS_NAMES,
+        "start": np.datetime_as_string(schedule.start_times(), unit="s").tolist(),
+        "finish": np.datetime_as_string(schedule.finish_times(), unit="s").tolist(),
+        "finish_time": None,
+    }
+    last_finish = schedule.last_finish()
+    if last_finish is not None:
+        result["finish_time"] = last_finish.isoformat(timespec="seconds")
+    if schedule.molds is not None:
+        result["molds"] = (schedule.molds + 1).tolist()
+    return result
+
+
+def check_arrow():
+    """Arrow 응답에 필요한 pyarrow 가 없으면 안내 메시지 (있으면 None)"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "Arrow 로 받으려면 서버에 pyarrow 가 필요합니다 (pip install pyarrow)"
+    return None
+
+
+def schedule_arrow(schedules):
+    """일정 목록을 Arrow IPC stream bytes 로 변환 (Scenario 열은 입력 순서 0, 1, ...)"""
+    import pyarrow as pa
+
+    sink = pa.BufferOutputStream()
+    writer = None
+    for i, schedule in enumerate(schedules):
+        df = schedule.to_frame()
+        df.insert(0, "Scenario", i)
+        df["Number"] = df["Number"].astype(str)
+        df["Process"] = df["Process"].astype(str)
+        # 금형 수가 시나리오마다 달라도 schema 가 같도록 항상 Mold 열을 쓴다
+        df["Mold"] = df["Mold"].astype(str) if "Mold" in df else "mold_1"
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if writer is None:
+            writer = pa.ipc.new_stream(sink, table.schema)
+        writer.write_table(table)
+    if writer is not None:
+        writer.close()
+    return sink.getvalue().to_pybytes()
@@ -1,17 +1,94 @@
-from dash import Dash, html, dcc, Input, Output
+import time
+_import_started = time.perf_counter()
+
+from dash import Dash, html, dcc, Input, Output, State, Patch
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
-from dash_bootstrap_templates import load_figure_template
-import plotly.express as px
 import datetime
-from .production import check_if_working_day, calculate_production_time
+import json
+import os
+import sys
+import threading
+from flask import Response, jsonify, request, stream_with_context
+from .production import LATEST_SCHEDULE_TIME, check_if_working_day
+from .gantt import (
+    GANTT_MODES, choose_layout, drilldown_frame, figure_title, make_gantt_figure,
+    make_timeline_figure,
+)
+from .api import (
+    API_FORMATS, ARROW_MIMETYPE, check_arrow, parse_api_params, run_scenarios, schedule_arrow,
+    schedule_etag, schedule_json,
+)
+from .export import EXPORT_FORMATS, check_dependencies, content_disposition, iter_export
+from .incremental import IncrementalScheduler
+from .optimizer import find_cheapest_plan, parse_deadline
+from .schedule_cache import cache_from_env, normalize_params
+from .validation import (
+    DAY_PARAMS, DURATION_PARAMS, HOLIDAY_FACTOR, MAX_DURATION_DAYS, MAX_DURATION_HOURS, MAX_YEAR,
+    MIN_YEAR, WAIT_DAYS, WEEK_FACTOR, validate_schedule_inputs,
+)
+from . import metrics
+
+# 그래프 출력 방식
+#   SCHEDULE_PLOT_MODE : "graph"  -> dcc.Graph 에 figure JSON 만 전송 (변경분은 Patch)
+#                        "iframe" -> 기존처럼 fig.to_html() 을 Iframe 에 전송
+#   SCHEDULE_PLOTLY_JS : "local"  -> plotly.js 등 JS 를 서버에서 제공
+#                        "cdn"    -> JS 를 CDN 에서 받음
+PLOT_MODE = os.environ.get("SCHEDULE_PLOT_MODE", "graph")
+PLOTLY_JS = os.environ.get("SCHEDULE_PLOTLY_JS", "local")
+
+# 접속재 수에 따른 그래프 종류 (gantt.py 참고)
+#   SCHEDULE_GANTT_MODE  : "auto" (기본), "timeline", "swimlane", "utilization"
+#   SCHEDULE_GANTT_LARGE : auto 일 때 이 수량까지 timeline (기본 200)
+#   SCHEDULE_GANTT_HUGE  : auto 일 때 이 수량까지 swimlane, 넘으면 utilization (기본 5000)
+GANTT_MODE = os.environ.get("SCHEDULE_GANTT_MODE", "auto")
+if GANTT_MODE not in GANTT_MODES:
+    raise ValueError(f"SCHEDULE_GANTT_MODE 는 {', '.join(GANTT_MODES)} 중 하나여야 합니다")
+GANTT_LARGE_JOINTS = int(os.environ.get("SCHEDULE_GANTT_LARGE", 200))
+GANTT_HUGE_JOINTS = int(os.environ.get("SCHEDULE_GANTT_HUGE", 5000))
+
+# 입력 방식
+#   SCHEDULE_INPUT_MODE : "debounce" -> Enter 를 누르거나 입력창을 벗어날 때 계산
+#                         "submit"   -> '계산' 버튼을 누를 때 계산
+#                         "live"     -> 입력할 때마다 계산
+# 어느 방식이든 잘못된 값(작성 중인 날짜 등)은 브라우저에서 걸러 서버로 보내지 않는다.
+INPUT_MODE = os.environ.get("SCHEDULE_INPUT_MODE", "debounce")
+DEBOUNCE = INPUT_MODE == "debounce"
 
 # Setup app
-app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP],
+           serve_locally=PLOTLY_JS != "cdn")
 server = app.server
 
-PROCESS_NAMES = ["사출", "경화", "냉각", "탈형/조립", "건조", "외주가공", "마무리 작업"]
+# 일정/그래프 캐시 (gunicorn worker 끼리 공유)
+schedule_cache = cache_from_env()
+# 캐시에 없을 때 바뀐 부분만 다시 계산
+incremental_scheduler = IncrementalScheduler()
 
-load_figure_template('LUX')
+# 오래 걸리는 일정 계산을 web worker 밖(별도 프로세스)에서 실행
+#   SCHEDULE_BACKGROUND=1 이면 Dash background callback 사용 (diskcache 필요)
+if os.environ.get("SCHEDULE_BACKGROUND", "").lower() in ("1", "true", "yes"):
+    try:
+        import diskcache
+        from dash import DiskcacheManager
+    except ImportError:
+        raise ImportError(
+            "SCHEDULE_BACKGROUND 를 쓰려면 diskcache 가 필요합니다 (pip install \"dash[diskcache]\")"
+        )
+    background_manager = DiskcacheManager(diskcache.Cache(
+        os.environ.get("SCHEDULE_BACKGROUND_CACHE", schedule_cache.path + ".background")
+    ))
+else:
+    background_manager = None
+
+# 요청별 profile 저장 (SCHEDULE_PROFILE_DIR 지정 시)
+if os.environ.get("SCHEDULE_PROFILE_DIR"):
+    metrics.install_profiler(
+        server, os.environ["SCHEDULE_PROFILE_DIR"],
+        profiler=os.environ.get("SCHEDULE_PROFILER", "cprofile"),
+    )
+
+PROCESS_NAMES = ["사출", "경화", "냉각", "탈형/조립", "건조", "외주가공", "마무리 작업"]
 
 SIDEBAR_STYLE = {
     "background-color": "#f8f9fa",
@@ -38,23 +115,27 @@ tab_1 = dcc.Tab(
         html.Br(),
         html.Br(),
         html.H6('제품명'),
-        dcc.Input(id='product_name', type='text', value="154kV"),
+        dcc.Input(id='product_name', type='text', value="154kV", debounce=DEBOUNCE),
         html.Br(),
         html.Br(),
         html.H6('필요 개수 [개]'),
-        dcc.Input(id='num_joints', type='number', value=1),
+        dcc.Input(id='num_joints', type='number', value=1, debounce=DEBOUNCE),
+        html.Br(),
+        html.Br(),
+        html.H6('금형 수 (같은 금형을 동시에 사용) [개]'),
+        dcc.Input(id='num_molds', type='number', value=1, debounce=DEBOUNCE),
         html.Br(),
         html.Br(),
         html.H6('작업 시작 일 (예시: 2022-08-01)'),
-        dcc.Input(id='start_time', type='text', value='2022-08-01'),
+        dcc.Input(id='start_time', type='text', value='2022-08-01', debounce=DEBOUNCE),
         html.Br(),
         html.Br(),
         html.H6('작업 시작 가능 시간(Early) [시]'),
-        dcc.Input(id='working_time_min', type='number', value=9),
+        dcc.Input(id='working_time_min', type='number', value=9, debounce=DEBOUNCE),
         html.Br(),
         html.Br(),
         html.H6('작업 시작 가능 시간(Late) [시]'),
-        dcc.Input(id='working_time_max', type='number', value=16),
+        dcc.Input(id='working_time_max', type='number', value=16, debounce=DEBOUNCE),
     ], style=tab_style, selected_style=tab_selected_style,
 )
 
@@ -64,35 +145,35 @@ tab_2 =dcc.Tab(
         html.Br(),
         html.Br(),
         html.H6('사출 [시간]'),
-        dcc.Input(id='injection_time', type='number', value=1),
+        dcc.Input(id='injection_time', type='number', value=1, debounce=DEBOUNCE),
         html.Br(),
         html.Br(),
         html.H6('경화 [시간]'),
-        dcc.Input(id='curing_time', type='number', value=1),
+        dcc.Input(id='curing_time', type='number', value=1, debounce=DEBOUNCE),
         html.Br(),
         html.Br(),
         html.H6('냉각 [시간]'),
-        dcc.Input(id='cooling_time', type='number', value=1),
+        dcc.Input(id='cooling_time', type='number', value=1, debounce=DEBOUNCE),
         html.Br(),
         html.Br(),
         html.H6('탈형 및 금형 조립 [시간]'),
-        dcc.Input(id='mold_reset_time', type='number', value=1),
+        dcc.Input(id='mold_reset_time', type='number', value=1, debounce=DEBOUNCE),
         html.Br(),
         html.Br(),
         html.H6('금형 예열 [시간]'),
-        dcc.Input(id='mold_preheating_time', type='number', value=1),
+        dcc.Input(id='mold_preheating_time', type='number', value=1, debounce=DEBOUNCE),
         html.Br(),
         html.Br(),
         html.H6('제품 건조 [일]'),
-        dcc.Input(id='drying_time', type='number', value=1),
+        dcc.Input(id='drying_time', type='number', value=1, debounce=DEBOUNCE),
         html.Br(),
         html.Br(),
         html.H6('외주 가공 [일]'),
-        dcc.Input(id='outsourcing_time', type='number', value=1),
+        dcc.Input(id='outsourcing_time', type='number', value=1, debounce=DEBOUNCE),
         html.Br(),
         html.Br(),
         html.H6('마무리(그라인딩, 차폐 몰딩, 세척/포장 등)[일]'),
-        dcc.Input(id='final_touch_time', type='number', value=1),
+        dcc.Input(id='final_touch_time', type='number', value=1, debounce=DEBOUNCE),
     ], style=tab_style, selected_style=tab_selected_style,
 )
 
@@ -148,14 +229,57 @@ tab_3 = dcc.Tab(
             id='three_day_shift',
             labelStyle={'display': 'block'}
         ),
+        html.Br(),
+        html.Br(),
+        html.H6('사출, 탈형/조립 시간을 작업 시간으로만 계산 (퇴근 후 멈췄다 다음 작업일에 이어서)'),
+        dcc.RadioItems(
+            options=[
+                {'label': "한다", 'value': True},
+                {'label': "안한다", 'value': False}
+            ],
+            value=False,
+            id='working_time_mode',
+            labelStyle={'display': 'block'}
+        ),
+    ], style=tab_style, selected_style=tab_selected_style,
+)
+
+tab_4 = dcc.Tab(
+    label='납기 최적화',
+    children=[
+        html.Br(),
+        html.Br(),
+        html.H6('납기 (예시: 2022-09-30 -> 그날 24 시까지 완료)'),
+        dcc.Input(id='deadline', type='text', value='2022-09-30'),
+        html.Br(),
+        html.Br(),
+        html.H6('작업 시간 최대 연장 [시간]'),
+        dcc.Input(id='max_extra_hours', type='number', value=4),
+        html.Br(),
+        html.Br(),
+        html.Button('최적 근무 계획 찾기', id='optimize_button', n_clicks=0),
+        html.Br(),
+        html.Br(),
+        html.Div(id='optimization_result'),
     ], style=tab_style, selected_style=tab_selected_style,
 )
 
 # plotly plot
-plotly_plot = html.Iframe(
-    id='production_schedule_plot',
-    style={'border-width': '0', 'width': 1100, 'height': 1100}
-    )
+if PLOT_MODE == "iframe":
+    plotly_plot = html.Iframe(
+        id='production_schedule_plot',
+        style={'border-width': '0', 'width': 1100, 'height': 1100}
+        )
+    plot_output = Output('production_schedule_plot', 'srcDoc')
+else:
+    plotly_plot = dcc.Graph(
+        id='production_schedule_plot',
+        style={'width': 1100, 'height': 1100}
+        )
+    plot_output = Output('production_schedule_plot', 'figure')
+
+# swimlane/utilization 그래프를 클릭했을 때 해당 접속재 일정 (graph 모드만)
+drilldown_plot = dcc.Graph(id='drilldown_plot', style={'display': 'none'})
 
 ## App Layout
 
@@ -173,16 +297,35 @@ app.layout = dbc.Container(
                             tab_1,
                             tab_2,
                             tab_3,
+                            tab_4,
                         ]
                         ),
+                        html.Br(),
+                        *([html.Button('계산', id='calculate_button', n_clicks=0)]
+                          if INPUT_MODE == "submit" else []),
+                        html.Div(id='input_error', style={'color': 'red'}),
+                        dcc.Store(id='schedule_params'),
                     ],
                     md=4,
                     style=SIDEBAR_STYLE,
                 ),
                 dbc.Col(
                     [
+                        html.Progress(id='schedule_progress', value=0, max=1,
+                                      style={'visibility': 'hidden', 'width': '100%'}),
                         plotly_plot,
                         html.H6('Note: 커서를 그래프에 대면 상세 일정 조회가 가능합니다.', style={'textAlign': 'center'}),
+                        html.H6(
+                            ['일정 내려받기: ', *[
+                                html.A(file_format.upper(), id=f'export_{file_format}',
+                                       style={'margin-right': '15px'})
+                                for file_format in EXPORT_FORMATS
+                            ]],
+                            style={'textAlign': 'center'},
+                        ),
+                        *([html.H6('수량이 많으면 그래프를 클릭해 해당 접속재 일정을 볼 수 있습니다.',
+                                   style={'textAlign': 'center'}),
+                           drilldown_plot] if PLOT_MODE != "iframe" else []),
                     ],
                     md=8
                 )
@@ -192,49 +335,571 @@ app.layout = dbc.Container(
 )
 
 # Setup callbacks/backend
-@app.callback(
-    Output('production_schedule_plot', 'srcDoc'),
-    Input('product_name', 'value'),
-    Input('num_joints', 'value'),
-    Input('start_time', 'value'),
-    Input('working_time_min', 'value'),
-    Input('working_time_max', 'value'),
-    Input('injection_time', 'value'),
-    Input('curing_time', 'value'),
-    Input('cooling_time', 'value'),
-    Input('mold_reset_time', 'value'),
-    Input('mold_preheating_time', 'value'),
-    Input('drying_time', 'value'),
-    Input('outsourcing_time', 'value'),
-    Input('final_touch_time', 'value'),
-    Input('work_on_saturday', 'value'),
-    Input('work_on_sunday', 'value'),
-    Input('work_on_holiday', 'value'),
-    Input('three_day_shift', 'value'),
+_template_lock = threading.Lock()
+_template_loaded = False
+
 
+def load_template():
+    """그래프 template (LUX) 설정 (plotly 를 불러오므로 처음 그래프를 만들 때 실행)"""
+    global _template_loaded
+    with _template_lock:
+        if not _template_loaded:
+            from dash_bootstrap_templates import load_figure_template
+            load_figure_template('LUX')
+            _template_loaded = True
+
+
+def gantt_layout(num_joints):
+    return choose_layout(num_joints, GANTT_MODE, GANTT_LARGE_JOINTS, GANTT_HUGE_JOINTS)
+
+
+def load_schedule(
+    num_joints, start_time, injection_time, curing_time, cooling_time, mold_reset_time,
+    mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+    working_time_min, working_time_max, work_on_saturday, work_on_sunday,
+    work_on_holiday, three_day_shift, working_time_mode=False, num_molds=1, progress=None,
+):
+    """일정 dataframe (캐시에 없으면 incremental_scheduler 로 계산)"""
+    schedule_params = normalize_params(
+        num_joints, start_time, injection_time, curing_time, cooling_time, mold_reset_time,
+        mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+        working_time_min, working_time_max,
+        work_on_saturday, work_on_sunday, work_on_holiday, three_day_shift, working_time_mode,
+        num_molds,
+    )
+
+    def compute_schedule():
+        with metrics.timer("show_schedule.schedule"):
+            return incremental_scheduler.schedule(
+                num_joints, start_time, injection_time, curing_time, cooling_time, mold_reset_time,
+                mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+                working_time_min, working_time_max,
+                work_on_saturday=work_on_saturday, work_on_sunday=work_on_sunday, 
+                work_on_holiday=work_on_holiday, three_day_shift=three_day_shift,
+                working_time_mode=working_time_mode, num_molds=num_molds, progress=progress,
+            )
+
+    return schedule_cache.get_or_compute("schedule", schedule_params, compute_schedule)
+
+
+SCHEDULE_FIELDS = [
+    'product_name', 'num_joints', 'start_time', 'working_time_min', 'working_time_max',
+    'injection_time', 'curing_time', 'cooling_time', 'mold_reset_time', 'mold_preheating_time',
+    'drying_time', 'outsourcing_time', 'final_touch_time',
+    'work_on_saturday', 'work_on_sunday', 'work_on_holiday', 'three_day_shift',
+    'working_time_mode', 'num_molds',
+]
+
+# 입력값을 브라우저에서 검사해 정상일 때만 schedule_params 에 저장
+# (validation.validate_schedule_inputs 와 같은 규칙)
+app.clientside_callback(
+    """
+    function(...args) {
+        const fields = %(fields)s;
+        const durations = %(durations)s;
+        const values = args.slice(args.length - fields.length);
+        const p = {};
+        fields.forEach((name, i) => { p[name] = values[i]; });
+        const isNumber = (v) => typeof v === 'number' && isFinite(v);
+        const errors = [];
+
+        if (!isNumber(p.num_joints) || p.num_joints < 1 || !Number.isInteger(p.num_joints)) {
+            errors.push('필요 개수는 1 이상의 정수여야 합니다');
+        }
+        if (!isNumber(p.num_molds) || p.num_molds < 1 || !Number.isInteger(p.num_molds)) {
+            errors.push('금형 수는 1 이상의 정수여야 합니다');
+        }
+        const m = /^(\\d{4})-(\\d{2})-(\\d{2})$/.exec(p.start_time || '');
+        const date = m && new Date(Date.UTC(+m[1], +m[2] - 1, +m[3]));
+        if (!m || date.getUTCFullYear() !== +m[1] || date.getUTCMonth() !== +m[2] - 1
+                || date.getUTCDate() !== +m[3]) {
+            errors.push('작업 시작 일은 YYYY-MM-DD 형식이어야 합니다');
+        } else if (+m[1] < %(min_year)d || +m[1] > %(max_year)d) {
+            errors.push('작업 시작 일은 %(min_year)d ~ %(max_year)d 년이어야 합니다');
+        }
+        if (!isNumber(p.working_time_min) || !isNumber(p.working_time_max)
+                || p.working_time_min < 0 || p.working_time_max > 23
+                || p.working_time_min > p.working_time_max) {
+            errors.push('작업 시작 가능 시간은 0 ~ 23 시이고 Early <= Late 여야 합니다');
+        }
+        const dayParams = %(day_params)s;
+        durations.forEach((name) => {
+            const isDays = dayParams.includes(name);
+            const limit = isDays ? %(max_days)d : %(max_hours)d;
+            if (!isNumber(p[name]) || p[name] < 0) {
+                errors.push('소요시간(' + name + ')은 0 이상의 숫자여야 합니다');
+            } else if (p[name] > limit) {
+                errors.push('소요시간(' + name + ')은 ' + limit + (isDays ? ' 일' : ' 시간') + ' 이하여야 합니다');
+            }
+        });
+        // validation.estimate_horizon_days 와 같은 계산
+        if (errors.length === 0) {
+            const hoursPerDay = p.working_time_max - p.working_time_min + 1;
+            const laborDays = ['injection_time', 'mold_reset_time'].reduce(
+                (sum, name) => sum + (p[name] / hoursPerDay + 1) * %(week_factor)s + 1, 0);
+            const cycleDays = laborDays + 2 * %(wait_days)d
+                + (p.curing_time + p.cooling_time + p.mold_preheating_time) / 24;
+            const tailDays = dayParams.reduce((sum, name) => sum + p[name], 0) + 2 * %(wait_days)d + 1;
+            const horizon = ((p.num_joints / p.num_molds + 1) * cycleDays + tailDays) * %(holiday_factor)s;
+            const latest = Date.UTC(%(latest_year)d, %(latest_month)d - 1, %(latest_day)d);
+            if (horizon >= (latest - date) / 86400000) {
+                errors.push('일정이 %(latest)s 이후까지 이어질 수 있습니다 '
+                            + '(필요 개수, 소요시간을 줄이거나 금형 수를 늘려 주세요)');
+            }
+        }
+
+        if (errors.length > 0) {
+            return [window.dash_clientside.no_update, errors.join(' / ')];
+        }
+        const changed = window.dash_clientside.callback_context.triggered
+            .map((t) => t.prop_id.split('.')[0])
+            .filter((id) => id && id !== 'calculate_button');
+        return [{values: values, changed: changed}, ''];
+    }
+    """ % {"fields": json.dumps(SCHEDULE_FIELDS), "durations": json.dumps(DURATION_PARAMS),
+           "min_year": MIN_YEAR, "max_year": MAX_YEAR, "day_params": json.dumps(DAY_PARAMS),
+           "max_days": MAX_DURATION_DAYS, "max_hours": MAX_DURATION_HOURS,
+           "week_factor": json.dumps(WEEK_FACTOR), "wait_days": WAIT_DAYS,
+           "holiday_factor": json.dumps(HOLIDAY_FACTOR), "latest": f"{LATEST_SCHEDULE_TIME:%Y-%m-%d}",
+           "latest_year": LATEST_SCHEDULE_TIME.year, "latest_month": LATEST_SCHEDULE_TIME.month,
+           "latest_day": LATEST_SCHEDULE_TIME.day},
+    Output('schedule_params', 'data'),
+    Output('input_error', 'children'),
+    *([Input('calculate_button', 'n_clicks')] + [State(name, 'value') for name in SCHEDULE_FIELDS]
+      if INPUT_MODE == "submit" else [Input(name, 'value') for name in SCHEDULE_FIELDS]),
 )
+
+
+# 내려받기 링크를 현재 입력값의 /export/schedule.<형식> 주소로 갱신
+# (문자열 입력은 그대로, 나머지는 JSON 으로 query string 에 넣는다)
+app.clientside_callback(
+    """
+    function(params) {
+        const fields = %(fields)s;
+        const formats = %(formats)s;
+        if (!params) {
+            return formats.map(() => window.dash_clientside.no_update);
+        }
+        const query = new URLSearchParams();
+        fields.forEach((name, i) => {
+            const value = params.values[i];
+            query.set(name, typeof value === 'string' ? value : JSON.stringify(value));
+        });
+        return formats.map((format) => '/export/schedule.' + format + '?' + query.toString());
+    }
+    """ % {"fields": json.dumps(SCHEDULE_FIELDS), "formats": json.dumps(list(EXPORT_FORMATS))},
+    *[Output(f'export_{file_format}', 'href') for file_format in EXPORT_FORMATS],
+    Input('schedule_params', 'data'),
+)
+
+
+@metrics.timed("show_schedule")
 def show_schedule(
     product_name, num_joints, start_time, working_time_min, working_time_max,
     injection_time, curing_time, cooling_time, mold_reset_time, mold_preheating_time, 
     drying_time, outsourcing_time, final_touch_time, work_on_saturday, work_on_sunday,
-    work_on_holiday, three_day_shift
+    work_on_holiday, three_day_shift, working_time_mode=False, num_molds=1, progress=None,
+    changed=None,
 ):
-    df = calculate_production_time(
+    """
+    progress : callable, progress(계산된 수량, 전체 수량) 로 진행 상황 전달
+    changed  : 직전 계산 이후 바뀐 입력 id 목록 (없으면 전체 figure 반환)
+    """
+    schedule_args = (
         num_joints, start_time, injection_time, curing_time, cooling_time, mold_reset_time,
         mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
         working_time_min, working_time_max,
-        work_on_saturday=work_on_saturday, work_on_sunday=work_on_sunday, 
-        work_on_holiday=work_on_holiday, three_day_shift=three_day_shift,
+        work_on_saturday, work_on_sunday, work_on_holiday, three_day_shift, working_time_mode,
+        num_molds,
     )
-    fig = px.timeline(df, x_start="Start", x_end="Finish", y="Process", color="Number")
-    fig.update_yaxes(autorange="reversed", title="공정 순서", title_font_size=20)
-    fig.update_xaxes(title="시간", title_font_size=20, dtick="d1")
-    fig.update_layout(autosize=False, height=1000, width=1000, 
-                    title=f"{product_name} 제조 계획", title_font_size=30, title_x=0.5,
-                    showlegend=False)
-    output = fig.to_html()
-
-    return output
+    layout = gantt_layout(num_joints)
+    figure_params = normalize_params(product_name, *schedule_args) + (layout,)
+
+    def render(serialize):
+        df = load_schedule(*schedule_args, progress=progress)
+        with metrics.timer("show_schedule.figure"):
+            load_template()
+            fig = make_gantt_figure(df, product_name, layout)
+        with metrics.timer("show_schedule.serialize"):
+            return serialize(fig)
+
+    if PLOT_MODE == "iframe":
+        include_plotlyjs = "cdn" if PLOTLY_JS == "cdn" else True
+        return schedule_cache.get_or_compute(
+            "figure", figure_params + (include_plotlyjs,),
+            lambda: render(lambda fig: fig.to_html(include_plotlyjs=include_plotlyjs)),
+        )
+
+    changed = set(changed or [])
+
+    # 제품명만 바뀌면 제목만 갱신
+    if changed == {'product_name'}:
+        patched = Patch()
+        patched["layout"]["title"]["text"] = figure_title(product_name, layout)
+        return patched
+
+    figure = schedule_cache.get_or_compute(
+        "figure_json", figure_params,
+        lambda: render(lambda fig: fig.to_plotly_json()),
+    )
+    # 최초 로딩 때만 layout/template 까지 보내고 이후에는 data 와 축만 갱신
+    # (수량이 바뀌어 그래프 종류가 바뀌어도 축/제목은 맞추고, 금형 수가 바뀌면
+    #  금형별 범례를 켜거나 끈다)
+    if not changed:
+        return figure
+    patched = Patch()
+    patched["data"] = figure["data"]
+    for key in ["xaxis", "yaxis", "title", "showlegend"]:
+        patched["layout"][key] = figure["layout"][key]
+    patched["layout"]["legend"] = figure["layout"].get("legend", {})
+    return patched
+
+
+def _schedule_values(params):
+    """schedule_params 저장값을 show_schedule 인자로 변환 (서버에서도 한 번 더 검사)"""
+    if not params:
+        raise PreventUpdate
+    values = dict(zip(SCHEDULE_FIELDS, params["values"]))
+    errors = validate_schedule_inputs(
+        values['num_joints'], values['start_time'], values['working_time_min'],
+        values['working_time_max'], values['num_molds'],
+        **{name: values[name] for name in DURATION_PARAMS},
+    )
+    if errors:
+        raise PreventUpdate
+    return params["values"]
+
+
+if background_manager is None:
+    @app.callback(plot_output, Input('schedule_params', 'data'))
+    def show_schedule_from_inputs(params):
+        return show_schedule(*_schedule_values(params), changed=params.get("changed"))
+else:
+    # 계산은 별도 프로세스에서, 진행률은 progress bar 로 표시
+    # (계산 중 입력이 바뀌면 Dash 가 이전 작업을 중단시킨다)
+    @app.callback(
+        plot_output,
+        Input('schedule_params', 'data'),
+        background=True,
+        manager=background_manager,
+        progress=[Output('schedule_progress', 'value'), Output('schedule_progress', 'max')],
+        progress_default=[0, 1],
+        running=[(Output('schedule_progress', 'style'), {'visibility': 'visible'}, {'visibility': 'hidden'})],
+    )
+    def show_schedule_in_background(set_progress, params):
+        return show_schedule(
+            *_schedule_values(params), progress=lambda done, total: set_progress((done, total)),
+        )
+
+
+if PLOT_MODE != "iframe":
+    @app.callback(
+        Output('drilldown_plot', 'figure'),
+        Output('drilldown_plot', 'style'),
+        Input('production_schedule_plot', 'clickData'),
+        State('schedule_params', 'data'),
+        prevent_initial_call=True,
+    )
+    def show_drilldown(click_data, params):
+        values = dict(zip(SCHEDULE_FIELDS, _schedule_values(params)))
+        if not click_data or gantt_layout(values['num_joints']) == "timeline":
+            return {}, {'display': 'none'}
+        df = load_schedule(**{name: values[name] for name in SCHEDULE_FIELDS[1:]})
+        selected = drilldown_frame(df, click_data["points"][0])
+        if selected is None:
+            return {}, {'display': 'none'}
+        load_template()
+        fig = make_timeline_figure(selected, values['product_name'], height=600)
+        return fig, {'width': 1100, 'height': 650}
+
+
+# SCHEDULE_BACKGROUND 없이 (web worker 안에서) 최적 근무 계획을 찾을 때 최대 접속재 수
+# (계획 수 x 일정 계산이라 3000 개면 10 초 넘게 worker 를 붙잡는다)
+OPTIMIZE_MAX_JOINTS = int(os.environ.get("SCHEDULE_OPTIMIZE_MAX_JOINTS", 500))
+
+optimize_dependencies = [
+    Output('optimization_result', 'children'),
+    Input('optimize_button', 'n_clicks'),
+    State('deadline', 'value'),
+    State('max_extra_hours', 'value'),
+    State('num_joints', 'value'),
+    State('start_time', 'value'),
+    State('working_time_min', 'value'),
+    State('working_time_max', 'value'),
+    State('injection_time', 'value'),
+    State('curing_time', 'value'),
+    State('cooling_time', 'value'),
+    State('mold_reset_time', 'value'),
+    State('mold_preheating_time', 'value'),
+    State('drying_time', 'value'),
+    State('outsourcing_time', 'value'),
+    State('final_touch_time', 'value'),
+    State('working_time_mode', 'value'),
+    State('num_molds', 'value'),
+]
+
+
+def show_cheapest_plan(
+    n_clicks, deadline, max_extra_hours, num_joints, start_time, working_time_min,
+    working_time_max, injection_time, curing_time, cooling_time, mold_reset_time,
+    mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+    working_time_mode=False, num_molds=1, max_joints=None,
+):
+    """최적 근무 계획 (max_joints 보다 접속재가 많으면 계산하지 않고 안내)"""
+    durations = dict(
+        injection_time=injection_time, curing_time=curing_time, cooling_time=cooling_time,
+        mold_reset_time=mold_reset_time, mold_preheating_time=mold_preheating_time,
+        drying_time=drying_time, outsourcing_time=outsourcing_time, final_touch_time=final_touch_time,
+    )
+    errors = validate_schedule_inputs(
+        num_joints, start_time, working_time_min, working_time_max, num_molds, **durations,
+    )
+    try:
+        parse_deadline(deadline)
+    except ValueError as error:
+        errors.append(str(error))
+    if max_extra_hours is not None and not (
+        isinstance(max_extra_hours, (int, float)) and 0 <= max_extra_hours <= 23
+    ):
+        errors.append("작업 시간 최대 연장은 0 ~ 23 시간이어야 합니다")
+    if max_joints is not None and not errors and num_joints > max_joints:
+        errors.append(
+            f"접속재 {max_joints}개 넘게는 SCHEDULE_BACKGROUND=1 로 실행한 서버에서만 찾을 수 있습니다"
+        )
+    if errors:
+        return html.P(' / '.join(errors), style={'color': 'red'})
+
+    result = find_cheapest_plan(
+        deadline, num_joints, start_time, working_time_min=working_time_min,
+        working_time_max=working_time_max, max_extra_hours=int(max_extra_hours or 0),
+        working_time_mode=working_time_mode, num_molds=num_molds, **durations,
+    )
+    if result.plan is None:
+        return html.P(f'{deadline} 까지 끝낼 수 있는 근무 계획이 없습니다. (검토 {result.evaluated}개)')
+
+    plan = result.plan
+    def yes_no(value):
+        return "한다" if value else "안한다"
+    return html.Ul([
+        html.Li(f'작업 시작 가능 시간: {plan.working_time_min}시 ~ {plan.working_time_max}시'),
+        html.Li(f'토요일 근무: {yes_no(plan.work_on_saturday)}'),
+        html.Li(f'일요일 근무: {yes_no(plan.work_on_sunday)}'),
+        html.Li(f'공휴일 근무: {yes_no(plan.work_on_holiday)}'),
+        html.Li(f'3교대: {yes_no(plan.three_day_shift)}'),
+        html.Li(f'완료 예정: {result.finish:%Y-%m-%d %H:%M}'),
+        html.Li(f'연장 근무: {result.overtime_hours} 시간'),
+        html.Li(f'검토한 계획: {result.evaluated}개 (중간 중단 {result.pruned}개)'),
+    ])
+
+
+if background_manager is None:
+    @app.callback(*optimize_dependencies, prevent_initial_call=True)
+    def show_cheapest_plan_inline(*values):
+        return show_cheapest_plan(*values, max_joints=OPTIMIZE_MAX_JOINTS)
+else:
+    # 계획마다 일정을 계산하므로 일정 그래프처럼 별도 프로세스에서 실행
+    @app.callback(
+        *optimize_dependencies,
+        prevent_initial_call=True,
+        background=True,
+        manager=background_manager,
+        running=[(Output('optimize_button', 'disabled'), True, False)],
+    )
+    def show_cheapest_plan_in_background(*values):
+        return show_cheapest_plan(*values)
+
+
+@server.route('/cache/stats')
+def cache_stats():
+    return jsonify(schedule_cache.stats())
+
+
+@server.route('/metrics')
+def prometheus_metrics():
+    cache_gauges = {f"schedule_cache_{name}": value for name, value in schedule_cache.stats().items()}
+    boot_gauges = {f"schedule_boot_{name}_seconds": value for name, value in BOOT_TIMES.items()}
+    return Response(
+        metrics.render_prometheus({**cache_gauges, **boot_gauges}),
+        mimetype="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@server.route('/export/schedule.<file_format>')
+def export_schedule(file_format):
+    """
+    일정 파일 내려받기 (/export/schedule.csv?product_name=154kV&num_joints=30&...)
+
+    query string 은 SCHEDULE_FIELDS (없는 값은 화면 기본값). 화면에서 이미 계산한
+    일정은 캐시(load_schedule)에서 그대로 가져오고, 파일은 조각으로 나눠 보낸다.
+    """
+    if file_format not in EXPORT_FORMATS:
+        return Response(f"형식은 {', '.join(EXPORT_FORMATS)} 중 하나여야 합니다", status=404,
+                        mimetype="text/plain")
+    message = check_dependencies(file_format)
+    if message:
+        return Response(message, status=501, mimetype="text/plain")
+    try:
+        values = _export_values(request.args)
+    except ValueError as error:
+        return Response(str(error), status=400, mimetype="text/plain")
+
+    try:
+        with metrics.timer("export_schedule.schedule"):
+            df = load_schedule(**{name: values[name] for name in SCHEDULE_FIELDS[1:]})
+    except ValueError as error:  # 일정이 계산 가능한 기간을 넘는 경우
+        return Response(str(error), status=400, mimetype="text/plain")
+    metrics.increment("schedule_exports_total", format=file_format)
+    filename = f"{values['product_name'] or 'schedule'}_{values['start_time']}.{file_format}"
+    return Response(
+        stream_with_context(iter_export(df, values['product_name'], file_format)),
+        mimetype=EXPORT_FORMATS[file_format],
+        headers={"Content-Disposition": content_disposition(filename)},
+    )
+
+
+# MES/ERP 연동 API 의 batch 1회 최대 시나리오 수
+API_MAX_BATCH = int(os.environ.get("SCHEDULE_API_MAX_BATCH", 100))
+
+
+@server.route('/api/schedule', methods=['GET', 'POST'])
+def api_schedule():
+    """
+    일정 계산 API (입력값은 query string 또는 JSON body, calculate_production_time 과 같음)
+
+    ?format=arrow 또는 Accept: application/vnd.apache.arrow.stream 이면 Arrow 로 응답
+    """
+    data = request.get_json(silent=True) if request.method == 'POST' else request.args.to_dict()
+    try:
+        scenarios = [parse_api_params(data)]
+    except ValueError as error:
+        return jsonify(error=str(error)), 400
+    return _api_response(scenarios, batch=False)
+
+
+@server.route('/api/schedule/batch', methods=['POST'])
+def api_schedule_batch():
+    """
+    여러 입력값을 한 번에 계산 ({"scenarios": [입력값, ...]} -> {"schedules": [...]})
+
+    근무 조건이 같은 시나리오끼리는 달력을 한 번만 만든다.
+    """
+    data = request.get_json(silent=True) or {}
+    scenarios = data.get("scenarios") if isinstance(data, dict) else None
+    if not isinstance(scenarios, list) or not 1 <= len(scenarios) <= API_MAX_BATCH:
+        return jsonify(error=f"scenarios 는 1 ~ {API_MAX_BATCH} 개의 입력값 목록이어야 합니다"), 400
+    errors = []
+    parsed = []
+    for i, scenario in enumerate(scenarios):
+        try:
+            parsed.append(parse_api_params(scenario))
+        except ValueError as error:
+            errors.append(f"시나리오 {i+1}: {error}")
+    if errors:
+        return jsonify(error=" / ".join(errors)), 400
+    return _api_response(parsed, batch=True)
+
+
+def _api_response(scenarios, batch):
+    """ETag 가 같으면 304, 아니면 계산해 JSON/Arrow 로 응답"""
+    file_format = request.args.get("format") or (
+        "arrow" if request.accept_mimetypes.best == ARROW_MIMETYPE else "json"
+    )
+    if file_format not in API_FORMATS:
+        return jsonify(error=f"format 은 {', '.join(API_FORMATS)} 중 하나여야 합니다"), 400
+    if file_format == "arrow":
+        message = check_arrow()
+        if message:
+            return jsonify(error=message), 501
+
+    etag = schedule_etag(scenarios, file_format)
+    metrics.increment("schedule_api_requests_total", format=file_format, batch=str(batch).lower())
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        try:
+            schedules = run_scenarios(scenarios)
+        except ValueError as error:  # 일정이 계산 가능한 기간을 넘는 경우
+            return jsonify(error=str(error)), 400
+        if file_format == "arrow":
+            response = Response(schedule_arrow(schedules), mimetype=ARROW_MIMETYPE)
+        elif batch:
+            response = jsonify(schedules=[
+                schedule_json(params, schedule) for params, schedule in zip(scenarios, schedules)
+            ])
+        else:
+            response = jsonify(schedule_json(scenarios[0], schedules[0]))
+    response.set_etag(etag)
+    # 매번 ETag 로 확인하게 한다 (바뀌지 않았으면 304)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _export_values(args):
+    """query string 을 SCHEDULE_FIELDS 값으로 변환 (잘못된 값이면 ValueError)"""
+    values = {name: app.layout[name].value for name in SCHEDULE_FIELDS}
+    for name in SCHEDULE_FIELDS:
+        if name not in args:
+            continue
+        if isinstance(values[name], str):
+            values[name] = args[name]
+        else:
+            try:
+                values[name] = json.loads(args[name])
+            except ValueError:
+                raise ValueError(f"{name} 값이 잘못되었습니다: {args[name]}")
+    errors = validate_schedule_inputs(
+        values['num_joints'], values['start_time'], values['working_time_min'],
+        values['working_time_max'], values['num_molds'],
+        **{name: values[name] for name in DURATION_PARAMS},
+    )
+    errors += [f"{name} 은 true 또는 false 여야 합니다" for name in SCHEDULE_FIELDS
+               if isinstance(app.layout[name].value, bool) and not isinstance(values[name], bool)]
+    if errors:
+        raise ValueError(" / ".join(errors))
+    return values
+
+
+def warm_up():
+    """
+    서버 시작 시 미리 계산
+
+    - 화면 기본값의 근무 조건 16가지 달력 (공휴일 표 포함)
+    - 화면 기본값 일정과 그래프 (첫 화면 요청이 캐시에서 바로 나가도록)
+
+    gunicorn --preload 로 master 에서 실행하면 worker 들이 fork 후 달력 배열을
+    copy-on-write 로 공유한다 (gunicorn.conf.py).
+    """
+    import itertools
+    from .working_calendar import get_working_calendar
+
+    defaults = {name: app.layout[name].value for name in SCHEDULE_FIELDS}
+    for flags in itertools.product([False, True], repeat=4):
+        get_working_calendar(defaults['working_time_min'], defaults['working_time_max'], *flags)
+    show_schedule(*(defaults[name] for name in SCHEDULE_FIELDS))
+
+
+# 서버 시작 시간 (import, warm-up) [초], /metrics 와 gunicorn log 로 확인
+#   SCHEDULE_WARMUP : "sync"       -> import 직후 warm_up 실행 (기본, --preload 와 함께 사용)
+#                     "background" -> 별도 thread 로 실행 (요청은 바로 받음, preload 에는 사용 금지)
+#                     "off"        -> 실행 안 함
+BOOT_TIMES = {"import": time.perf_counter() - _import_started}
+WARMUP = os.environ.get("SCHEDULE_WARMUP", "sync")
+
+
+def _timed_warm_up():
+    started = time.perf_counter()
+    try:
+        warm_up()
+    except Exception as error:  # warm-up 실패로 서버가 안 뜨면 안 된다
+        print(f"warm-up failed: {error!r}", file=sys.stderr)
+    BOOT_TIMES["warmup"] = time.perf_counter() - started
+
+
+if WARMUP == "sync":
+    _timed_warm_up()
+elif WARMUP == "background":
+    threading.Thread(target=_timed_warm_up, name="schedule-warmup", daemon=True).start()
+
 
 if __name__ == '__main__':
     app.run_server(debug=True)
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+작업 시간 달력 표를 파일(.npy)로 저장해 프로세스끼리 공유
+
+공휴일 표(holidays.KR)와 근무 조건별 시간 단위 표를 처음 한 번만 만들어 저장하고,
+이후에는 모든 gunicorn worker / batch 작업이 같은 파일을 읽기 전용 memory map 으로
+연다 (복사 없이 OS page cache 공유, holidays import/계산 생략).
+
+파일은 holidays 패키지 버전별 폴더에 저장하므로 버전이 바뀌면 자동으로 다시 만든다.
+(처음 폴더를 정할 때 다른 버전의 폴더는 지운다)
+
+    SCHEDULE_CALENDAR_DIR : 저장 폴더 (기본: 임시 폴더/production_schedule_calendars)
+                            "off" 이면 파일을 쓰지 않고 매번 메모리에서 만든다
+"""
+import os
+import re
+import shutil
+import tempfile
+
+import numpy as np
+
+from . import metrics
+
+# 표 만드는 방식이 바뀌면 올려서 예전 파일을 쓰지 않게 한다
+TABLE_FORMAT = 2
+DEFAULT_CALENDAR_DIR = os.path.join(tempfile.gettempdir(), "production_schedule_calendars")
+# 버전별 폴더 이름 (v{TABLE_FORMAT}-holidays-{버전})
+_VERSION_DIRECTORY = re.compile(r"v\d+-holidays-.+")
+
+_directory = None
+
+
+def holidays_version():
+    """설치된 holidays 패키지 버전 (import 하지 않고 확인)"""
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version("holidays")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def table_directory():
+    """현재 holidays 버전의 표 저장 폴더 (저장하지 않으면 None)"""
+    global _directory
+    if _directory is None:
+        base = os.environ.get("SCHEDULE_CALENDAR_DIR", DEFAULT_CALENDAR_DIR)
+        if base.lower() in ("", "off", "0", "false", "no"):
+            _directory = ""
+        else:
+            _directory = os.path.join(base, f"v{TABLE_FORMAT}-holidays-{holidays_version()}")
+            remove_stale_directories(base, _directory)
+    return _directory or None
+
+
+def remove_stale_directories(base, current):
+    """base 안의 다른 표 형식/holidays 버전 폴더 삭제 (current 는 그대로)"""
+    try:
+        names = os.listdir(base)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(base, name)
+        if _VERSION_DIRECTORY.fullmatch(name) and path != current and os.path.isdir(path):
+            # 이미 열어 둔 memory map 은 파일을 지워도 그대로 쓸 수 있다
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def load_or_build(name, build):
+    """
+    name.npy 를 읽기 전용 memory map 으로 열고, 없으면 build() 결과를 저장한 뒤 연다
+
+    폴더에 쓸 수 없으면 build() 결과를 그대로 반환한다.
+
+    Parameters
+    ----------
+    name  : str
+            파일 이름 (확장자 제외)
+
+    build : callable
+            표(numpy.ndarray)를 만드는 함수
+
+    Returns
+    -------
+    표 : numpy.ndarray (읽기 전용)
+    """
+    directory = table_directory()
+    if directory is None:
+        return _read_only(build())
+
+    path = os.path.join(directory, name + ".npy")
+    try:
+        table = np.load(path, mmap_mode="r")
+        metrics.increment("schedule_calendar_tables_total", source="disk")
+        return table
+    except (OSError, ValueError):
+        pass
+
+    table = build()
+    metrics.increment("schedule_calendar_tables_total", source="built")
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # 다른 프로세스/thread 가 반쯤 쓴 파일을 읽지 않도록 쓰는 쪽마다 따로 만든
+        # 임시 파일에 쓰고 이름을 바꾼다
+        descriptor, temporary = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                np.save(f, table)
+            # mkstemp 은 소유자만 읽을 수 있게 만들므로 open() 으로 만들 때와 같게 맞춘다
+            os.chmod(temporary, 0o644)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        return np.load(path, mmap_mode="r")
+    except OSError:
+        return _read_only(table)
+
+
+def _read_only(table):
+    table.setflags(write=False)
+    return table
@@ -0,0 +1,340 @@
+"""
+시나리오 파일의 일정을 한 번에 계산해 CSV/Parquet 로 저장
+
+    python -m src.cli scenarios.jsonl --output schedules.csv
+    python -m src.cli scenarios.csv --output schedules.parquet --workers 8 --summary
+
+시나리오 파일은 calculate_production_time 입력값을 열(CSV) 또는 key(JSONL)로 갖는다
+(num_molds, working_time_mode 등은 없어도 된다).
+scenario 열이 있으면 결과의 Scenario 열에 쓰고, 없으면 줄 번호를 쓴다.
+입력은 한 줄씩 읽고 결과는 chunk 단위로 파일에 이어 쓰므로 시나리오 수가 많아도
+메모리에 한꺼번에 올리지 않는다.
+
+읽을 수 없는 줄이나 계산에 실패한 시나리오는 건너뛰고 나머지를 계속 계산한다.
+실패한 시나리오는 Scenario, Error 열로 --errors 파일(기본: <output>.errors.csv)에
+쓰고, 하나라도 실패하면 종료 코드 1 로 끝난다.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from collections import deque, namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import pandas as pd
+
+from .production import FLAG_PARAMS, MODE_PARAMS, SCHEDULE_PARAMS, calculate_schedule_arrays
+
+INTEGER_PARAMS = ["num_joints"]
+TEXT_PARAMS = ["start_time"]
+# 없어도 되는 정수 입력값과 기본값
+OPTIONAL_INTEGER_PARAMS = {"num_molds": 1}
+# 참/거짓 입력값으로 읽는 문자열 (그 밖의 값은 오류)
+BOOLEAN_STRINGS = {
+    "1": True, "true": True, "yes": True, "y": True, "t": True,
+    "0": False, "false": False, "no": False, "n": False, "f": False, "": False,
+}
+
+# 읽거나 계산하지 못한 시나리오 (Scenario 열 값, 오류 메시지)
+ScenarioError = namedtuple("ScenarioError", ["scenario", "error"])
+
+
+def read_scenarios(path):
+    """
+    시나리오 파일(.csv 또는 .jsonl)을 한 줄씩 dict 로 반환
+
+    읽을 수 없는 줄은 멈추지 않고 ScenarioError 로 반환한다.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = (line for line in f if line.strip())
+        for i, row in enumerate(rows):
+            name = str(i + 1)
+            try:
+                if isinstance(row, str):
+                    row = json.loads(row)
+                    if not isinstance(row, dict):
+                        raise ValueError("시나리오는 JSON object 여야 합니다")
+                if row.get("scenario") not in (None, ""):
+                    name = str(row["scenario"])
+                scenario = parse_scenario(row)
+            except ValueError as error:
+                yield ScenarioError(name, str(error))
+                continue
+            scenario.setdefault("scenario", name)
+            yield scenario
+
+
+def parse_scenario(row, boolean_strings=BOOLEAN_STRINGS):
+    """
+    CSV 문자열 값을 calculate_production_time 입력 형식으로 변환
+
+    정수 입력값에 소수(1.5)나 inf/nan, 참/거짓 입력값에 boolean_strings 에 없는 값이
+    오면 버리거나 바꾸지 않고 ValueError 를 낸다.
+
+    Raises
+    ------
+    ValueError : 없는 값, 형식이 잘못된 값
+    """
+    missing = [name for name in SCHEDULE_PARAMS if row.get(name) in (None, "")]
+    if missing:
+        raise ValueError(f"시나리오에 입력값이 없습니다: {', '.join(missing)} ({row})")
+
+    scenario = {}
+    if row.get("scenario") not in (None, ""):
+        scenario["scenario"] = str(row["scenario"])
+    for name in SCHEDULE_PARAMS:
+        value = row[name]
+        if name in TEXT_PARAMS:
+            scenario[name] = str(value).strip()
+        elif name in INTEGER_PARAMS:
+            scenario[name] = _parse_integer(name, value)
+        else:
+            scenario[name] = _parse_number(name, value)
+    for name in FLAG_PARAMS + MODE_PARAMS:
+        scenario[name] = _parse_flag(name, row.get(name, False), boolean_strings)
+    for name, default in OPTIONAL_INTEGER_PARAMS.items():
+        value = row.get(name)
+        scenario[name] = default if value in (None, "") else _parse_integer(name, value)
+    return scenario
+
+
+def _parse_number(name, value):
+    """유한한 숫자 (bool, inf, nan 은 오류)"""
+    message = f"{name} 은 숫자여야 합니다: {value!r}"
+    if isinstance(value, bool):
+        raise ValueError(message)
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(message)
+    if not math.isfinite(number):
+        raise ValueError(f"{name} 은 유한한 숫자여야 합니다: {value!r}")
+    return number
+
+
+def _parse_integer(name, value):
+    """소수 부분이 없는 숫자 ("3", 3.0 은 3, 1.5 는 오류)"""
+    number = _parse_number(name, value)
+    if not number.is_integer():
+        raise ValueError(f"{name} 은 정수여야 합니다: {value!r}")
+    return int(number)
+
+
+def _parse_flag(name, value, boolean_strings):
+    """참/거짓 (bool 또는 boolean_strings 에 있는 문자열)"""
+    if isinstance(value, bool):
+        return value
+    text = value.strip().lower() if isinstance(value, str) else str(value)
+    if text not in boolean_strings:
+        choices = ", ".join(key for key in boolean_strings if key)
+        raise ValueError(f"{name} 은 {choices} 중 하나여야 합니다: {value!r}")
+    return boolean_strings[text]
+
+
+def run_scenario(scenario, summary=False):
+    """
+    시나리오 1개 계산
+
+    Returns
+    -------
+    summary=False : 일정 dataframe (+ Scenario 열)
+    summary=True  : 시나리오별 1행 dataframe (시작, 완료, 소요 시간[시간])
+    """
+    params = {
+        name: scenario[name]
+        for name in SCHEDULE_PARAMS + FLAG_PARAMS + MODE_PARAMS + list(OPTIONAL_INTEGER_PARAMS)
+    }
+    schedule = calculate_schedule_arrays(**params)
+    if summary:
+        # 완료 시간만 필요하므로 dataframe 으로 바꾸지 않는다
+        start = pd.Timestamp(schedule.first_start() or pd.NaT)
+        finish = pd.Timestamp(schedule.last_finish() or pd.NaT)
+        return pd.DataFrame({
+            "Scenario": [scenario["scenario"]],
+            **{name: [value] for name, value in params.items()},
+            "Start": [start],
+            "Finish": [finish],
+            "Makespan": [(finish - start) / pd.Timedelta(hours=1)],
+        })
+    df = schedule.to_frame()
+    df.insert(0, "Scenario", scenario["scenario"])
+    df["Number"] = df["Number"].astype(str)
+    df["Process"] = df["Process"].astype(str)
+    # 시나리오마다 금형 수가 달라도 파일의 열이 같도록 항상 Mold 열을 쓴다
+    df["Mold"] = df["Mold"].astype(str) if "Mold" in df else "mold_1"
+    return df
+
+
+def _try_scenario(scenario, summary=False):
+    """run_scenario 와 같지만 실패하면 예외 대신 ScenarioError 를 반환"""
+    if isinstance(scenario, ScenarioError):
+        return scenario
+    try:
+        return run_scenario(scenario, summary=summary)
+    except Exception as error:
+        return ScenarioError(scenario["scenario"], str(error) or type(error).__name__)
+
+
+def iter_results(scenarios, workers=None, summary=False):
+    """
+    시나리오 결과(dataframe, 실패하면 ScenarioError)를 입력 순서대로 반환
+
+    동시에 처리 중인 시나리오 수를 workers * 4 개로 제한해
+    입력 전체를 미리 제출하지 않는다.
+    """
+    if workers == 1:
+        for scenario in scenarios:
+            yield _try_scenario(scenario, summary)
+        return
+
+    def result(item):
+        return item.result() if isinstance(item, Future) else item
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for scenario in scenarios:
+            if isinstance(scenario, ScenarioError):
+                pending.append(scenario)
+            else:
+                pending.append(executor.submit(_try_scenario, scenario, summary))
+            if len(pending) >= workers * 4:
+                yield result(pending.popleft())
+        while pending:
+            yield result(pending.popleft())
+
+
+class CsvWriter:
+    def __init__(self, path):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._header = True
+
+    def write(self, df):
+        df.to_csv(self._file, header=self._header, index=False, date_format="%Y-%m-%d %H:%M:%S")
+        self._header = False
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    def __init__(self, path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("Parquet 로 저장하려면 pyarrow 가 필요합니다 (pip install pyarrow)")
+        self._pyarrow = pyarrow
+        self._path = path
+        self._writer = None
+
+    def write(self, df):
+        table = self._pyarrow.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._writer = self._pyarrow.parquet.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class ErrorWriter:
+    """실패한 시나리오를 Scenario, Error 열의 CSV 로 저장 (첫 실패 때 파일을 만든다)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def write(self, failure):
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["Scenario", "Error"])
+        self._writer.writerow([failure.scenario, failure.error])
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def write_results(results, output, chunk_size=100_000, errors=None):
+    """
+    결과 dataframe 들을 chunk_size 행 단위로 모아 output 에 이어 쓴다
+
+    Parameters
+    ----------
+    results     : iterable of dataframe or ScenarioError
+                  iter_results 결과
+
+    output      : str
+                  결과 파일 (.csv 또는 .parquet)
+
+    chunk_size  : int
+                  한 번에 쓰는 행 수
+
+    errors      : ErrorWriter
+                  실패한 시나리오를 쓸 곳 (None 이면 버린다)
+
+    Returns
+    -------
+    저장한 행 수 : int
+    """
+    writer = ParquetWriter(output) if output.endswith(".parquet") else CsvWriter(output)
+    chunk = []
+    rows = 0
+    total = 0
+    try:
+        for df in results:
+            if isinstance(df, ScenarioError):
+                if errors is not None:
+                    errors.write(df)
+                continue
+            chunk.append(df)
+            rows += len(df)
+            if rows >= chunk_size:
+                writer.write(pd.concat(chunk, ignore_index=True))
+                total += rows
+                chunk, rows = [], 0
+        if chunk:
+            writer.write(pd.concat(chunk, ignore_index=True))
+            total += rows
+    finally:
+        writer.close()
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenarios", help="시나리오 파일 (.csv 또는 .jsonl)")
+    parser.add_argument("--output", required=True, help="결과 파일 (.csv 또는 .parquet)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="한 번에 쓰는 행 수")
+    parser.add_argument("--summary", action="store_true", help="시나리오별 완료 시간만 저장")
+    parser.add_argument("--errors", default=None,
+                        help="실패한 시나리오를 저장할 CSV (기본: <output>.errors.csv)")
+    args = parser.parse_args(argv)
+
+    errors = ErrorWriter(args.errors or args.output + ".errors.csv")
+    results = iter_results(read_scenarios(args.scenarios), workers=args.workers, summary=args.summary)
+    try:
+        total = write_results(results, args.output, chunk_size=args.chunk_size, errors=errors)
+    finally:
+        errors.close()
+    print(f"saved {total} rows to {args.output}", file=sys.stderr)
+    if errors.count:
+        print(f"{errors.count} scenarios failed, see {errors.path}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
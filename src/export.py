@@ -0,0 +1,167 @@
+"""
+일정 dataframe 을 CSV / Excel(xlsx) / iCalendar(ics) 파일로 내려받기
+
+파일 전체를 메모리에 만들지 않고 chunk_size 행씩 변환해 bytes 조각을 yield 한다
+(flask Response 에 generator 로 넘겨 그대로 전송).
+
+    csv   : UTF-8 (BOM 포함, Excel 에서 한글이 깨지지 않게)
+    xlsx  : openpyxl write-only 모드로 임시 파일에 쓴 뒤 조각으로 읽어 보냄 (openpyxl 필요)
+    ics   : 공정마다 VEVENT 1개 (시간대 없는 현지 시간)
+            UID 는 제품명 hash + 일정 시작 시간 + 행 번호라서 같은 일정을 다시 받으면
+            일정이 바뀌어도 기존 event 를 고치고, 다른 제품/시작 시간과는 겹치지 않는다
+"""
+import datetime
+import hashlib
+import tempfile
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "ics": "text/calendar; charset=utf-8",
+}
+
+CHUNK_SIZE = 10_000
+FILE_CHUNK_BYTES = 64 * 1024
+
+
+def iter_export(df, product_name, file_format, chunk_size=CHUNK_SIZE):
+    """file_format("csv", "xlsx", "ics") 파일 내용을 bytes 조각으로 반환"""
+    if file_format == "csv":
+        return iter_csv(df, chunk_size)
+    if file_format == "xlsx":
+        return iter_xlsx(df, product_name, chunk_size)
+    if file_format == "ics":
+        return iter_ics(df, product_name, chunk_size)
+    raise ValueError(f"지원하지 않는 형식입니다: {file_format} ({', '.join(EXPORT_FORMATS)} 중 하나)")
+
+
+def check_dependencies(file_format):
+    """형식에 필요한 패키지가 없으면 안내 메시지 (있으면 None)"""
+    if file_format == "xlsx":
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            return "xlsx 로 내려받으려면 openpyxl 이 필요합니다 (pip install openpyxl)"
+    return None
+
+
+def iter_csv(df, chunk_size=CHUNK_SIZE):
+    header = True
+    for chunk in _chunks(df, chunk_size):
+        text = chunk.to_csv(header=header, index=False, date_format="%Y-%m-%d %H:%M:%S")
+        yield (("\ufeff" if header else "") + text).encode("utf-8")
+        header = False
+
+
+def iter_xlsx(df, product_name, chunk_size=CHUNK_SIZE):
+    """
+    write-only workbook 은 행을 바로 임시 파일에 쓰므로 메모리 사용량이 행 수와 무관하다.
+    xlsx 는 zip 이라 다 쓴 뒤에야 보낼 수 있어 임시 파일을 거친다.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(_sheet_title(product_name))
+    sheet.append(list(df.columns))
+    for chunk in _chunks(df, chunk_size):
+        columns = [
+            chunk[name].dt.to_pydatetime() if name in ("Start", "Finish") else chunk[name].astype(str)
+            for name in df.columns
+        ]
+        for row in zip(*columns):
+            sheet.append(row)
+
+    with tempfile.TemporaryFile() as f:
+        workbook.save(f)
+        f.seek(0)
+        while True:
+            data = f.read(FILE_CHUNK_BYTES)
+            if not data:
+                break
+            yield data
+
+
+def iter_ics(df, product_name, chunk_size=CHUNK_SIZE):
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    uid = _schedule_uid(df, product_name)
+    yield _ics_lines([
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//production-schedule//KO",
+        "CALSCALE:GREGORIAN",
+        f"X-WR-CALNAME:{_ics_text(product_name)} 제조 계획",
+    ])
+    for offset, chunk in _chunks(df, chunk_size, with_offset=True):
+        starts = chunk["Start"].dt.strftime("%Y%m%dT%H%M%S")
+        finishes = chunk["Finish"].dt.strftime("%Y%m%dT%H%M%S")
+        molds = chunk["Mold"].astype(str) if "Mold" in chunk else [None] * len(chunk)
+        lines = []
+        for i, (process, start, finish, mold) in enumerate(
+            zip(chunk["Process"].astype(str), starts, finishes, molds), start=offset
+        ):
+            lines += [
+                "BEGIN:VEVENT",
+                f"UID:{i + 1}-{uid}@production-schedule",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART:{start}",
+                f"DTEND:{finish}",
+                f"SUMMARY:{_ics_text(product_name)} {_ics_text(process)}",
+                *([f"LOCATION:{_ics_text(mold)}"] if mold is not None else []),
+                "END:VEVENT",
+            ]
+        yield _ics_lines(lines)
+    yield _ics_lines(["END:VCALENDAR"])
+
+
+def content_disposition(filename):
+    """한글 파일 이름도 되도록 RFC 5987 형식 Content-Disposition"""
+    from urllib.parse import quote
+
+    fallback = filename.encode("ascii", "replace").decode("ascii").replace("?", "_").replace('"', "_")
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def _chunks(df, chunk_size, with_offset=False):
+    for offset in range(0, len(df), chunk_size):
+        chunk = df.iloc[offset:offset + chunk_size]
+        yield (offset, chunk) if with_offset else chunk
+
+
+def _sheet_title(name):
+    """Excel 시트 이름 규칙 (31자, []:*?/\\ 불가)"""
+    title = "".join("_" if c in '[]:*?/\\' else c for c in str(name))[:31]
+    return title or "schedule"
+
+
+def _ics_text(value):
+    return (str(value).replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _schedule_uid(df, product_name):
+    """UID 의 일정 부분: 첫 공정 시작 시간 + 제품명 hash (한글 제품명끼리도 겹치지 않게)"""
+    start = f"{df['Start'].min():%Y%m%dT%H%M%S}" if len(df) else "empty"
+    digest = hashlib.sha256(str(product_name).encode("utf-8")).hexdigest()[:12]
+    return f"{start}-{digest}"
+
+
+def _ics_lines(lines):
+    """CRLF 로 잇고 75 byte 가 넘는 줄은 접는다 (RFC 5545, UTF-8 글자 중간에서 자르지 않음)"""
+    return "".join(_fold(line) + "\r\n" for line in lines).encode("utf-8")
+
+
+def _fold(line):
+    if len(line.encode("utf-8")) <= 75:
+        return line
+    parts = []
+    current, size, limit = [], 0, 75
+    for c in line:
+        width = len(c.encode("utf-8"))
+        if size + width > limit:
+            parts.append("".join(current))
+            # 이어지는 줄은 맨 앞 공백 1 byte 를 포함해 75 byte
+            current, size, limit = [], 0, 74
+        current.append(c)
+        size += width
+    parts.append("".join(current))
+    return "\r\n ".join(parts)
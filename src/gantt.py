@@ -0,0 +1,238 @@
+"""
+일정 dataframe 으로 Gantt 그래프 생성
+
+접속재가 많으면 px.timeline (공정_번호 마다 한 줄) 은 읽을 수 없고 그래프 JSON 도
+수 MB 가 되므로 수량에 따라 그리는 방식을 바꾼다.
+
+    timeline     : 공정_번호 마다 막대 (기존 방식)
+    swimlane     : 공정마다 한 줄, 모든 접속재 막대를 WebGL 선(Scattergl) 1개로 그림
+    utilization  : 공정별/일별 작업 시간 합계 (heatmap), 크기가 접속재 수와 무관
+
+swimlane/utilization 그래프를 클릭하면 drilldown_frame 으로 해당 접속재들의
+일정만 골라 timeline 으로 볼 수 있다.
+
+pandas/plotly 는 import 가 느려 (서버 시작 시간) 그래프를 만들 때 불러온다.
+"""
+import numpy as np
+
+from .production import PROCESS_NAMES
+from .working_calendar import HOUR_NS
+
+GANTT_MODES = ["auto", "timeline", "swimlane", "utilization"]
+
+# swimlane 에서 겹치는 막대를 구분하기 위해 한 공정 줄을 나누는 칸 수
+SWIMLANE_ROWS = 10
+# utilization 의 최대 칸 수 (기간이 길면 여러 날을 한 칸으로 묶는다)
+UTILIZATION_MAX_COLUMNS = 400
+
+
+def choose_layout(num_joints, mode="auto", large_joints=200, huge_joints=5000):
+    """
+    그래프 방식 결정
+
+    mode 가 "auto" 이면 large_joints 개 이하는 timeline, huge_joints 개 이하는
+    swimlane, 그보다 많으면 utilization.
+    """
+    if mode != "auto":
+        return mode
+    if num_joints <= large_joints:
+        return "timeline"
+    if num_joints <= huge_joints:
+        return "swimlane"
+    return "utilization"
+
+
+def figure_title(product_name, layout="timeline"):
+    if layout == "utilization":
+        return f"{product_name} 공정별 일일 작업 시간"
+    return f"{product_name} 제조 계획"
+
+
+def make_gantt_figure(df, product_name, layout="timeline"):
+    if layout == "swimlane":
+        return make_swimlane_figure(df, product_name)
+    if layout == "utilization":
+        return make_utilization_figure(df, product_name)
+    return make_timeline_figure(df, product_name)
+
+
+def make_timeline_figure(df, product_name, height=1000):
+    """공정_번호 마다 막대 (Mold 열이 있으면 금형별 색, 없으면 접속재별 색)"""
+    import plotly.express as px
+
+    by_mold = "Mold" in df
+    fig = px.timeline(df, x_start="Start", x_end="Finish", y="Process",
+                      color="Mold" if by_mold else "Number",
+                      hover_data=["Number"] if by_mold else None)
+    fig.update_yaxes(autorange="reversed", title="공정 순서", title_font_size=20)
+    fig.update_xaxes(title="시간", title_font_size=20, dtick="d1")
+    fig.update_layout(autosize=False, height=height, width=1000,
+                    title=figure_title(product_name), title_font_size=30, title_x=0.5,
+                    showlegend=by_mold)
+    return fig
+
+
+def make_swimlane_figure(df, product_name):
+    """
+    공정마다 한 줄에 모든 접속재 막대를 그린 그래프 (Scattergl 1개)
+
+    막대는 (시작, 종료, 빈칸) 세 점으로 된 굵은 선이다. 같은 공정에서 겹치는 막대는
+    접속재 번호에 따라 줄 안에서 위아래로 조금씩 옮겨 그린다.
+    """
+    import plotly.graph_objects as go
+
+    stages, joints = _stage_and_joint(df)
+    start = _epoch_ms(df["Start"])
+    finish = _epoch_ms(df["Finish"])
+    offset = (joints % SWIMLANE_ROWS + 0.5) / SWIMLANE_ROWS * 0.8 - 0.4
+
+    # 시간(ms)만 float64, 나머지는 전송량을 줄이기 위해 float32
+    x = np.full(len(df) * 3, np.nan)
+    y = np.full(len(df) * 3, np.nan, dtype=np.float32)
+    joint = np.full(len(df) * 3, np.nan, dtype=np.float32)
+    x[0::3], x[1::3] = start, finish
+    y[0::3] = y[1::3] = stages + offset
+    joint[0::3] = joint[1::3] = joints + 1
+
+    fig = go.Figure(go.Scattergl(
+        x=x, y=y, customdata=joint, mode="lines", connectgaps=False,
+        line={"width": max(1, 40 // SWIMLANE_ROWS)},
+        hovertemplate="접속재 %{customdata}<br>%{x|%Y-%m-%d %H:%M}<extra></extra>",
+    ))
+    fig.update_yaxes(
+        autorange="reversed", title="공정 순서", title_font_size=20,
+        tickvals=list(range(len(PROCESS_NAMES))), ticktext=PROCESS_NAMES,
+    )
+    fig.update_xaxes(type="date", title="시간", title_font_size=20)
+    fig.update_layout(autosize=False, height=1000, width=1000,
+                    title=figure_title(product_name, "swimlane"), title_font_size=30,
+                    title_x=0.5, showlegend=False)
+    return fig
+
+
+def make_utilization_figure(df, product_name):
+    """공정별/일별 작업 시간 합계 heatmap (클릭하면 그날 해당 공정의 접속재 일정)"""
+    import plotly.graph_objects as go
+
+    days, busy_hours = stage_utilization(df)
+    bin_days = _bin_days(len(days))
+    unit = "일" if bin_days == 1 else f"{bin_days}일 단위"
+    fig = go.Figure(go.Heatmap(
+        x=days[::bin_days].strftime("%Y-%m-%d"), y=PROCESS_NAMES,
+        z=_sum_columns(busy_hours, bin_days),
+        colorscale="Blues", colorbar={"title": f"작업 시간<br>({unit})"},
+        hovertemplate="%{y}<br>%{x} 부터<br>%{z:.1f} 시간<extra></extra>",
+    ))
+    fig.update_yaxes(autorange="reversed", title="공정 순서", title_font_size=20)
+    fig.update_xaxes(type="date", title="날짜", title_font_size=20)
+    fig.update_layout(autosize=False, height=1000, width=1000,
+                    title=figure_title(product_name, "utilization"), title_font_size=30,
+                    title_x=0.5, showlegend=False)
+    return fig
+
+
+def stage_utilization(df):
+    """
+    공정별/일별 작업 시간 합계 [시간]
+
+    시각 t 까지의 누적 작업 시간 B(t) = sum(t - start) [start < t] - sum(t - finish) [finish < t]
+    를 날짜 경계마다 구해 차이를 낸다 (정렬 + searchsorted, 막대 수에 대해 O(n log n)).
+
+    Returns
+    -------
+    (날짜 : DatetimeIndex, 작업 시간 : (공정 수, 날짜 수) ndarray) : tuple
+    """
+    import pandas as pd
+
+    if not len(df):
+        return pd.DatetimeIndex([]), np.zeros((len(PROCESS_NAMES), 0))
+    stages, _ = _stage_and_joint(df)
+    start = df["Start"].to_numpy(dtype="datetime64[ns]")
+    finish = df["Finish"].to_numpy(dtype="datetime64[ns]")
+    days = stage_days(df)
+    # 합이 커지지 않도록 첫 날 0 시 기준 [ns]
+    origin = days[0].to_datetime64()
+    bounds = (np.arange(len(days) + 1) * np.timedelta64(1, "D")).astype("timedelta64[ns]").astype(np.int64)
+    start = (start - origin).astype(np.int64)
+    finish = (finish - origin).astype(np.int64)
+
+    busy_hours = np.zeros((len(PROCESS_NAMES), len(days)))
+    for stage in range(len(PROCESS_NAMES)):
+        cumulative = (
+            _cumulative_after(np.sort(start[stages == stage]), bounds)
+            - _cumulative_after(np.sort(finish[stages == stage]), bounds)
+        )
+        busy_hours[stage] = np.diff(cumulative) / HOUR_NS
+    return days, busy_hours
+
+
+def stage_days(df):
+    """첫 공정 시작일 ~ 마지막 공정 종료일"""
+    import pandas as pd
+
+    if not len(df):
+        return pd.DatetimeIndex([])
+    return pd.date_range(df["Start"].min().normalize(), df["Finish"].max().normalize(), freq="D")
+
+
+def drilldown_frame(df, point, max_joints=50):
+    """
+    그래프 클릭 위치(clickData 의 point)에 해당하는 접속재들의 일정
+
+    swimlane  : 클릭한 접속재와 앞뒤 접속재
+    utilization : 그 칸의 기간에 해당 공정을 진행 중인 접속재 (최대 max_joints 개)
+
+    Returns
+    -------
+    일정 dataframe (해당 없으면 None)
+    """
+    import pandas as pd
+
+    stages, joints = _stage_and_joint(df)
+    if point.get("customdata") is not None:
+        joint = int(point["customdata"]) - 1
+        selected = np.arange(max(0, joint - max_joints // 2), joint + max_joints // 2 + 1)
+    elif "z" in point and point.get("y") in PROCESS_NAMES:
+        day = pd.Timestamp(point["x"]).normalize()
+        bin_days = _bin_days(len(stage_days(df)))
+        stage = PROCESS_NAMES.index(point["y"])
+        overlaps = (
+            (stages == stage)
+            & (df["Start"].to_numpy() < (day + pd.Timedelta(days=bin_days)).to_datetime64())
+            & (df["Finish"].to_numpy() > day.to_datetime64())
+        )
+        selected = np.unique(joints[overlaps])[:max_joints]
+    else:
+        return None
+    rows = np.isin(joints, selected)
+    if not rows.any():
+        return None
+    return df[rows]
+
+
+def _stage_and_joint(df):
+    """행 위치로 공정 번호와 접속재 번호(0 부터) 계산 (make_schedule_frame 의 행 순서)"""
+    position = np.arange(len(df))
+    return position % len(PROCESS_NAMES), position // len(PROCESS_NAMES)
+
+
+def _bin_days(num_days):
+    return max(1, -(-num_days // UTILIZATION_MAX_COLUMNS))
+
+
+def _sum_columns(values, width):
+    """열을 width 개씩 묶어 합계 (마지막 묶음은 모자랄 수 있음)"""
+    if width == 1:
+        return values
+    return np.add.reduceat(values, np.arange(0, values.shape[1], width), axis=1)
+
+
+def _epoch_ms(column):
+    return column.to_numpy(dtype="datetime64[ns]").astype(np.int64) / 1e6
+
+
+def _cumulative_after(sorted_times, bounds):
+    """bounds 의 각 시각 t 에 대해 sum(t - time) [time < t]"""
+    count = np.searchsorted(sorted_times, bounds, side="left")
+    prefix = np.concatenate([[0], np.cumsum(sorted_times, dtype=np.float64)])
+    return count * bounds.astype(np.float64) - prefix[count]
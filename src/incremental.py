@@ -0,0 +1,100 @@
+import datetime
+import threading
+
+from .production import LABOR_STAGES, build_schedule_frame, schedule_mold_lines, to_stage_durations
+from .working_calendar import get_working_calendar
+
+
+class IncrementalScheduler:
+    """
+    입력이 조금 바뀔 때 바뀐 부분만 다시 계산하는 일정 계산기
+
+    접속재별 금형 공정(사출 ~ 탈형/조립) 시작 시간, 배정된 금형과 금형별 다음
+    사용 가능 시간(time 커서)을 checkpoint 로 저장해 둔다.
+
+    - num_joints 만 바뀌면 저장된 접속재 뒤에 이어서 계산하거나 앞부분만 잘라 쓴다.
+    - 건조/외주 가공/마무리 시간만 바뀌면 금형 공정은 그대로 두고
+      건조 이후 공정(time_2 커서)만 배열로 다시 계산한다.
+    - 시작일, 금형 공정 시간, 근무 조건, 금형 수가 바뀌면 처음부터 다시 계산한다.
+
+    calculate_production_time_batch 와 같은 dataframe 을 반환한다.
+
+    Examples
+    --------
+    >>> scheduler = IncrementalScheduler()
+    >>> df = scheduler.schedule(50, "2022-08-18", 1, 1, 1, 1, 1, 1, 1, 1, 9, 16)
+    >>> df = scheduler.schedule(51, "2022-08-18", 1, 1, 1, 1, 1, 1, 1, 1, 9, 16)  # 51번째만 계산
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._mold_key = None
+        self._injection_starts = []
+        self._mold_reset_starts = []
+        self._molds = []
+        self._available = None
+
+    def schedule(
+        self, num_joints, start_time, injection_time, curing_time, cooling_time, mold_reset_time,
+        mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+        working_time_min, working_time_max,
+        work_on_saturday=False, work_on_sunday=False, work_on_holiday=False, three_day_shift=False,
+        working_time_mode=False, num_molds=1, progress=None,
+    ):
+        """
+        progress 가 있으면 progress(계산된 수량, num_joints) 로 진행 상황을 알린다
+        (checkpoint 에 있던 접속재는 이미 계산된 것으로 센다).
+        """
+        durations = to_stage_durations(
+            injection_time, curing_time, cooling_time, mold_reset_time,
+            mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+        )
+        calendar = get_working_calendar(
+            working_time_min, working_time_max, work_on_saturday,
+            work_on_sunday, work_on_holiday, three_day_shift,
+        )
+        labor_stages = LABOR_STAGES if working_time_mode else ()
+        # 금형 공정 일정에 영향을 주는 입력
+        mold_key = (
+            start_time, durations.injection, durations.curing, durations.cooling,
+            durations.mold_reset, durations.mold_preheating,
+            working_time_min, working_time_max, bool(work_on_saturday),
+            bool(work_on_sunday), bool(work_on_holiday), bool(three_day_shift),
+            bool(working_time_mode), num_molds,
+        )
+
+        with self._lock:
+            if mold_key != self._mold_key:
+                self._mold_key = mold_key
+                self._injection_starts = []
+                self._mold_reset_starts = []
+                self._molds = []
+                self._available = [datetime.datetime.strptime(start_time, '%Y-%m-%d')] * num_molds
+
+            done = len(self._injection_starts)
+            missing = num_joints - done
+            if missing > 0:
+                injection_starts, mold_reset_starts, molds, self._available = schedule_mold_lines(
+                    self._available, durations, calendar, missing,
+                    progress=None if progress is None else (
+                        lambda count, _: progress(done + count, num_joints)
+                    ),
+                    labor_stages=labor_stages,
+                )
+                self._injection_starts.extend(injection_starts)
+                self._mold_reset_starts.extend(mold_reset_starts)
+                self._molds.extend(molds)
+
+            injection_starts = self._injection_starts[:num_joints]
+            mold_reset_starts = self._mold_reset_starts[:num_joints]
+            molds = self._molds[:num_joints] if num_molds > 1 else None
+
+        return build_schedule_frame(
+            injection_starts, mold_reset_starts, durations, calendar, labor_stages=labor_stages,
+            molds=molds,
+        )
+
+    @property
+    def num_checkpoints(self):
+        """저장된 접속재 수"""
+        return len(self._injection_starts)
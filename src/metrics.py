@@ -0,0 +1,172 @@
+"""
+성능 측정용 timer/counter 와 Prometheus text 출력
+
+SCHEDULE_METRICS=1 일 때만 값을 모은다 (꺼져 있으면 timer/increment 는 아무것도 안 함).
+값은 프로세스(gunicorn worker)별로 모은다.
+
+SCHEDULE_PROFILE_DIR=<폴더> 를 지정하면 요청마다 cProfile 결과(.prof)를 저장한다.
+SCHEDULE_PROFILER=pyinstrument 이면 (설치되어 있을 때) pyinstrument HTML 로 저장한다.
+"""
+import functools
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+ENABLED = os.environ.get("SCHEDULE_METRICS", "").lower() not in ("", "0", "false", "no")
+
+_lock = threading.Lock()
+_counters = defaultdict(float)          # (name, labels) -> 값
+_timers = defaultdict(lambda: [0, 0.0]) # phase -> [호출 수, 누적 시간]
+# profiler 는 프로세스에 하나만 켤 수 있다 (Python 3.12+ 의 cProfile 은 겹치면 ValueError)
+_profile_lock = threading.Lock()
+
+
+def increment(name, value=1, **labels):
+    """counter 증가 (name 은 Prometheus 이름, 예: schedule_joints_total)"""
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] += value
+
+
+@contextmanager
+def timer(phase):
+    """with 블록 실행 시간을 phase 별로 누적"""
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            entry = _timers[phase]
+            entry[0] += 1
+            entry[1] += elapsed
+
+
+def timed(phase):
+    """함수 실행 시간을 phase 로 누적하는 decorator"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with timer(phase):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _timers.clear()
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels) + "}"
+
+
+def render_prometheus(extra_gauges=None):
+    """
+    Prometheus text format (0.0.4) 으로 출력
+
+    Parameters
+    ----------
+    extra_gauges : dict
+                   함께 출력할 gauge (이름 -> 값), 예: 캐시 hits/misses
+    """
+    with _lock:
+        counters = dict(_counters)
+        timers = {phase: list(entry) for phase, entry in _timers.items()}
+
+    lines = []
+    lines.append("# HELP schedule_phase_seconds 단계별 실행 시간")
+    lines.append("# TYPE schedule_phase_seconds summary")
+    for phase, (count, total) in sorted(timers.items()):
+        lines.append(f'schedule_phase_seconds_count{{phase="{phase}"}} {count}')
+        lines.append(f'schedule_phase_seconds_sum{{phase="{phase}"}} {total:.6f}')
+
+    for name in sorted({name for name, _ in counters}):
+        lines.append(f"# TYPE {name} counter")
+        for (counter_name, labels), value in sorted(counters.items()):
+            if counter_name == name:
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+    for name, value in sorted((extra_gauges or {}).items()):
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value:g}")
+
+    return "\n".join(lines) + "\n"
+
+
+def install_profiler(server, directory, profiler="cprofile"):
+    """
+    Flask server 의 요청마다 profile 결과를 directory 에 저장
+
+    JS/CSS 같은 정적 파일과 /metrics 요청은 제외한다.
+    다른 요청을 profile 하고 있으면 (threaded 서버) 기다리지 않고 profile 없이 처리하고
+    schedule_profile_skipped_total 을 늘린다.
+    """
+    import flask
+
+    os.makedirs(directory, exist_ok=True)
+    if profiler == "pyinstrument":
+        try:
+            import pyinstrument
+        except ImportError:
+            profiler = "cprofile"
+
+    def is_static(path):
+        return path.startswith(("/_dash-component-suites", "/assets", "/_favicon", "/metrics"))
+
+    @server.before_request
+    def start_profile():
+        if is_static(flask.request.path):
+            return
+        if not _profile_lock.acquire(blocking=False):
+            increment("schedule_profile_skipped_total")
+            return
+        flask.g.profile_locked = True
+        if profiler == "pyinstrument":
+            flask.g.profiler = pyinstrument.Profiler()
+            flask.g.profiler.start()
+        else:
+            import cProfile
+            flask.g.profiler = cProfile.Profile()
+            flask.g.profiler.enable()
+
+    @server.after_request
+    def dump_profile(response):
+        active = flask.g.pop("profiler", None)
+        if active is None:
+            return response
+        name = flask.request.path.strip("/").replace("/", "_") or "index"
+        path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}_{time.perf_counter_ns()}_{name}")
+        if profiler == "pyinstrument":
+            active.stop()
+            with open(path + ".html", "w", encoding="utf-8") as f:
+                f.write(active.output_html())
+        else:
+            active.disable()
+            active.dump_stats(path + ".prof")
+        return response
+
+    @server.teardown_request
+    def release_profile(error=None):
+        # 예외로 after_request 가 실행되지 않았으면 여기서 profiler 를 끈다
+        active = flask.g.pop("profiler", None)
+        if active is not None:
+            if profiler == "pyinstrument":
+                active.stop()
+            else:
+                active.disable()
+        if flask.g.pop("profile_locked", False):
+            _profile_lock.release()
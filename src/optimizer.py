@@ -0,0 +1,169 @@
+import datetime
+import itertools
+import math
+from collections import namedtuple
+
+from .production import LABOR_STAGES, build_schedule_arrays, schedule_mold_lines, to_stage_durations
+from .working_calendar import get_working_calendar, new_working_calendar
+
+ShiftPlan = namedtuple(
+    "ShiftPlan",
+    ["working_time_min", "working_time_max", "work_on_saturday", "work_on_sunday",
+     "work_on_holiday", "three_day_shift"],
+)
+
+OptimizationResult = namedtuple(
+    "OptimizationResult",
+    ["plan", "finish", "overtime_hours", "evaluated", "pruned"],
+)
+
+
+def candidate_plans(working_time_min, working_time_max, max_extra_hours=4):
+    """
+    기본 근무(평일, working_time_min ~ working_time_max)를 늘리는 근무 계획 목록
+
+    작업 시간대는 기본 시간대를 포함하는 것만 고려한다 (연장 근무).
+    """
+    # 시각은 정수 시간 단위로만 비교되므로 정수로 맞춘다
+    working_time_min, working_time_max = math.ceil(working_time_min), math.floor(working_time_max)
+    plans = []
+    earliest = max(0, working_time_min - max_extra_hours)
+    latest = min(23, working_time_max + max_extra_hours)
+    for time_min, time_max in itertools.product(
+        range(working_time_min, earliest - 1, -1), range(working_time_max, latest + 1)
+    ):
+        for saturday, sunday, holiday in itertools.product([False, True], repeat=3):
+            plans.append(ShiftPlan(time_min, time_max, saturday, sunday, holiday, False))
+    plans.append(ShiftPlan(working_time_min, working_time_max, False, False, False, True))
+    return plans
+
+
+def weekly_overtime(plan, working_time_min, working_time_max):
+    """공휴일 없는 주 기준 연장 근무 시간 (계획 정렬용 추정치)"""
+    if plan.three_day_shift:
+        return 24 * 7 - (working_time_max - working_time_min + 1) * 5
+    daily = plan.working_time_max - plan.working_time_min + 1
+    base_daily = working_time_max - working_time_min + 1
+    weekend_days = plan.work_on_saturday + plan.work_on_sunday
+    # 공휴일 근무는 자주 없으므로 작은 값으로 둔다
+    return (daily - base_daily) * 5 + weekend_days * daily + plan.work_on_holiday * 0.5
+
+
+def parse_deadline(deadline):
+    """
+    납기 문자열을 datetime 으로 변환
+
+    날짜만 있으면 ("2022-09-30") 그날 안에 끝나면 되므로 다음 날 0 시로 본다.
+
+    Raises
+    ------
+    ValueError : 형식이 잘못된 경우
+    """
+    if isinstance(deadline, datetime.datetime):
+        return deadline
+    text = str(deadline or "").strip()
+    try:
+        if len(text) == 10:
+            return datetime.datetime.strptime(text, '%Y-%m-%d') + datetime.timedelta(days=1)
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError("납기는 YYYY-MM-DD 또는 YYYY-MM-DD HH:MM 형식이어야 합니다")
+
+
+def find_cheapest_plan(
+    deadline, num_joints, start_time, injection_time, curing_time, cooling_time,
+    mold_reset_time, mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+    working_time_min, working_time_max, max_extra_hours=4, working_time_mode=False, num_molds=1,
+):
+    """
+    납기 안에 끝나는 근무 계획 중 연장 근무가 가장 적은 계획 찾기
+
+    연장 근무 시간은 시작부터 완료까지 기본 근무(평일, working_time_min ~
+    working_time_max, 공휴일 휴무) 외에 추가로 일하는 시간 칸 수이다.
+
+    - 금형 공정은 화면 일정과 같은 schedule_mold_lines 로 계산한다
+      (working_time_mode, num_molds 반영).
+    - 후보 계획의 달력은 이번 호출에서만 쓰고 공유 캐시(get_working_calendar)에
+      넣지 않는다 (표 파일은 calendar_store 로 공유).
+    - 연장 근무가 적을 것 같은 계획부터 계산하고, 금형 공정을 계산하는 도중에
+      납기를 넘거나 연장 근무가 지금까지의 최선 이상이 되면 바로 중단한다.
+
+    Parameters
+    ----------
+    deadline          : datetime 또는 str ("2022-09-30" / "2022-09-30 18:00")
+                        납기 (날짜만 있으면 그날 24 시까지, parse_deadline)
+
+    max_extra_hours   : int
+                        작업 시간대를 앞뒤로 늘릴 수 있는 최대 시간
+
+    나머지는 calculate_production_time_batch 와 같음
+
+    Returns
+    -------
+    OptimizationResult (plan 이 None 이면 납기를 맞출 수 있는 계획 없음)
+
+    Examples
+    --------
+    >>> find_cheapest_plan("2022-09-20", 30, "2022-09-01", 1, 1, 1, 1, 1, 1, 1, 1, 9, 16)
+    """
+    deadline = parse_deadline(deadline)
+    start = datetime.datetime.strptime(start_time, '%Y-%m-%d')
+    durations = to_stage_durations(
+        injection_time, curing_time, cooling_time, mold_reset_time,
+        mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+    )
+    base_calendar = get_working_calendar(working_time_min, working_time_max)
+
+    def overtime(calendar, end):
+        return (
+            calendar.working_hours_between(start, end)
+            - base_calendar.working_hours_between(start, end)
+        )
+
+    # 주당 연장 근무가 적은 계획부터 (좋은 해를 빨리 찾아야 가지치기가 잘 된다)
+    plans = sorted(
+        candidate_plans(working_time_min, working_time_max, max_extra_hours),
+        key=lambda plan: weekly_overtime(plan, working_time_min, working_time_max),
+    )
+
+    labor_stages = LABOR_STAGES if working_time_mode else ()
+    best = None
+    evaluated = pruned = 0
+    for plan in plans:
+        calendar = new_working_calendar(*plan)
+        best_overtime = best.overtime_hours if best is not None else None
+        evaluated += 1
+        stopped = False
+
+        def stop(mold_reset_finish):
+            # 이후 공정은 더 늦게 끝나고 연장 근무는 시간이 지날수록 늘기만 한다
+            nonlocal stopped
+            stopped = mold_reset_finish > deadline or (
+                best_overtime is not None and overtime(calendar, mold_reset_finish) >= best_overtime
+            )
+            return stopped
+
+        injection_starts, mold_reset_starts, molds, _ = schedule_mold_lines(
+            [start] * num_molds, durations, calendar, num_joints,
+            labor_stages=labor_stages, stop=stop,
+        )
+        if stopped:
+            pruned += 1
+            continue
+
+        schedule = build_schedule_arrays(
+            injection_starts, mold_reset_starts, durations, calendar, labor_stages=labor_stages,
+            molds=molds if num_molds > 1 else None,
+        )
+        finish = schedule.last_finish() or start
+        if finish > deadline:
+            continue
+        plan_overtime = overtime(calendar, finish)
+        if best is None or (plan_overtime, finish) < (best.overtime_hours, best.finish):
+            best = OptimizationResult(plan, finish, plan_overtime, evaluated, pruned)
+            if plan_overtime == 0:
+                break
+
+    if best is None:
+        return OptimizationResult(None, None, None, evaluated, pruned)
+    return best._replace(evaluated=evaluated, pruned=pruned)
@@ -0,0 +1,366 @@
+"""
+공장 근무 달력 (교대 근무, 점심 시간, 휴무 기간, 공정/외주처별 달력)
+
+WorkingCalendar 는 하루 한 구간(working_time_min ~ working_time_max)과 주말/공휴일
+근무 여부만 표현한다. PlantCalendar 는 JSON/YAML 로 정의한 근무 시간을
+작업 구간 목록(시작/끝 정렬 배열 + 누적 작업 시간)으로 만들어 두고,
+WorkingCalendar 와 같은 next_working / next_working_array 를 제공하므로
+schedule_mold_stages, build_schedule_arrays 등에 그대로 넘길 수 있다.
+
+정의 예시 (YAML, 빠진 항목은 기본값)
+
+    years: [2022, 2030]            # 달력 범위 (범위 밖 날짜가 오면 자동으로 넓힘)
+    shifts:                        # 요일별 작업 구간 (weekday = 월~금 기본)
+      weekday: ["08:00-12:00", "13:00-17:00", "17:00-21:00"]
+      saturday: ["08:00-12:00"]
+      sunday: []
+    holidays: off                  # 공휴일: off (쉼, 기본) / work (YAML 의 on 도 work)
+    shutdowns:                     # 휴무 기간 (양 끝 날짜 포함)
+      - ["2022-07-25", "2022-08-05"]
+    workdays: ["2022-08-06"]       # 휴일이어도 weekday 구간으로 근무하는 날
+    stages:                        # 공정별 달력 (적힌 항목만 위 값을 덮어씀)
+      outsourcing:
+        shifts: {weekday: ["09:00-18:00"], saturday: []}
+        shutdowns: [["2022-08-01", "2022-08-12"]]
+        pickup_hour: 10            # 외주 가공품 회수 시각 (기본 10시)
+
+공정 이름은 StageDurations 의 이름(injection, mold_reset, outsourcing,
+final_touch 등)이다. 작업 구간은 "시작 가능한 시간" 이며 "22:00-06:00" 처럼
+자정을 넘겨도 된다.
+
+Examples
+--------
+>>> calendar = load_plant_calendar("plant.yaml")
+>>> calendar.add_working_hours(datetime.datetime(2022, 8, 18, 15), 6)
+>>> calculate_schedule_with_calendar(100, "2022-08-18", 1, 1, 1, 1, 1, 1, 1, 1, calendar)
+"""
+import datetime
+import json
+import threading
+
+import numpy as np
+
+from .production import StageDurations, build_schedule_arrays, schedule_mold_stages, to_stage_durations
+from .working_calendar import DEFAULT_FIRST_YEAR, DEFAULT_LAST_YEAR, HOUR_NS, holiday_days
+
+DAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+DEFAULT_DEFINITION = {
+    "shifts": {"weekday": ["09:00-17:00"], "saturday": [], "sunday": []},
+    "holidays": "off",
+    "shutdowns": [],
+    "workdays": [],
+    "pickup_hour": 10,
+}
+DEFINITION_KEYS = {"years", "shifts", "holidays", "shutdowns", "workdays", "pickup_hour", "stages"}
+MINUTE_NS = HOUR_NS // 60
+
+
+class PlantCalendar:
+    """
+    JSON/YAML 정의로 만든 작업 구간 달력
+
+    작업 구간을 정렬된 시작/끝 배열(ns)과 각 구간 시작 전까지의 누적 작업 시간으로
+    저장하므로 next_working, working_hours_between, add_working_hours 가 모두
+    이진 탐색 한 번(O(log n))이다.
+
+    Parameters
+    ----------
+    definition : dict
+                 달력 정의 (모듈 설명 참고)
+
+    parent     : PlantCalendar
+                 공정별 달력일 때 공장 달력 (정의에 없는 항목은 parent 값 사용)
+    """
+
+    def __init__(self, definition=None, parent=None):
+        definition = dict(definition or {})
+        unknown = set(definition) - DEFINITION_KEYS
+        if unknown:
+            raise ValueError(f"알 수 없는 달력 항목입니다: {', '.join(sorted(unknown))}")
+        stages = definition.pop("stages", None) or {}
+        if parent is not None and stages:
+            raise ValueError("공정별 달력 안에는 stages 를 쓸 수 없습니다")
+
+        base = parent._definition if parent is not None else DEFAULT_DEFINITION
+        self._definition = {**base, **definition}
+        self._definition["shifts"] = _parse_shifts(self._definition["shifts"])
+        # YAML 1.1 은 따옴표 없는 off/on/no/yes 를 false/true 로 읽는다
+        if isinstance(self._definition["holidays"], bool):
+            self._definition["holidays"] = "work" if self._definition["holidays"] else "off"
+        if self._definition["holidays"] not in ("off", "work"):
+            raise ValueError("holidays 는 off 또는 work 여야 합니다")
+        self.pickup_hour = int(self._definition["pickup_hour"])
+
+        years = self._definition.get("years") or (DEFAULT_FIRST_YEAR, DEFAULT_LAST_YEAR)
+        self._lock = threading.Lock()
+        self._build(int(years[0]), int(years[1]))
+
+        unknown = set(stages) - set(StageDurations._fields)
+        if unknown:
+            raise ValueError(
+                f"알 수 없는 공정입니다: {', '.join(sorted(unknown))} "
+                f"(가능: {', '.join(StageDurations._fields)})"
+            )
+        self._stages = {name: PlantCalendar(stage, parent=self) for name, stage in stages.items()}
+
+    def stage(self, name):
+        """공정 name 에 쓰는 달력 (따로 정의하지 않았으면 자기 자신)"""
+        return self._stages.get(name, self)
+
+    def _build(self, first_year, last_year):
+        starts, ends = _compile_intervals(self._definition, first_year, last_year)
+        if not len(starts):
+            raise ValueError(f"{first_year} ~ {last_year} 년에 작업 가능 시간이 없습니다")
+        cumulative = np.concatenate([[0], np.cumsum(ends - starts)])
+        bounds = (_to_ns(datetime.datetime(first_year, 1, 1)), _to_ns(datetime.datetime(last_year + 1, 1, 1)))
+        # 한 번에 교체해야 다른 스레드가 반쯤 만든 표를 보지 않는다
+        self._table = (first_year, last_year, bounds, starts, ends, cumulative)
+
+    def _ensure_year(self, year):
+        with self._lock:
+            first_year, last_year = self._table[:2]
+            if not first_year <= year <= last_year:
+                self._build(min(first_year, year), max(last_year, year))
+
+    def _table_for(self, values):
+        """values(ns) 가 모두 달력 범위 안에 들도록 넓힌 표"""
+        table = self._table
+        low, high = table[2]
+        if low <= np.min(values) and np.max(values) < high:
+            return table
+        years = np.asarray(values).astype("datetime64[ns]").astype("datetime64[Y]").astype(np.int64) + 1970
+        self._ensure_year(int(years.min()))
+        self._ensure_year(int(years.max()))
+        return self._table
+
+    def _worked_before(self, table, values):
+        """달력 시작부터 values 까지의 누적 작업 시간 [ns]"""
+        _, _, _, starts, ends, cumulative = table
+        index = np.searchsorted(starts, values, side="right") - 1
+        clipped = np.maximum(index, 0)
+        within = np.clip(values - starts[clipped], 0, ends[clipped] - starts[clipped])
+        return np.where(index >= 0, cumulative[clipped] + within, 0)
+
+    def is_working(self, date_time):
+        value = _to_ns(date_time)
+        _, _, _, starts, ends, _ = self._table_for(value)
+        index = np.searchsorted(starts, value, side="right") - 1
+        return bool(index >= 0 and value < ends[index])
+
+    def next_working(self, date_time):
+        """
+        date_time 이후(포함) 첫 작업 가능 시간 (작업 구간 안이면 그대로)
+
+        WorkingCalendar.next_working 은 한 시간씩 건너뛰므로 분/초를 유지하지만
+        (17:20 -> 다음날 09:20), 여기서는 다음 작업 구간의 시작 시각이다 (09:00).
+        """
+        value = _to_ns(date_time)
+        while True:
+            _, last_year, _, starts, ends, _ = self._table_for(value)
+            index = np.searchsorted(ends, value, side="right")
+            if index < len(ends):
+                if value >= starts[index]:
+                    return date_time
+                return _from_ns(starts[index])
+            self._ensure_year(last_year + 1)
+
+    def next_working_array(self, date_times):
+        """next_working 의 배열 버전 (datetime64[ns] 배열 반환)"""
+        values = np.asarray(date_times, dtype="datetime64[ns]").astype(np.int64)
+        if values.size == 0:
+            return values.astype("datetime64[ns]")
+        while True:
+            _, last_year, _, starts, ends, _ = self._table_for(values)
+            index = np.searchsorted(ends, values, side="right")
+            if (index < len(ends)).all():
+                return np.maximum(values, starts[index]).astype("datetime64[ns]")
+            self._ensure_year(last_year + 1)
+
+    def working_hours_between(self, start, end):
+        """[start, end) 사이 작업 시간 [시간]"""
+        if end <= start:
+            return 0.0
+        values = np.array([_to_ns(start), _to_ns(end)])
+        worked = self._worked_before(self._table_for(values), values)
+        return float(worked[1] - worked[0]) / HOUR_NS
+
+    def add_working_hours(self, date_time, hours):
+        """
+        date_time 부터 작업 시간만 hours 시간 지난 시각
+
+        작업 구간 밖의 시간(밤, 점심 시간, 휴무일)은 세지 않는다.
+        """
+        finish = self.add_working_hours_array(np.array([_to_ns(date_time)], dtype="datetime64[ns]"), hours)
+        return _from_ns(finish[0].astype(np.int64))
+
+    def add_working_hours_array(self, date_times, hours):
+        """
+        add_working_hours 의 배열 버전
+
+        Parameters
+        ----------
+        date_times : numpy.ndarray (datetime64)
+                     시작 시각 배열
+
+        hours      : float 또는 배열
+                     작업 시간 [시간]
+
+        Returns
+        -------
+        종료 시각 배열 : numpy.ndarray (datetime64[ns])
+        """
+        values = np.asarray(date_times, dtype="datetime64[ns]").astype(np.int64)
+        amounts = np.broadcast_to(np.round(np.asarray(hours, dtype=float) * HOUR_NS).astype(np.int64),
+                                  values.shape)
+        if values.size == 0:
+            return values.astype("datetime64[ns]")
+        while True:
+            table = self._table_for(values)
+            _, last_year, _, starts, ends, cumulative = table
+            target = self._worked_before(table, values) + amounts
+            # target 만큼 일한 시점이 들어 있는 첫 구간 (구간 끝에 정확히 끝나면 그 구간)
+            index = np.searchsorted(cumulative[1:], target, side="left")
+            if (index < len(starts)).all():
+                finish = starts[index] + (target - cumulative[index])
+                # 작업 시간이 0 이면 시작 시각 그대로
+                return np.where(amounts > 0, finish, values).astype("datetime64[ns]")
+            self._ensure_year(last_year + 1)
+
+
+def load_plant_calendar(path):
+    """
+    JSON(.json) 또는 YAML(.yaml/.yml) 파일에서 PlantCalendar 생성
+
+    YAML 은 PyYAML 이 설치되어 있어야 한다.
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("YAML 달력을 읽으려면 PyYAML 이 필요합니다 (pip install pyyaml)")
+            definition = yaml.safe_load(f)
+        else:
+            definition = json.load(f)
+    return PlantCalendar(definition)
+
+
+def calculate_schedule_with_calendar(
+    num_joints, start_time, injection_time, curing_time, cooling_time, mold_reset_time,
+    mold_preheating_time, drying_time, outsourcing_time, final_touch_time, calendar,
+):
+    """
+    공장 달력으로 접속재 제조 소요일 계산
+
+    working_time_min/max 와 근무 여부 대신 calendar(PlantCalendar 또는
+    WorkingCalendar)의 공정별 달력으로 각 공정의 시작 가능 시간을 정한다.
+
+    Returns
+    -------
+    접속재 제조 소요일 : ScheduleArrays (dataframe 은 to_frame())
+    """
+    time = datetime.datetime.strptime(start_time, '%Y-%m-%d')
+    durations = to_stage_durations(
+        injection_time, curing_time, cooling_time, mold_reset_time,
+        mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+    )
+    injection_starts, mold_reset_starts, _ = schedule_mold_stages(
+        time, durations, calendar, num_joints
+    )
+    return build_schedule_arrays(injection_starts, mold_reset_starts, durations, calendar)
+
+
+def _parse_shifts(shifts):
+    """요일별 작업 구간 -> 요일(월=0)별 [(시작 분, 끝 분), ...]"""
+    if isinstance(shifts, list) and all(isinstance(day, list) for day in shifts):
+        return shifts   # 이미 변환됨 (공정별 달력이 공장 값을 물려받은 경우)
+    unknown = set(shifts) - set(DAY_NAMES) - {"weekday"}
+    if unknown:
+        raise ValueError(f"알 수 없는 요일입니다: {', '.join(sorted(unknown))}")
+    weekday = shifts.get("weekday", DEFAULT_DEFINITION["shifts"]["weekday"])
+    parsed = []
+    for day, name in enumerate(DAY_NAMES):
+        default = weekday if day < 5 else DEFAULT_DEFINITION["shifts"][name]
+        parsed.append([_parse_shift(text) for text in shifts.get(name, default)])
+    return parsed
+
+
+def _parse_shift(text):
+    """ "08:00-12:00" -> (480, 720) [분], 자정을 넘기면 끝이 1440 보다 크다"""
+    try:
+        start, end = (_parse_clock(part) for part in text.split("-"))
+    except ValueError:
+        raise ValueError(f"작업 구간은 HH:MM-HH:MM 형식이어야 합니다: {text!r}")
+    if end <= start:
+        end += 24 * 60
+    return start, end
+
+
+def _parse_clock(text):
+    hour, minute = (int(part) for part in text.strip().split(":"))
+    if not (0 <= hour <= 24 and 0 <= minute < 60 and hour * 60 + minute <= 24 * 60):
+        raise ValueError(text)
+    return hour * 60 + minute
+
+
+def _parse_day(text):
+    return np.datetime64(str(text), "D")
+
+
+def _compile_intervals(definition, first_year, last_year):
+    """정의 -> 겹치지 않게 합친 작업 구간 (시작, 끝) ns 배열"""
+    days = np.arange(
+        np.datetime64(f"{first_year:04d}-01-01"),
+        np.datetime64(f"{last_year + 1:04d}-01-01"),
+        dtype="datetime64[D]",
+    )
+    weekday = (days.astype(np.int64) + 3) % 7     # 1970-01-01 은 목요일 (월요일 = 0)
+    shifts = definition["shifts"]
+
+    day_type = weekday.copy()
+    closed = np.zeros(len(days), dtype=bool)
+    if definition["holidays"] == "off":
+        closed |= np.isin(days, holiday_days(first_year, last_year))
+    for first, last in definition["shutdowns"]:
+        closed |= (days >= _parse_day(first)) & (days <= _parse_day(last))
+    # workdays 는 휴일/휴무와 상관없이 평일(월요일) 구간으로 근무
+    workdays = np.isin(days, np.array([_parse_day(day) for day in definition["workdays"]],
+                                      dtype="datetime64[D]"))
+    day_type[workdays] = 0
+    closed &= ~workdays
+
+    day_start = days.astype("datetime64[ns]").astype(np.int64)
+    starts, ends = [], []
+    for day in range(7):
+        selected = day_start[(day_type == day) & ~closed]
+        for start, end in shifts[day]:
+            starts.append(selected + start * MINUTE_NS)
+            ends.append(selected + end * MINUTE_NS)
+    if not starts:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    starts = np.concatenate(starts)
+    ends = np.concatenate(ends)
+    order = np.argsort(starts, kind="stable")
+    return _merge_intervals(starts[order], ends[order])
+
+
+def _merge_intervals(starts, ends):
+    """정렬된 구간 중 겹치거나 맞닿은 구간 합치기"""
+    if not len(starts):
+        return starts, ends
+    running_end = np.maximum.accumulate(ends)
+    # 앞 구간들의 끝보다 늦게 시작하면 새 구간
+    new = np.concatenate([[True], starts[1:] > running_end[:-1]])
+    group = np.cumsum(new) - 1
+    merged_starts = starts[new]
+    merged_ends = np.zeros(len(merged_starts), dtype=np.int64)
+    np.maximum.at(merged_ends, group, ends)
+    return merged_starts, merged_ends
+
+
+def _to_ns(date_time):
+    return int(np.datetime64(date_time, "ns").astype(np.int64))
+
+
+def _from_ns(value):
+    return np.datetime64(int(value), "ns").astype("datetime64[us]").item()
@@ -0,0 +1,108 @@
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .production import (
+    FLAG_PARAMS, LABOR_STAGES, SCHEDULE_PARAMS, build_schedule_frame, schedule_mold_stages,
+    to_stage_durations,
+)
+from .working_calendar import get_working_calendar
+
+
+def schedule_portfolio(orders, max_workers=None):
+    """
+    여러 주문(제품)의 일정을 함께 계산
+
+    같은 금형(mold)을 쓰는 주문은 주어진 순서대로 이어서 계산하고
+    (앞 주문이 금형을 비워야 다음 주문 시작), 금형이 다른 주문끼리는
+    ProcessPoolExecutor 로 나눠 동시에 계산한다.
+
+    Parameters
+    ----------
+    orders       : list of dict
+                   주문별 calculate_production_time 입력값
+                   + product_name (제품명, 없으면 "order_1", "order_2", ...)
+                   + mold (금형 이름, 없으면 주문마다 별도 금형)
+
+    max_workers  : int
+                   프로세스 수 (1 이면 현재 프로세스에서 계산)
+
+    Returns
+    -------
+    전체 일정 : dataframe
+                calculate_production_time 의 열 + Order, Product, Mold
+                (Order 는 orders 안의 순서 1, 2, ... 이고 주문마다 1 부터 다시 세는
+                Number/Process 앞에 "<Order>/" 를 붙여 주문끼리 겹치지 않게 한다)
+
+    Examples
+    --------
+    >>> schedule_portfolio([
+            dict(product_name="154kV", mold="A", num_joints=20, start_time="2022-08-01", ...),
+            dict(product_name="345kV", mold="B", num_joints=10, start_time="2022-08-01", ...),
+        ])
+    """
+    groups = {}
+    for i, order in enumerate(orders):
+        order = dict(order)
+        missing = [name for name in SCHEDULE_PARAMS if name not in order]
+        if missing:
+            raise ValueError(f"주문 {i+1} 에 입력값이 없습니다: {', '.join(missing)}")
+        order.setdefault("product_name", f"order_{i+1}")
+        order.setdefault("mold", f"mold_{i+1}")
+        order["order_number"] = i + 1
+        groups.setdefault(order["mold"], []).append(order)
+
+    if max_workers == 1 or len(groups) <= 1:
+        frames = [schedule_mold_orders(group) for group in groups.values()]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(schedule_mold_orders, groups.values()))
+
+    if not frames:
+        return pd.DataFrame(
+            columns=["Number", "Process", "Start", "Finish", "Order", "Product", "Mold"]
+        )
+    df = pd.concat(frames, ignore_index=True)
+    df["Number"] = df["Number"].astype("category")
+    df["Process"] = df["Process"].astype("category")
+    return df
+
+
+def schedule_mold_orders(orders):
+    """
+    한 금형을 쓰는 주문들을 순서대로 계산
+
+    각 주문은 자신의 start_time 과 앞 주문이 금형을 비운 시간 중 늦은 시간에 시작한다.
+    """
+    frames = []
+    cursor = None
+    for position, order in enumerate(orders):
+        durations = to_stage_durations(
+            order["injection_time"], order["curing_time"], order["cooling_time"],
+            order["mold_reset_time"], order["mold_preheating_time"], order["drying_time"],
+            order["outsourcing_time"], order["final_touch_time"],
+        )
+        calendar = get_working_calendar(
+            order["working_time_min"], order["working_time_max"],
+            **{name: order.get(name, False) for name in FLAG_PARAMS},
+        )
+        time = datetime.datetime.strptime(order["start_time"], '%Y-%m-%d')
+        if cursor is not None:
+            time = max(time, cursor)
+
+        labor_stages = LABOR_STAGES if order.get("working_time_mode") else ()
+        injection_starts, mold_reset_starts, cursor = schedule_mold_stages(
+            time, durations, calendar, order["num_joints"], labor_stages=labor_stages
+        )
+        df = build_schedule_frame(
+            injection_starts, mold_reset_starts, durations, calendar, labor_stages=labor_stages
+        )
+        number = order.get("order_number", position + 1)
+        df["Number"] = f"{number}/" + df["Number"].astype(str)
+        df["Process"] = f"{number}/" + df["Process"].astype(str)
+        df["Order"] = number
+        df["Product"] = order["product_name"]
+        df["Mold"] = order["mold"]
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
@@ -1,9 +1,30 @@
-import pandas as pd
+import numpy as np
 import datetime
-import holidays
+import heapq
+from collections import namedtuple
+from contextlib import contextmanager
+from . import metrics
+from .working_calendar import HOUR, get_working_calendar
 
 PROCESS_NAMES = ["사출", "경화", "냉각", "탈형/조립", "건조", "외주가공", "마무리 작업"]
 
+# calculate_production_time 입력값 이름
+SCHEDULE_PARAMS = [
+    "num_joints", "start_time", "injection_time", "curing_time", "cooling_time",
+    "mold_reset_time", "mold_preheating_time", "drying_time", "outsourcing_time",
+    "final_touch_time", "working_time_min", "working_time_max",
+]
+FLAG_PARAMS = ["work_on_saturday", "work_on_sunday", "work_on_holiday", "three_day_shift"]
+# 근무 조건(달력)과 별개인 계산 방식 입력값
+MODE_PARAMS = ["working_time_mode"]
+
+# datetime64[ns] 로 나타낼 수 있는 마지막 날 (이후 시각은 overflow 되어 1677 년 부근으로 돌아간다)
+LATEST_SCHEDULE_TIME = datetime.datetime(2262, 4, 11)
+
+# working_time_mode 에서 작업 시간만 소요 시간으로 세는 공정 (사람이 하는 일)
+# 나머지(경화, 냉각, 예열, 건조 등)는 작업 시간과 무관하게 진행된다
+LABOR_STAGES = ("injection", "mold_reset")
+
 def check_if_working_day(date_time, working_time_min, working_time_max,
                          work_on_saturday=False, work_on_sunday=False,
                          work_on_holiday=False, three_day_shift=False):
@@ -38,72 +59,98 @@ def check_if_working_day(date_time, working_time_min, working_time_max,
             work_on_saturday=False, work_on_sunday=False,
             work_on_holiday=False, three_day_shift=False)
     """
-    if three_day_shift == True:
-        return True
-    else:
-        if work_on_saturday == True and work_on_sunday == True and work_on_holiday == True:
-            if working_time_min <= date_time.hour <= working_time_max:
-                return True
-            else:
-                return False
-        elif work_on_saturday == True and work_on_sunday == True and work_on_holiday == False:
-            if date_time not in holidays.KR():
-                if working_time_min <= date_time.hour <= working_time_max:
-                    return True
-                else:
-                    return False
-            else:
-                return False
-        elif work_on_saturday == True and work_on_sunday == False and work_on_holiday ==True:
-            if date_time.weekday() < 6:
-                if working_time_min <= date_time.hour <= working_time_max:
-                    return True
-                else:
-                    return False
-            else:
-                return False
-        elif work_on_saturday == True and work_on_sunday == False and work_on_holiday == False:
-            if date_time.weekday() < 6 and date_time not in holidays.KR():
-                if working_time_min <= date_time.hour <= working_time_max:
-                    return True
-                else:
-                    return False
-            else:
-                return False 
-        elif work_on_saturday == False and work_on_sunday == True and work_on_holiday == True:
-            if date_time.weekday() < 5 or date_time.weekday() == 6:
-                if working_time_min <= date_time.hour <= working_time_max:
-                    return True
-                else:
-                    return False
-            else:
-                return False 
-        elif work_on_saturday == False and work_on_sunday == True and work_on_holiday == False:
-            if (date_time.weekday() < 5 or date_time.weekday() == 6) and date_time not in holidays.KR():
-                if working_time_min <= date_time.hour <= working_time_max:
-                    return True
-                else:
-                    return False
-            else:
-                return False
-        elif work_on_saturday == False and work_on_sunday == False and work_on_holiday == True:
-            if date_time.weekday() < 5:
-                if working_time_min <= date_time.hour <= working_time_max:
-                    return True
-                else:
-                    return False
-            else:
-                return False
-        else:
-            if date_time.weekday() < 5 and date_time not in holidays.KR():
-                if working_time_min <= date_time.hour <= working_time_max:
-                    return True
-                else:
-                    return False
-            else:
-                return False
+    calendar = get_working_calendar(
+        working_time_min, working_time_max, work_on_saturday,
+        work_on_sunday, work_on_holiday, three_day_shift,
+    )
+    return calendar.is_working(date_time)
+
+
+StageDurations = namedtuple(
+    "StageDurations",
+    ["injection", "curing", "cooling", "mold_reset", "mold_preheating",
+     "drying", "outsourcing", "final_touch"],
+)
+
+
+def to_stage_durations(injection_time, curing_time, cooling_time, mold_reset_time,
+                       mold_preheating_time, drying_time, outsourcing_time, final_touch_time):
+    """
+    공정별 소요 시간을 timedelta 로 변환
+
+    사출/경화/냉각/탈형 및 조립/금형 예열은 [시간], 건조/외주 가공/마무리는 [일] 단위
+
+    Raises
+    ------
+    ValueError : 소요 시간이 datetime64[ns] 로 나타낼 수 없을 만큼 긴 경우
+    """
+    with _schedule_range():
+        durations = StageDurations(
+            injection=datetime.timedelta(hours=injection_time),             # 사출 소요 시간
+            curing=datetime.timedelta(hours=curing_time),                   # 경화 소요 시간
+            cooling=datetime.timedelta(hours=cooling_time),                 # 냉각 소요 시간
+            mold_reset=datetime.timedelta(hours=mold_reset_time),           # 금형 탈형 및 조립 소요 시간
+            mold_preheating=datetime.timedelta(hours=mold_preheating_time), # 금형 예열 소요 시간
+            drying=datetime.timedelta(days=drying_time),                    # 접속재 건조 소요 시간
+            outsourcing=datetime.timedelta(days=outsourcing_time),          # 외주 가공 소요 시간
+            final_touch=datetime.timedelta(days=final_touch_time),          # 마무리 소요 시간
+        )
+    # timedelta64[ns] 로 바꿀 때 조용히 overflow 되지 않도록 여기서 막는다
+    if max(durations) > _MAX_DURATION:
+        raise ValueError(_OUT_OF_RANGE)
+    return durations
+
+
+def schedule_joint(time, durations, calendar):
+    """
+    접속재 1개의 공정 일정 계산
 
+    작업 시간이 아닐 때 한 시간씩 기다리는 대신 calendar.next_working 으로
+    다음 작업 시간까지 바로 건너뛴다.
 
+    Parameters
+    ----------
+    time       : datetime
+                 금형 사용 가능 시간
+
+    durations  : StageDurations
+                 공정별 소요 시간
+
+    calendar   : WorkingCalendar 또는 PlantCalendar
+                 작업 시간 달력 (calendar.stage(공정) 으로 공정별 달력 사용)
+
+    Returns
+    -------
+    (공정별 (시작, 종료) 목록, 다음 접속재의 금형 사용 가능 시간) : tuple
+    """
+    stages = []
+
+    with _schedule_range():
+        time = calendar.stage("injection").next_working(time)
+        for duration in (durations.injection, durations.curing, durations.cooling):
+            stages.append((time, time + duration))
+            time = time + duration
+
+        time = calendar.stage("mold_reset").next_working(time)    # 탈형/조립
+        stages.append((time, time + durations.mold_reset))
+        time = time + durations.mold_reset
+
+        time_2 = time + durations.drying                      # 건조
+        stages.append((time, time_2))
+
+        outsourcing = calendar.stage("outsourcing")
+        time_2 = outsourcing.next_working(time_2)             # 외주 가공
+        outsourcing_start = time_2
+        time_2 = (time_2 + durations.outsourcing).replace(hour=outsourcing.pickup_hour)
+        stages.append((outsourcing_start, time_2))
+
+        time_2 = calendar.stage("final_touch").next_working(time_2)   # 마무리 작업
+        stages.append((time_2, time_2 + durations.final_touch))
+
+        return stages, time + durations.mold_preheating
+
+
+@metrics.timed("calculate_production_time")
 def calculate_production_time(
     num_joints, start_time, injection_time, curing_time, cooling_time, mold_reset_time,
     mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
@@ -144,6 +191,8 @@ def calculate_production_time(
             work_on_saturday=False, work_on_sunday=False,
             work_on_holiday=False, three_day_shift=False)
     """
+    import pandas as pd
+
     # Initialization of list for times
     start = []
     finish = []
@@ -151,176 +200,22 @@ def calculate_production_time(
     num_joint = 0
     
     time = datetime.datetime.strptime(start_time, '%Y-%m-%d')
-    injection_time = datetime.timedelta(hours=injection_time)             # 사출 소요 시간
-    curing_time = datetime.timedelta(hours=curing_time)               # 경화 소요 시간 
-    cooling_time = datetime.timedelta(hours=cooling_time)              # 냉각 소요 시간
-    mold_reset_time = datetime.timedelta(hours=mold_reset_time)            # 금형 탈형 및 조립 소요 시간
-    mold_preheating_time = datetime.timedelta(hours=mold_preheating_time)       # 금형 예열 소요 시간
-    drying_time = datetime.timedelta(days=drying_time)                # 접속재 건조 소요 시간
-    outsourcing_time = datetime.timedelta(days=outsourcing_time)            # 외주 가공 소요 시간
-    final_touch_time = datetime.timedelta(days=final_touch_time)
+    durations = to_stage_durations(
+        injection_time, curing_time, cooling_time, mold_reset_time,
+        mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+    )
+    calendar = get_working_calendar(
+        working_time_min, working_time_max, work_on_saturday,
+        work_on_sunday, work_on_holiday, three_day_shift,
+    )
     
     while num_joint < num_joints:
-        if check_if_working_day(
-            time, working_time_min, working_time_max, work_on_saturday, 
-            work_on_sunday, work_on_holiday, three_day_shift
-            ):
-            start.append(time)
-            time = time + injection_time
-            finish.append(time)
-            start.append(time)
-            time = time + curing_time
-            finish.append(time)
-            start.append(time)
-            time = time + cooling_time
-            finish.append(time)
-            
-            if check_if_working_day(
-                time, working_time_min, working_time_max, work_on_saturday, 
-                work_on_sunday, work_on_holiday, three_day_shift
-                ):
-                start.append(time)
-                time = time + mold_reset_time
-                finish.append(time)
-                start.append(time)              # 건조 시간 추가
-                time_2 = time + drying_time     # 건조 시간 추가
-                finish.append(time_2)           # 건조 시간 추가
-                if check_if_working_day(
-                    time_2, working_time_min, working_time_max, work_on_saturday, 
-                    work_on_sunday, work_on_holiday, three_day_shift
-                    ):
-                    start.append(time_2)                   # 외주 가공 시간 추가
-                    time_2 = time_2 + outsourcing_time     # 외주 가공 시간 추가
-                    time_2 = time_2.replace(hour=10)      # 외주 가공 시간 추가
-                    finish.append(time_2)                  # 외주 가공 시간 추가
-                    if check_if_working_day(
-                        time_2, working_time_min, working_time_max, work_on_saturday, 
-                        work_on_sunday, work_on_holiday, three_day_shift
-                        ):
-                        start.append(time_2)                    # 마무리 시간 추가
-                        time_2 = time_2 + final_touch_time      # 마무리 시간 추가
-                        finish.append(time_2)                   # 마무리 시간 추가
-                        num_joint += 1
-                        time = time + mold_preheating_time
-                    else:
-                        while check_if_working_day(
-                            time_2, working_time_min, working_time_max, work_on_saturday, 
-                            work_on_sunday, work_on_holiday, three_day_shift
-                            ) == False:
-                            time_2 = time_2 + datetime.timedelta(hours=1)
-                        start.append(time_2)                    # 마무리 시간 추가
-                        time_2 = time_2 + final_touch_time      # 마무리 시간 추가
-                        finish.append(time_2)                   # 마무리 시간 추가
-                        num_joint += 1
-                        time = time + mold_preheating_time
-                else:
-                    while check_if_working_day(
-                        time_2, working_time_min, working_time_max, work_on_saturday, 
-                        work_on_sunday, work_on_holiday, three_day_shift
-                        ) == False:
-                        time_2 = time_2 + datetime.timedelta(hours=1)
-                    start.append(time_2)                   # 외주 가공 시간 추가
-                    time_2 = time_2 + outsourcing_time     # 외주 가공 시간 추가
-                    time_2 = time_2.replace(hour=10)      # 외주 가공 시간 추가
-                    finish.append(time_2)                  # 외주 가공 시간 추가
-                    if check_if_working_day(
-                        time_2, working_time_min, working_time_max, work_on_saturday, 
-                        work_on_sunday, work_on_holiday, three_day_shift
-                        ):
-                        start.append(time_2)                    # 마무리 시간 추가
-                        time_2 = time_2 + final_touch_time      # 마무리 시간 추가
-                        finish.append(time_2)                   # 마무리 시간 추가
-                        num_joint += 1
-                        time = time + mold_preheating_time
-                    else:
-                        while check_if_working_day(
-                            time_2, working_time_min, working_time_max, work_on_saturday, 
-                            work_on_sunday, work_on_holiday, three_day_shift
-                            ) == False:
-                            time_2 = time_2 + datetime.timedelta(hours=1)
-                        start.append(time_2)                    # 마무리 시간 추가
-                        time_2 = time_2 + final_touch_time      # 마무리 시간 추가
-                        finish.append(time_2)                   # 마무리 시간 추가
-                        num_joint += 1
-                        time = time + mold_preheating_time
-
-            else:
-                while check_if_working_day(
-                    time, working_time_min, working_time_max, work_on_saturday, 
-                    work_on_sunday, work_on_holiday, three_day_shift
-                    ) == False:
-                    time = time + datetime.timedelta(hours=1)
-                start.append(time)
-                time = time + mold_reset_time
-                finish.append(time)
-                start.append(time)                # 건조 시간 추가
-                time_2 = time + drying_time     # 건조 시간 추가
-                finish.append(time_2)           # 건조 시간 추가
-                if check_if_working_day(
-                    time_2, working_time_min, working_time_max, work_on_saturday, 
-                    work_on_sunday, work_on_holiday, three_day_shift
-                    ):
-                    start.append(time_2)                   # 외주 가공 시간 추가
-                    time_2 = time_2 + outsourcing_time     # 외주 가공 시간 추가
-                    time_2 = time_2.replace(hour=10)      # 외주 가공 시간 추가
-                    finish.append(time_2)                  # 외주 가공 시간 추가
-                    if check_if_working_day(
-                        time_2, working_time_min, working_time_max, work_on_saturday, 
-                        work_on_sunday, work_on_holiday, three_day_shift
-                        ):
-                        start.append(time_2)                    # 마무리 시간 추가
-                        time_2 = time_2 + final_touch_time      # 마무리 시간 추가
-                        finish.append(time_2)                   # 마무리 시간 추가
-                        num_joint += 1
-                        time = time + mold_preheating_time
-                    else:
-                        while check_if_working_day(
-                            time_2, working_time_min, working_time_max, work_on_saturday, 
-                            work_on_sunday, work_on_holiday, three_day_shift
-                            ) == False:
-                            time_2 = time_2 + datetime.timedelta(hours=1)
-                        start.append(time_2)                    # 마무리 시간 추가
-                        time_2 = time_2 + final_touch_time      # 마무리 시간 추가
-                        finish.append(time_2)                   # 마무리 시간 추가
-                        num_joint += 1
-                        time = time + mold_preheating_time
-                else:
-                    while check_if_working_day(
-                        time_2, working_time_min, working_time_max, work_on_saturday, 
-                        work_on_sunday, work_on_holiday, three_day_shift
-                        ) == False:
-                        time_2 = time_2 + datetime.timedelta(hours=1)
-                    start.append(time_2)                   # 외주 가공 시간 추가
-                    time_2 = time_2 + outsourcing_time     # 외주 가공 시간 추가
-                    time_2 = time_2.replace(hour=10)      # 외주 가공 시간 추가
-                    finish.append(time_2)                  # 외주 가공 시간 추가
-                    if check_if_working_day(
-                        time_2, working_time_min, working_time_max, work_on_saturday, 
-                        work_on_sunday, work_on_holiday, three_day_shift
-                        ):
-                        start.append(time_2)                    # 마무리 시간 추가
-                        time_2 = time_2 + final_touch_time      # 마무리 시간 추가
-                        finish.append(time_2)                   # 마무리 시간 추가
-                        num_joint += 1
-                        time = time + mold_preheating_time
-                    else:
-                        while check_if_working_day(
-                            time_2, working_time_min, working_time_max, work_on_saturday, 
-                            work_on_sunday, work_on_holiday, three_day_shift
-                            ) == False:
-                            time_2 = time_2 + datetime.timedelta(hours=1)
-                        start.append(time_2)                    # 마무리 시간 추가
-                        time_2 = time_2 + final_touch_time      # 마무리 시간 추가
-                        finish.append(time_2)                   # 마무리 시간 추가
-                        num_joint += 1
-                        time = time + mold_preheating_time
-            
-        else:
-            while check_if_working_day(
-                time, working_time_min, working_time_max, work_on_saturday, 
-                work_on_sunday, work_on_holiday, three_day_shift
-                ) == False:
-                time = time + datetime.timedelta(hours=1)
+        stages, time = schedule_joint(time, durations, calendar)
+        metrics.increment("schedule_joints_total")
+        for stage_start, stage_finish in stages:
+            start.append(stage_start)
+            finish.append(stage_finish)
+        num_joint += 1
     
     col_names = ["Number", "Process", "Start", "Finish"]
     process_names = [f"{PROCESS_NAMES[j]}_{i+1}" for i in range(num_joints) for j in range(len(PROCESS_NAMES)) ]
@@ -334,3 +229,442 @@ def calculate_production_time(
     df["Finish"] = finish
 
     return df
+
+
+@metrics.timed("calculate_production_time_batch")
+def calculate_production_time_batch(
+    num_joints, start_time, injection_time, curing_time, cooling_time, mold_reset_time,
+    mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+    working_time_min, working_time_max,
+    work_on_saturday=False, work_on_sunday=False, work_on_holiday=False, three_day_shift=False,
+    working_time_mode=False, num_molds=1,
+):
+    """
+    접속재 제조 소요일 계산 (대량 수량용 batch 버전)
+
+    calculate_production_time 과 같은 일정을 계산하지만, 금형을 거치는 공정
+    (사출 ~ 탈형/조립)의 시작 시간만 접속재별로 순서대로 구하고 (schedule_mold_stages)
+    나머지 공정(건조, 외주가공, 마무리 작업)은 datetime64[ns] 배열로 한 번에 계산한다
+    (build_schedule_arrays). Number/Process 는 category 로 만든다.
+
+    Parameters
+    ----------
+    working_time_mode : boolean
+                        True 이면 LABOR_STAGES(사출, 탈형/조립)는 작업 시간만 소요 시간으로
+                        센다 (15시에 시작한 6시간 작업은 다음 작업일에 이어서 끝남)
+
+    num_molds         : int
+                        같은 금형 수. 2 이상이면 접속재를 가장 먼저 비는 금형에 배정하고
+                        (schedule_mold_lines) 결과에 Mold 열("mold_1", ...)을 추가한다
+
+    나머지는 calculate_production_time 과 같음
+
+    Returns
+    -------
+    접속재 제조 소요일 : dataframe
+
+    Examples
+    --------
+    >>> calculate_production_time_batch(5000, "2022-08-18", 1, 1, 1, 1, 1, 1, 1, 1, 9, 16)
+    """
+    return calculate_schedule_arrays(
+        num_joints, start_time, injection_time, curing_time, cooling_time, mold_reset_time,
+        mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+        working_time_min, working_time_max,
+        work_on_saturday, work_on_sunday, work_on_holiday, three_day_shift,
+        working_time_mode, num_molds,
+    ).to_frame()
+
+
+def calculate_schedule_arrays(
+    num_joints, start_time, injection_time, curing_time, cooling_time, mold_reset_time,
+    mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+    working_time_min, working_time_max,
+    work_on_saturday=False, work_on_sunday=False, work_on_holiday=False, three_day_shift=False,
+    working_time_mode=False, num_molds=1,
+):
+    """
+    접속재 제조 소요일 계산 (dataframe 대신 ScheduleArrays 반환)
+
+    완료 시간만 필요하거나 수량이 많을 때 사용한다. dataframe 이 필요하면 to_frame().
+
+    Parameters
+    ----------
+    calculate_production_time_batch 와 같음
+
+    Returns
+    -------
+    접속재 제조 소요일 : ScheduleArrays
+    """
+    time = datetime.datetime.strptime(start_time, '%Y-%m-%d')
+    # 공유 달력을 범위 밖 연도까지 늘리기 전에 막는다
+    _check_schedule_range([time])
+    durations = to_stage_durations(
+        injection_time, curing_time, cooling_time, mold_reset_time,
+        mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+    )
+    calendar = get_working_calendar(
+        working_time_min, working_time_max, work_on_saturday,
+        work_on_sunday, work_on_holiday, three_day_shift,
+    )
+
+    labor_stages = LABOR_STAGES if working_time_mode else ()
+    if num_molds > 1:
+        injection_starts, mold_reset_starts, molds, _ = schedule_mold_lines(
+            [time] * num_molds, durations, calendar, num_joints, labor_stages=labor_stages
+        )
+    else:
+        injection_starts, mold_reset_starts, _ = schedule_mold_stages(
+            time, durations, calendar, num_joints, labor_stages=labor_stages
+        )
+        molds = None
+    return build_schedule_arrays(
+        injection_starts, mold_reset_starts, durations, calendar, labor_stages=labor_stages,
+        molds=molds,
+    )
+
+
+@metrics.timed("schedule_mold_stages")
+def schedule_mold_stages(time, durations, calendar, num_joints, progress=None, labor_stages=()):
+    """
+    금형을 거치는 공정(사출 ~ 탈형/조립)의 시작 시간 계산
+
+    금형 공정은 앞 접속재가 끝나야 시작할 수 있으므로 접속재 순서대로 계산한다.
+
+    Parameters
+    ----------
+    time        : datetime
+                  금형 사용 가능 시간
+
+    durations   : StageDurations
+                  공정별 소요 시간
+
+    calendar    : WorkingCalendar
+                  작업 시간 달력
+
+    num_joints  : int
+                  계산할 접속재 수량
+
+    progress    : callable
+                  progress(계산한 수량, num_joints) 를 약 1% 마다 호출 (없으면 생략)
+
+    labor_stages : 공정 이름 목록
+                   작업 시간만 소요 시간으로 세는 공정 (calendar.add_working_hours)
+
+    Returns
+    -------
+    (사출 시작 시간 목록, 탈형/조립 시작 시간 목록, 다음 접속재의 금형 사용 가능 시간) : tuple
+    """
+    injection_calendar = calendar.stage("injection")
+    mold_reset_calendar = calendar.stage("mold_reset")
+    injection = _stage_advance(injection_calendar, "injection", durations.injection, labor_stages)
+    mold_reset = _stage_advance(mold_reset_calendar, "mold_reset", durations.mold_reset, labor_stages)
+    injection_starts = []
+    mold_reset_starts = []
+    step = max(1, num_joints // 100)
+    with _schedule_range():
+        for i in range(num_joints):
+            time = injection_calendar.next_working(time)
+            injection_starts.append(time)
+            time = mold_reset_calendar.next_working(injection(time) + durations.curing + durations.cooling)
+            mold_reset_starts.append(time)
+            time = mold_reset(time) + durations.mold_preheating
+            if progress is not None and (i + 1) % step == 0:
+                progress(i + 1, num_joints)
+    metrics.increment("schedule_joints_total", num_joints)
+    return injection_starts, mold_reset_starts, time
+
+
+@metrics.timed("schedule_mold_lines")
+def schedule_mold_lines(available, durations, calendar, num_joints, progress=None, labor_stages=(),
+                        stop=None):
+    """
+    같은 금형 여러 개로 금형 공정(사출 ~ 탈형/조립) 시작 시간 계산
+
+    접속재를 순서대로 가장 먼저 비는 금형에 배정한다. 금형별 사용 가능 시간을
+    min-heap 으로 관리하므로 접속재마다 O(log 금형 수) 이다.
+    (사용 가능 시간이 같으면 번호가 작은 금형)
+
+    Parameters
+    ----------
+    available   : list of datetime
+                  금형별 사용 가능 시간 (길이가 금형 수)
+
+    stop        : callable
+                  접속재마다 stop(탈형/조립 종료 시간) 을 호출해 True 이면 그 접속재까지만
+                  계산하고 멈춘다 (find_cheapest_plan 의 가지치기, 없으면 끝까지 계산)
+
+    나머지는 schedule_mold_stages 와 같음
+
+    Returns
+    -------
+    (사출 시작 시간 목록, 탈형/조립 시작 시간 목록, 금형 번호(0 부터) 목록,
+     금형별 다음 사용 가능 시간 목록) : tuple
+    """
+    injection_calendar = calendar.stage("injection")
+    mold_reset_calendar = calendar.stage("mold_reset")
+    injection = _stage_advance(injection_calendar, "injection", durations.injection, labor_stages)
+    mold_reset = _stage_advance(mold_reset_calendar, "mold_reset", durations.mold_reset, labor_stages)
+    heap = [(time, mold) for mold, time in enumerate(available)]
+    heapq.heapify(heap)
+    injection_starts = []
+    mold_reset_starts = []
+    molds = []
+    step = max(1, num_joints // 100)
+    with _schedule_range():
+        for i in range(num_joints):
+            time, mold = heap[0]
+            time = injection_calendar.next_working(time)
+            injection_starts.append(time)
+            time = mold_reset_calendar.next_working(injection(time) + durations.curing + durations.cooling)
+            mold_reset_starts.append(time)
+            molds.append(mold)
+            finish = mold_reset(time)
+            heapq.heapreplace(heap, (finish + durations.mold_preheating, mold))
+            if progress is not None and (i + 1) % step == 0:
+                progress(i + 1, num_joints)
+            if stop is not None and stop(finish):
+                break
+    metrics.increment("schedule_joints_total", len(injection_starts))
+
+    available = list(available)
+    for time, mold in heap:
+        available[mold] = time
+    return injection_starts, mold_reset_starts, molds, available
+
+
+@metrics.timed("build_schedule_arrays")
+def build_schedule_arrays(injection_starts, mold_reset_starts, durations, calendar, labor_stages=(),
+                          molds=None):
+    """
+    금형 공정 시작 시간으로부터 전체 일정 계산 (ScheduleArrays)
+
+    건조 이후 공정은 접속재끼리 독립이므로 datetime64[ns] 배열로 한 번에 계산한다.
+    (건조대/외주/마무리 작업대 수에 제한이 있으면 resources.schedule_with_resources 사용)
+    labor_stages 는 schedule_mold_stages 와 같은 값을, molds 는 schedule_mold_lines 의
+    금형 번호 목록을 넘긴다 (금형이 1개면 None).
+
+    Returns
+    -------
+    접속재 제조 소요일 : ScheduleArrays
+
+    Raises
+    ------
+    ValueError : 일정이 LATEST_SCHEDULE_TIME 을 넘는 경우 (datetime64[ns] overflow)
+    """
+    def advance(stage, start):
+        """공정 시작 시간 배열 -> 종료 시간 배열"""
+        duration = getattr(durations, stage)
+        with _schedule_range():
+            if stage in labor_stages:
+                finish = calendar.stage(stage).add_working_hours_array(start, duration / HOUR)
+            else:
+                finish = start + np.timedelta64(duration, "ns")
+        return _check_overflow(start, finish)
+
+    _check_schedule_range(injection_starts)
+    _check_schedule_range(mold_reset_starts)
+    injection_start = np.array(injection_starts, dtype="datetime64[ns]")
+    curing_start = advance("injection", injection_start)
+    cooling_start = advance("curing", curing_start)
+    cooling_finish = advance("cooling", cooling_start)
+    mold_reset_start = np.array(mold_reset_starts, dtype="datetime64[ns]")
+    drying_start = advance("mold_reset", mold_reset_start)
+    drying_finish = advance("drying", drying_start)
+    outsourcing = calendar.stage("outsourcing")
+    outsourcing_start = _check_overflow(drying_finish, outsourcing.next_working_array(drying_finish))
+    outsourcing_finish = _replace_hour(advance("outsourcing", outsourcing_start), outsourcing.pickup_hour)
+    final_touch_start = _check_overflow(
+        outsourcing_finish, calendar.stage("final_touch").next_working_array(outsourcing_finish)
+    )
+    final_touch_finish = advance("final_touch", final_touch_start)
+
+    start = np.column_stack([
+        injection_start, curing_start, cooling_start, mold_reset_start,
+        drying_start, outsourcing_start, final_touch_start,
+    ])
+    finish = np.column_stack([
+        curing_start, cooling_start, cooling_finish, drying_start,
+        drying_finish, outsourcing_finish, final_touch_finish,
+    ])
+    return ScheduleArrays(start, finish, molds)
+
+
+@metrics.timed("build_schedule_frame")
+def build_schedule_frame(injection_starts, mold_reset_starts, durations, calendar, labor_stages=(),
+                         molds=None):
+    """
+    금형 공정 시작 시간으로부터 전체 일정 dataframe 생성 (build_schedule_arrays(...).to_frame())
+
+    Returns
+    -------
+    접속재 제조 소요일 : dataframe
+    """
+    return build_schedule_arrays(
+        injection_starts, mold_reset_starts, durations, calendar, labor_stages=labor_stages,
+        molds=molds,
+    ).to_frame()
+
+
+class ScheduleArrays:
+    """
+    공정별 시작/종료 시간을 int64 배열로 담은 일정
+
+    start/finish 는 (접속재 수, 공정 수) 모양의 int64 배열 (1970-01-01 부터의 ns) 이다.
+    금형이 여러 개면 molds 에 접속재별 금형 번호(0 부터)를 담는다 (1개면 None).
+    접속재마다 datetime 객체와 "공정_번호" 문자열을 만들지 않으므로 수량이 많을 때
+    dataframe 보다 메모리를 적게 쓴다. 공정 이름/번호는 process_labels(), number_labels()
+    또는 to_frame() 을 호출할 때만 만든다.
+
+    Examples
+    --------
+    >>> schedule = calculate_schedule_arrays(10000, "2022-08-18", 1, 1, 1, 1, 1, 1, 1, 1, 9, 16)
+    >>> schedule.last_finish()
+    >>> schedule.to_frame()
+    """
+    __slots__ = ("start", "finish", "molds")
+
+    def __init__(self, start, finish, molds=None):
+        num_processes = len(PROCESS_NAMES)
+        self.start = np.asarray(start, dtype="datetime64[ns]").reshape(-1, num_processes).view(np.int64)
+        self.finish = np.asarray(finish, dtype="datetime64[ns]").reshape(-1, num_processes).view(np.int64)
+        self.molds = None if molds is None else np.asarray(molds, dtype=np.int32)
+
+    @property
+    def num_joints(self):
+        return self.start.shape[0]
+
+    def __len__(self):
+        """dataframe 으로 바꿨을 때의 행 수 (접속재 수 x 공정 수)"""
+        return self.start.size
+
+    @property
+    def nbytes(self):
+        return self.start.nbytes + self.finish.nbytes + (0 if self.molds is None else self.molds.nbytes)
+
+    def start_times(self):
+        """시작 시간 (datetime64[ns] 배열, 복사하지 않음)"""
+        return self.start.view("datetime64[ns]")
+
+    def finish_times(self):
+        """종료 시간 (datetime64[ns] 배열, 복사하지 않음)"""
+        return self.finish.view("datetime64[ns]")
+
+    def first_start(self):
+        """첫 공정 시작 시간 (접속재가 없으면 None)"""
+        if not self.start.size:
+            return None
+        return _to_datetime(self.start.min())
+
+    def last_finish(self):
+        """마지막 공정 종료 시간 (접속재가 없으면 None)"""
+        if not self.finish.size:
+            return None
+        return _to_datetime(self.finish.max())
+
+    def process_labels(self):
+        """공정 이름 ("사출_1", ...) 목록"""
+        return _process_labels(self.num_joints)
+
+    def number_labels(self):
+        """접속재 번호 ("1", ...) 목록"""
+        return _number_labels(self.num_joints)
+
+    def to_frame(self):
+        """calculate_production_time_batch 와 같은 dataframe 으로 변환"""
+        return make_schedule_frame(self.start_times(), self.finish_times(), self.molds)
+
+
+def make_schedule_frame(start, finish, molds=None):
+    """
+    (접속재 수, 공정 수) 모양의 시작/종료 시간 배열로 일정 dataframe 생성
+
+    Number/Process 는 category 로 만든다. molds(접속재별 금형 번호)가 있으면
+    Mold 열("mold_1", ..., category)을 추가한다.
+
+    Returns
+    -------
+    접속재 제조 소요일 : dataframe
+    """
+    import pandas as pd
+
+    start = np.asarray(start, dtype="datetime64[ns]").reshape(-1, len(PROCESS_NAMES))
+    finish = np.asarray(finish, dtype="datetime64[ns]").reshape(-1, len(PROCESS_NAMES))
+    num_joints, num_processes = start.shape
+    process_names = _process_labels(num_joints)
+    numbers = _number_labels(num_joints)
+
+    df = pd.DataFrame({
+        "Number": pd.Categorical.from_codes(
+            np.repeat(np.arange(num_joints), num_processes), categories=numbers
+        ),
+        "Process": pd.Categorical.from_codes(
+            np.arange(num_joints * num_processes), categories=process_names
+        ),
+        "Start": start.ravel(),
+        "Finish": finish.ravel(),
+    })
+    if molds is not None:
+        molds = np.asarray(molds)
+        num_molds = int(molds.max()) + 1 if len(molds) else 0
+        df["Mold"] = pd.Categorical.from_codes(
+            np.repeat(molds, num_processes), categories=_mold_labels(num_molds)
+        )
+    return df
+
+
+def _stage_advance(calendar, stage, duration, labor_stages):
+    """공정 시작 시간 -> 종료 시간 함수 (labor_stages 면 작업 시간만 셈)"""
+    if stage in labor_stages:
+        hours = duration / HOUR
+        return lambda start: calendar.add_working_hours(start, hours)
+    return lambda start: start + duration
+
+
+@contextmanager
+def _schedule_range():
+    """datetime/timedelta 계산 중 OverflowError 를 _check_overflow 와 같은 ValueError 로 바꾼다"""
+    try:
+        yield
+    except OverflowError as error:
+        raise ValueError(_OUT_OF_RANGE) from error
+
+
+def _check_schedule_range(times):
+    """datetime 목록이 datetime64[ns] 범위 안인지 확인"""
+    if len(times) and max(times) >= LATEST_SCHEDULE_TIME:
+        raise ValueError(_OUT_OF_RANGE)
+
+
+def _check_overflow(start, finish):
+    """시작보다 이른 종료 시간이 있으면 datetime64[ns] 범위를 넘은 것"""
+    if (finish < start).any():
+        raise ValueError(_OUT_OF_RANGE)
+    return finish
+
+
+_OUT_OF_RANGE = f"일정이 {LATEST_SCHEDULE_TIME:%Y-%m-%d} 이후까지 이어져 계산할 수 없습니다"
+# timedelta64[ns] 로 나타낼 수 있는 가장 긴 소요 시간
+_MAX_DURATION = datetime.timedelta(microseconds=int(np.iinfo(np.int64).max // 1000))
+
+
+def _to_datetime(nanoseconds):
+    return np.datetime64(int(nanoseconds), "ns").astype("datetime64[us]").item()
+
+
+def _process_labels(num_joints):
+    return [f"{process}_{i+1}" for i in range(num_joints) for process in PROCESS_NAMES]
+
+
+def _number_labels(num_joints):
+    return [str(i+1) for i in range(num_joints)]
+
+
+def _mold_labels(num_molds):
+    return [f"mold_{i+1}" for i in range(num_molds)]
+
+
+def _replace_hour(date_times, hour):
+    """datetime.replace(hour=hour) 의 배열 버전 (분/초는 유지)"""
+    within_hour = date_times - date_times.astype("datetime64[h]")
+    return date_times.astype("datetime64[D]") + np.timedelta64(hour, "h") + within_hour
@@ -0,0 +1,194 @@
+import datetime
+import heapq
+import numbers
+from collections import namedtuple
+
+from .production import make_schedule_frame, schedule_mold_stages, to_stage_durations
+from .working_calendar import get_working_calendar
+
+# None 이면 제한 없음 (calculate_production_time 과 같은 결과)
+ResourceCapacity = namedtuple(
+    "ResourceCapacity",
+    ["drying_racks", "vendor_batch_size", "finishing_stations"],
+    defaults=[None, None, None],
+)
+
+
+def calculate_production_time_with_resources(
+    num_joints, start_time, injection_time, curing_time, cooling_time, mold_reset_time,
+    mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+    working_time_min, working_time_max,
+    work_on_saturday=False, work_on_sunday=False, work_on_holiday=False, three_day_shift=False,
+    drying_racks=None, vendor_batch_size=None, finishing_stations=None,
+):
+    """
+    건조대/외주 가공/마무리 작업대 수를 고려한 접속재 제조 소요일 계산
+
+    Parameters
+    ----------
+    calculate_production_time 과 같음
+
+    drying_racks        : int
+                          건조대 수 (None 이면 제한 없음)
+
+    vendor_batch_size   : int
+                          외주 업체에 한 번에 보내는 수량
+                          (모일 때까지 기다렸다가 함께 출고, None 이면 1개씩)
+
+    finishing_stations  : int
+                          마무리 작업대 수 (None 이면 제한 없음)
+
+    Returns
+    -------
+    접속재 제조 소요일 : dataframe
+
+    Examples
+    --------
+    >>> calculate_production_time_with_resources(
+            50, "2022-08-18", 1, 1, 1, 1, 1, 1, 1, 1, 9, 16,
+            drying_racks=10, vendor_batch_size=5, finishing_stations=2)
+    """
+    durations = to_stage_durations(
+        injection_time, curing_time, cooling_time, mold_reset_time,
+        mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+    )
+    calendar = get_working_calendar(
+        working_time_min, working_time_max, work_on_saturday,
+        work_on_sunday, work_on_holiday, three_day_shift,
+    )
+    time = datetime.datetime.strptime(start_time, '%Y-%m-%d')
+    injection_starts, mold_reset_starts, _ = schedule_mold_stages(
+        time, durations, calendar, num_joints
+    )
+    capacity = ResourceCapacity(drying_racks, vendor_batch_size, finishing_stations)
+    return schedule_with_resources(
+        injection_starts, mold_reset_starts, durations, calendar, capacity
+    )
+
+
+def schedule_with_resources(injection_starts, mold_reset_starts, durations, calendar, capacity):
+    """
+    금형 공정 시작 시간으로부터 자원 제한을 고려한 전체 일정 dataframe 생성
+
+    준비된 시간 순서로 접속재를 꺼내는 event queue 와 작업대별 비는 시간을 담은
+    heap 으로 배정하므로 O(n log n) 이다.
+
+    Parameters
+    ----------
+    injection_starts   : list of datetime
+                         접속재별 사출 시작 시간
+
+    mold_reset_starts  : list of datetime
+                         접속재별 탈형/조립 시작 시간
+
+    durations          : StageDurations
+                         공정별 소요 시간
+
+    calendar           : WorkingCalendar
+                         작업 시간 달력
+
+    capacity           : ResourceCapacity
+                         자원 수
+
+    Returns
+    -------
+    접속재 제조 소요일 : dataframe
+
+    Raises
+    ------
+    ValueError : 자원 수가 1 이상의 정수가 아님
+    """
+    _check_capacity(capacity)
+    rows = []
+    for injection_start, mold_reset_start in zip(injection_starts, mold_reset_starts):
+        curing_start = injection_start + durations.injection
+        cooling_start = curing_start + durations.curing
+        rows.append([
+            (injection_start, curing_start),
+            (curing_start, cooling_start),
+            (cooling_start, cooling_start + durations.cooling),
+            (mold_reset_start, mold_reset_start + durations.mold_reset),
+        ])
+
+    # 건조 (화학 공정이므로 작업 시간과 무관하게 건조대가 비면 바로 시작)
+    drying = _run_stations(
+        [row[3][1] for row in rows], capacity.drying_racks,
+        start=lambda ready: ready,
+        finish=lambda start: start + durations.drying,
+    )
+
+    # 외주 가공 (vendor_batch_size 개가 모이면 함께 출고)
+    outsourcing = _run_vendor_batches(
+        [finish for _, finish in drying], capacity.vendor_batch_size,
+        start=calendar.stage("outsourcing").next_working,
+        finish=lambda start: (
+            start + durations.outsourcing
+        ).replace(hour=calendar.stage("outsourcing").pickup_hour),
+    )
+
+    # 마무리 작업
+    final_touch = _run_stations(
+        [finish for _, finish in outsourcing], capacity.finishing_stations,
+        start=calendar.stage("final_touch").next_working,
+        finish=lambda start: start + durations.final_touch,
+    )
+
+    for row, stages in zip(rows, zip(drying, outsourcing, final_touch)):
+        row.extend(stages)
+    start = [[stage_start for stage_start, _ in row] for row in rows]
+    finish = [[stage_finish for _, stage_finish in row] for row in rows]
+    return make_schedule_frame(start, finish)
+
+
+def _check_capacity(capacity):
+    """자원 수는 None(제한 없음) 또는 1 이상의 정수 (0 이면 배정할 작업대가 없다)"""
+    for name, value in capacity._asdict().items():
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, numbers.Integral) or value < 1:
+            raise ValueError(f"{name} 은 1 이상의 정수여야 합니다: {value!r}")
+
+
+def _run_stations(ready_times, num_stations, start, finish):
+    """
+    준비된 순서대로 num_stations 개 작업대에 배정
+
+    Returns
+    -------
+    접속재별 (시작, 종료) 목록 : list
+    """
+    events = [(ready, i) for i, ready in enumerate(ready_times)]
+    heapq.heapify(events)
+    free_at = []            # 사용 중인 작업대가 비는 시간 (heap)
+    result = [None] * len(ready_times)
+    while events:
+        ready, i = heapq.heappop(events)
+        if num_stations is not None and len(free_at) >= num_stations:
+            ready = max(ready, heapq.heappop(free_at))
+        stage_start = start(ready)
+        stage_finish = finish(stage_start)
+        if num_stations is not None:
+            heapq.heappush(free_at, stage_finish)
+        result[i] = (stage_start, stage_finish)
+    return result
+
+
+def _run_vendor_batches(ready_times, batch_size, start, finish):
+    """
+    준비된 순서대로 batch_size 개씩 묶어 마지막 접속재가 준비되면 함께 출고
+
+    Returns
+    -------
+    접속재별 (시작, 종료) 목록 : list
+    """
+    events = [(ready, i) for i, ready in enumerate(ready_times)]
+    heapq.heapify(events)
+    batch_size = batch_size or 1
+    result = [None] * len(ready_times)
+    while events:
+        batch = [heapq.heappop(events) for _ in range(min(batch_size, len(events)))]
+        stage_start = start(batch[-1][0])
+        stage_finish = finish(stage_start)
+        for _, i in batch:
+            result[i] = (stage_start, stage_finish)
+    return result
@@ -0,0 +1,176 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+
+# 기본 캐시 폴더 (XDG_CACHE_HOME 또는 ~/.cache 아래, 소유자만 접근 가능)
+CACHE_DIR_NAME = "production_schedule"
+CACHE_FILE_NAME = "cache.sqlite3"
+
+
+def default_cache_path():
+    """
+    사용자별 기본 캐시 파일 경로 (~/.cache/production_schedule/cache.sqlite3)
+
+    캐시 값은 pickle 로 저장하므로 다른 사용자가 파일을 바꿔 넣을 수 있으면 안 된다.
+    누구나 쓸 수 있는 임시 폴더 대신 소유자만 접근할 수 있는(0700) 폴더를 쓴다.
+    홈 폴더에 쓸 수 없으면 임시 폴더 아래 사용자별 폴더를 같은 조건으로 쓴다.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    try:
+        directory = _private_directory(os.path.join(base, CACHE_DIR_NAME))
+    except OSError:
+        user = os.getuid() if hasattr(os, "getuid") else "user"
+        directory = _private_directory(os.path.join(tempfile.gettempdir(), f"{CACHE_DIR_NAME}-{user}"))
+    return os.path.join(directory, CACHE_FILE_NAME)
+
+
+def _private_directory(path):
+    """소유자만 접근할 수 있는 폴더를 만들어 반환 (다른 사용자 소유면 PermissionError)"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    _check_owner(path)
+    if os.stat(path).st_mode & 0o077:
+        os.chmod(path, 0o700)
+    return path
+
+
+def _check_owner(path):
+    """path 가 현재 사용자 소유가 아니면 PermissionError (pickle 을 읽기 전에 확인)"""
+    if hasattr(os, "getuid") and os.stat(path).st_uid != os.getuid():
+        raise PermissionError(f"다른 사용자 소유라 캐시로 쓸 수 없습니다: {path}")
+
+
+def normalize_params(*params):
+    """
+    캐시 key 용으로 입력값 정리
+
+    1 과 1.0, 앞뒤 공백 등 같은 일정을 만드는 입력이 같은 key 가 되도록 맞춘다.
+    """
+    normalized = []
+    for value in params:
+        if isinstance(value, bool) or value is None:
+            normalized.append(value)
+        elif isinstance(value, (int, float)):
+            normalized.append(float(value))
+        elif isinstance(value, str):
+            normalized.append(value.strip())
+        else:
+            normalized.append(repr(value))
+    return tuple(normalized)
+
+
+class ScheduleCache:
+    """
+    SQLite 파일 기반 LRU/TTL 캐시
+
+    gunicorn worker 들이 같은 파일을 쓰므로 한 worker 가 계산한 일정/그래프를
+    다른 worker 도 재사용한다. hits/misses 는 프로세스별로 센다.
+
+    Parameters
+    ----------
+    path         : str
+                   SQLite 파일 경로 (없으면 default_cache_path())
+
+    max_entries  : int
+                   최대 저장 개수 (넘으면 가장 오래 안 쓴 것부터 삭제)
+
+    ttl          : float
+                   유효 시간 [초]
+
+    Examples
+    --------
+    >>> cache = ScheduleCache("schedule.sqlite3", max_entries=128, ttl=3600)
+    >>> df = cache.get_or_compute("schedule", (5, "2022-08-18"), lambda: compute(...))
+    >>> cache.stats()
+    {'hits': 0, 'misses': 1, 'entries': 1}
+    """
+
+    def __init__(self, path=None, max_entries=128, ttl=3600):
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+
+    def _connection(self):
+        # sqlite 연결은 스레드/프로세스(fork) 사이에 공유하지 않는다
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            try:
+                # 미리 심어 둔 남의 파일에서 pickle 을 읽지 않는다
+                _check_owner(self.path)
+            except PermissionError:
+                connection.close()
+                raise
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB, created REAL, accessed REAL)"
+            )
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @staticmethod
+    def _key(namespace, params):
+        return namespace + ":" + hashlib.sha1(repr(params).encode("utf-8")).hexdigest()
+
+    def get(self, namespace, params):
+        """저장된 값 반환, 없거나 만료되었으면 None"""
+        key = self._key(namespace, params)
+        connection = self._connection()
+        now = time.time()
+        row = connection.execute(
+            "SELECT value, created FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or now - row[1] > self.ttl:
+            if row is not None:
+                connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self.misses += 1
+            return None
+        connection.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def set(self, namespace, params, value):
+        key = self._key(namespace, params)
+        connection = self._connection()
+        now = time.time()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), now, now),
+        )
+        connection.execute(
+            "DELETE FROM cache WHERE key IN ("
+            "SELECT key FROM cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def get_or_compute(self, namespace, params, compute):
+        """캐시에 있으면 반환, 없으면 compute() 결과를 저장 후 반환"""
+        value = self.get(namespace, params)
+        if value is None:
+            value = compute()
+            self.set(namespace, params, value)
+        return value
+
+    def clear(self):
+        self._connection().execute("DELETE FROM cache")
+
+    def stats(self):
+        entries = self._connection().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+def cache_from_env():
+    """환경 변수(SCHEDULE_CACHE_PATH, SCHEDULE_CACHE_MAX_ENTRIES, SCHEDULE_CACHE_TTL)로 캐시 생성"""
+    return ScheduleCache(
+        path=os.environ.get("SCHEDULE_CACHE_PATH"),
+        max_entries=int(os.environ.get("SCHEDULE_CACHE_MAX_ENTRIES", 128)),
+        ttl=float(os.environ.get("SCHEDULE_CACHE_TTL", 3600)),
+    )
@@ -0,0 +1,111 @@
+import datetime
+import math
+import numbers
+
+from .production import LATEST_SCHEDULE_TIME
+
+# 화면에 입력한 값 검사용 (app.py 의 clientside 검사와 같은 규칙)
+DURATION_PARAMS = [
+    "injection_time", "curing_time", "cooling_time", "mold_reset_time",
+    "mold_preheating_time", "drying_time", "outsourcing_time", "final_touch_time",
+]
+# [일] 단위 소요 시간 (나머지는 [시간])
+DAY_PARAMS = ["drying_time", "outsourcing_time", "final_touch_time"]
+# 공정 하나의 최대 소요 시간 (1년)
+MAX_DURATION_HOURS = 24 * 365
+MAX_DURATION_DAYS = 365
+# 전체 일정 기간 상한 추정 (estimate_horizon_days) 에 쓰는 값. 실제보다 길게 잡는다.
+#   WAIT_DAYS      : 다음 작업 시간까지 기다리는 최대 기간 (금요일 퇴근 ~ 월요일 출근)
+#   WEEK_FACTOR    : 주 5일 근무일 때 작업일 1일에 걸리는 달력 일수
+#   HOLIDAY_FACTOR : 공휴일 (1년에 30일 이하)
+WAIT_DAYS = 3
+WEEK_FACTOR = 7 / 5
+HOLIDAY_FACTOR = 365 / (365 - 30)
+# 작업 시작 일의 연도 범위 (일정 배열 datetime64[ns] 는 2262 년까지만 되므로 긴 일정도 들어가게 여유를 둔다)
+MIN_YEAR = 1900
+MAX_YEAR = 2200
+
+
+def validate_schedule_inputs(num_joints, start_time, working_time_min, working_time_max, num_molds=1,
+                             **durations):
+    """
+    calculate_production_time 에 넘기기 전에 입력값 검사
+
+    Returns
+    -------
+    오류 메시지 목록 (비어 있으면 정상) : list of str
+
+    Examples
+    --------
+    >>> validate_schedule_inputs(5, "2022-08-1", 9, 16, injection_time=1)
+    ['작업 시작 일은 YYYY-MM-DD 형식이어야 합니다']
+    """
+    errors = []
+    if not _is_number(num_joints) or num_joints < 1 or int(num_joints) != num_joints:
+        errors.append("필요 개수는 1 이상의 정수여야 합니다")
+    if not _is_number(num_molds) or num_molds < 1 or int(num_molds) != num_molds:
+        errors.append("금형 수는 1 이상의 정수여야 합니다")
+    try:
+        start = datetime.datetime.strptime(str(start_time), '%Y-%m-%d')
+        if len(str(start_time)) != 10:
+            raise ValueError
+    except ValueError:
+        errors.append("작업 시작 일은 YYYY-MM-DD 형식이어야 합니다")
+    else:
+        if not MIN_YEAR <= start.year <= MAX_YEAR:
+            errors.append(f"작업 시작 일은 {MIN_YEAR} ~ {MAX_YEAR} 년이어야 합니다")
+    if not (_is_number(working_time_min) and _is_number(working_time_max)
+            and 0 <= working_time_min <= working_time_max <= 23):
+        errors.append("작업 시작 가능 시간은 0 ~ 23 시이고 Early <= Late 여야 합니다")
+    for name, value in durations.items():
+        limit = MAX_DURATION_DAYS if name in DAY_PARAMS else MAX_DURATION_HOURS
+        unit = "일" if name in DAY_PARAMS else "시간"
+        if not _is_number(value) or value < 0:
+            errors.append(f"소요시간({name})은 0 이상의 숫자여야 합니다")
+        elif value > limit:
+            errors.append(f"소요시간({name})은 {limit} {unit} 이하여야 합니다")
+    if not errors:
+        horizon = estimate_horizon_days(
+            num_joints, num_molds, working_time_min, working_time_max, **durations
+        )
+        if horizon >= (LATEST_SCHEDULE_TIME - start) / datetime.timedelta(days=1):
+            errors.append(
+                f"일정이 {LATEST_SCHEDULE_TIME:%Y-%m-%d} 이후까지 이어질 수 있습니다 "
+                f"(필요 개수, 소요시간을 줄이거나 금형 수를 늘려 주세요)"
+            )
+    return errors
+
+
+def estimate_horizon_days(num_joints, num_molds, working_time_min, working_time_max, **durations):
+    """
+    작업 시작부터 마지막 공정 종료까지 기간의 상한 [일]
+
+    근무 조건과 관계없이 가장 오래 걸리는 경우(주말/공휴일 휴무, 사출/탈형 및 조립을
+    작업 시간으로만 계산)를 가정한다. 접속재마다 다음 작업 시간까지 두 번 기다리고,
+    금형이 여러 개면 가장 늦게 끝나는 금형도 평균보다 접속재 1개 분량만 늦다.
+
+    Examples
+    --------
+    >>> estimate_horizon_days(10, 1, 9, 16, injection_time=1, mold_reset_time=1)
+    """
+    def duration(name):
+        return durations.get(name, 0)
+
+    hours_per_day = working_time_max - working_time_min + 1
+    # 작업 시간으로만 세는 공정: 첫날 남은 시간 + 작업일 수 (주말 포함)
+    labor_days = sum(
+        (duration(name) / hours_per_day + 1) * WEEK_FACTOR + 1
+        for name in ("injection_time", "mold_reset_time")
+    )
+    cycle_days = (
+        labor_days + 2 * WAIT_DAYS
+        + (duration("curing_time") + duration("cooling_time") + duration("mold_preheating_time")) / 24
+    )
+    # 건조 이후: 외주 가공/마무리 전 대기 + 외주품 회수 시각(하루 안)
+    tail_days = sum(duration(name) for name in DAY_PARAMS) + 2 * WAIT_DAYS + 1
+    return ((num_joints / num_molds + 1) * cycle_days + tail_days) * HOLIDAY_FACTOR
+
+
+def _is_number(value):
+    return (isinstance(value, numbers.Number) and not isinstance(value, bool)
+            and math.isfinite(value))
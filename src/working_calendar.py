@@ -0,0 +1,438 @@
+import datetime
+from functools import lru_cache
+
+import numpy as np
+
+from . import calendar_store, metrics
+
+HOUR = datetime.timedelta(hours=1)
+HOUR_NS = 3_600_000_000_000
+
+DEFAULT_FIRST_YEAR = 2020
+DEFAULT_LAST_YEAR = 2030
+
+# 표는 BLOCK_YEARS 년 단위(2020 ~ 2039 처럼 정렬된 구간)로 만들고 저장한다.
+# 범위 밖 날짜가 오면 블록을 더 붙이므로 중간 범위의 표가 따로 쌓이지 않는다.
+BLOCK_YEARS = 20
+# 일정 배열(datetime64[ns])로 나타낼 수 있는 연도 (1677-09-21 ~ 2262-04-11)
+FIRST_CALENDAR_YEAR = 1680
+LAST_CALENDAR_YEAR = 2262
+
+
+class WorkingCalendar:
+    """
+    작업 시간 달력 (시간 단위 bitmap)
+
+    연도 범위 전체의 매 시간을 작업 가능 여부(bool)로 미리 계산해 두고,
+    check_if_working_day와 같은 답을 O(1)/O(log n)으로 돌려준다.
+    범위 밖의 날짜가 들어오면 BLOCK_YEARS 년 단위 블록을 붙여 범위를 넓힌다.
+
+    Parameters
+    ----------
+    first_year, last_year : int
+                            달력에 포함할 연도 범위 (양 끝 포함)
+
+    working_time_min  : int
+                        작업 시작 가능 시간(Early) [시]
+
+    working_time_max  : int
+                        작업 시작 가능 시간(Late) [시]
+
+    work_on_saturday  : boolean
+                        토요일 근무 여부
+
+    work_on_sunday    : boolean
+                        일요일 근무 여부
+
+    work_on_holiday   : boolean
+                        공휴일 근무 여부
+
+    three_day_shift   : boolean
+                        잠 안자고 네버스탑???
+                        (this option overwrite other parameters)
+
+    Examples
+    --------
+    >>> calendar = WorkingCalendar(2022, 2022, 9, 16)
+    >>> calendar.is_working(datetime.datetime(2022, 8, 15, 9, 0))
+    False
+    >>> calendar.next_working(datetime.datetime(2022, 8, 15, 9, 0))
+    datetime.datetime(2022, 8, 16, 9, 0)
+    """
+
+    # 외주 가공품 회수 시각 (PlantCalendar 에서는 공정별로 지정 가능)
+    pickup_hour = 10
+
+    def __init__(self, first_year, last_year, working_time_min, working_time_max,
+                 work_on_saturday=False, work_on_sunday=False,
+                 work_on_holiday=False, three_day_shift=False):
+        self.working_time_min = working_time_min
+        self.working_time_max = working_time_max
+        self.work_on_saturday = bool(work_on_saturday)
+        self.work_on_sunday = bool(work_on_sunday)
+        self.work_on_holiday = bool(work_on_holiday)
+        self.three_day_shift = bool(three_day_shift)
+
+        # 하루 중 작업 가능한 시각 (0~23시)
+        self.hour_mask = np.array(
+            [working_time_min <= hour <= working_time_max for hour in range(24)], dtype=bool
+        )
+        self._build(first_year, last_year)
+
+    @metrics.timed("working_calendar_build")
+    def _build(self, first_year, last_year):
+        blocks = calendar_blocks(first_year, last_year)
+        masks, workings = zip(*(self._block_tables(*block) for block in blocks))
+        if len(blocks) == 1:
+            mask, working = masks[0], workings[0]
+        else:
+            # 블록별 작업 시간 칸 번호를 첫 블록 시작 기준으로 바꿔 잇는다
+            offsets = np.cumsum([0] + [len(block_mask) for block_mask in masks[:-1]])
+            mask = np.concatenate(masks)
+            working = np.concatenate([
+                block_working + np.int32(offset) for block_working, offset in zip(workings, offsets)
+            ])
+        first_year, last_year = blocks[0][0], blocks[-1][1]
+
+        # 한 번에 교체해야 다른 스레드가 반쯤 만든 표를 보지 않는다
+        self._table = (first_year, last_year, datetime.datetime(first_year, 1, 1), mask, working)
+        self._cumulative = None     # working_hours_between 용 누적 합 (필요할 때 생성)
+
+    def _block_tables(self, first_year, last_year):
+        """블록 하나의 (시간별 작업 여부, 작업 시간 칸 번호) 표"""
+        # 시간 단위 표는 calendar_store 에 저장해 두고 다른 프로세스와 공유한다
+        name = f"hours_{first_year}-{last_year}_{self._table_key()}"
+        mask = calendar_store.load_or_build(
+            name + "_mask", lambda: self._build_mask(first_year, last_year)
+        )
+        working = calendar_store.load_or_build(
+            name + "_working", lambda: np.flatnonzero(mask).astype(np.int32)
+        )
+        return mask, working
+
+    def _table_key(self):
+        """근무 조건별 표 이름 (작업 가능 시각은 24 bit 로 표시)"""
+        if self.three_day_shift:
+            return "three_day_shift"
+        hours = sum(1 << hour for hour in range(24) if self.hour_mask[hour])
+        return (
+            f"h{hours:06x}_sat{int(self.work_on_saturday)}"
+            f"_sun{int(self.work_on_sunday)}_hol{int(self.work_on_holiday)}"
+        )
+
+    def _build_mask(self, first_year, last_year):
+        metrics.increment("schedule_calendar_builds_total")
+        days = np.arange(
+            np.datetime64(f"{first_year:04d}-01-01"),
+            np.datetime64(f"{last_year + 1:04d}-01-01"),
+            dtype="datetime64[D]",
+        )
+        if self.three_day_shift:
+            return np.ones(len(days) * 24, dtype=bool)
+        weekday = (days.astype(np.int64) + 3) % 7     # 1970-01-01 은 목요일 (월요일 = 0)
+
+        day_mask = weekday < 5
+        if self.work_on_saturday:
+            day_mask |= weekday == 5
+        if self.work_on_sunday:
+            day_mask |= weekday == 6
+        if not self.work_on_holiday:
+            day_mask &= ~np.isin(days, holiday_days(first_year, last_year))
+        return (day_mask[:, None] & self.hour_mask[None, :]).ravel()
+
+    def stage(self, name):
+        """공정별 달력 (WorkingCalendar 는 모든 공정이 같은 달력, PlantCalendar 참고)"""
+        return self
+
+    @property
+    def first_year(self):
+        return self._table[0]
+
+    @property
+    def last_year(self):
+        return self._table[1]
+
+    def _check_working_hours(self):
+        """작업 시간 칸이 하나도 없으면 (working_time_min > working_time_max 등) ValueError"""
+        if not self.hour_mask.any():
+            raise ValueError(
+                f"작업 가능 시간이 없습니다 "
+                f"(working_time_min={self.working_time_min}, working_time_max={self.working_time_max})"
+            )
+
+    def _ensure_year(self, year):
+        first_year, last_year = self._table[:2]
+        if first_year <= year <= last_year:
+            return
+        self._build(min(first_year, year), max(last_year, year))
+
+    def hour_index(self, date_time):
+        """달력 시작 시점부터 date_time 까지의 시간 수 (분/초는 버림)"""
+        self._ensure_year(date_time.year)
+        return (date_time - self._table[2]) // HOUR
+
+    def is_working(self, date_time):
+        """
+        작업 시간인지 확인 (check_if_working_day 와 같은 결과)
+
+        Parameters
+        ----------
+        date_time : datetime (datetime.datetime(2022, 8, 18, 9, 0))
+                    날짜
+
+        Returns
+        -------
+        작업 시간 여부 : boolean
+        """
+        if self.three_day_shift:
+            return True
+        metrics.increment("schedule_calendar_lookups_total", kind="is_working")
+        index = self.hour_index(date_time)
+        return bool(self._table[3][index])
+
+    def next_working(self, date_time):
+        """
+        date_time 이후(포함) 첫 작업 시간
+
+        한 시간씩 더해가며 check_if_working_day 를 확인하는 것과 같은 결과이며
+        분/초는 그대로 유지된다.
+
+        Parameters
+        ----------
+        date_time : datetime (datetime.datetime(2022, 8, 18, 9, 0))
+                    날짜
+
+        Returns
+        -------
+        작업 시간 : datetime
+        """
+        if self.three_day_shift:
+            return date_time
+        self._check_working_hours()
+
+        metrics.increment("schedule_calendar_lookups_total", kind="next_working")
+        index = self.hour_index(date_time)
+        while True:
+            _, last_year, _, mask, working = self._table
+            if mask[index]:
+                return date_time
+            position = np.searchsorted(working, index)
+            if position < len(working):
+                return date_time + int(working[position] - index) * HOUR
+            # 남은 작업 시간이 없으면 다음 해까지 달력을 넓힌다
+            self._ensure_year(last_year + 1)
+
+    def working_hours_between(self, start, end):
+        """
+        [start, end) 사이 작업 시간 수 (시간 단위 칸 개수)
+
+        누적 합을 한 번 만들어 두고 O(1) 로 계산한다.
+
+        Parameters
+        ----------
+        start, end : datetime
+                     구간 시작/끝
+        """
+        if end <= start:
+            return 0
+        self._ensure_year(start.year)
+        self._ensure_year(end.year)
+        table = self._table
+        cumulative = self._cumulative
+        if cumulative is None or cumulative[0] is not table:
+            cumulative = (table, np.concatenate([[0], np.cumsum(table[3], dtype=np.int64)]))
+            self._cumulative = cumulative
+        origin = table[2]
+        return int(
+            cumulative[1][(end - origin) // HOUR] - cumulative[1][(start - origin) // HOUR]
+        )
+
+    def add_working_hours(self, date_time, hours):
+        """
+        date_time 부터 작업 시간만 hours 시간 지난 시각
+
+        작업 시간이 아닌 시간(밤, 주말, 공휴일)은 세지 않는다. 작업 시간 칸 목록이
+        정렬되어 있으므로 "k 번째 작업 시간 칸" 을 바로 찾는다 (searchsorted 한 번).
+
+        Parameters
+        ----------
+        date_time : datetime
+                    시작 시각
+
+        hours     : float
+                    작업 시간 [시간]
+
+        Returns
+        -------
+        종료 시각 : datetime
+        """
+        if hours <= 0:
+            return date_time
+        if self.three_day_shift:
+            return date_time + datetime.timedelta(hours=hours)
+        finish = self.add_working_hours_array(np.array([date_time], dtype="datetime64[ns]"), hours)
+        return finish[0].astype("datetime64[us]").item()
+
+    def add_working_hours_array(self, date_times, hours):
+        """
+        add_working_hours 의 배열 버전
+
+        Parameters
+        ----------
+        date_times : numpy.ndarray (datetime64)
+                     시작 시각 배열
+
+        hours      : float
+                     작업 시간 [시간]
+
+        Returns
+        -------
+        종료 시각 배열 : numpy.ndarray (datetime64[ns])
+        """
+        date_times = np.asarray(date_times, dtype="datetime64[ns]")
+        amount = int(round(hours * HOUR_NS))
+        if date_times.size == 0 or amount <= 0:
+            return date_times
+        if self.three_day_shift:
+            return date_times + np.timedelta64(amount, "ns")
+        self._check_working_hours()
+
+        years = date_times.astype("datetime64[Y]").astype(np.int64) + 1970
+        self._ensure_year(int(years.min()))
+        self._ensure_year(int(years.max()))
+
+        values = date_times.astype(np.int64)
+        while True:
+            _, last_year, origin, mask, working = self._table
+            elapsed = values - np.datetime64(origin, "ns").astype(np.int64)
+            index = elapsed // HOUR_NS
+            # 시작 전까지 지난 작업 시간 칸 수 + 시작 칸 안에서 지난 시간
+            done = np.searchsorted(working, index) * HOUR_NS
+            done = done + np.where(mask[index], elapsed - index * HOUR_NS, 0)
+            target = done + amount
+            # target 이 끝나는 칸 = (target 을 올림한 칸 수) 번째 작업 시간 칸
+            count = (target - 1) // HOUR_NS
+            if (count < len(working)).all():
+                finish = working[count].astype(np.int64) * HOUR_NS + (target - count * HOUR_NS)
+                return (finish + np.datetime64(origin, "ns").astype(np.int64)).astype("datetime64[ns]")
+            self._ensure_year(last_year + 1)
+
+    def next_working_array(self, date_times):
+        """
+        next_working 의 배열 버전
+
+        Parameters
+        ----------
+        date_times : numpy.ndarray (datetime64)
+                     날짜 배열
+
+        Returns
+        -------
+        작업 시간 배열 : numpy.ndarray (datetime64[ns])
+        """
+        date_times = np.asarray(date_times, dtype="datetime64[ns]")
+        if self.three_day_shift or date_times.size == 0:
+            return date_times
+        self._check_working_hours()
+
+        years = date_times.astype("datetime64[Y]").astype(np.int64) + 1970
+        self._ensure_year(int(years.min()))
+        self._ensure_year(int(years.max()))
+
+        metrics.increment("schedule_calendar_lookups_total", date_times.size, kind="next_working")
+        values = date_times.astype(np.int64)
+        while True:
+            _, last_year, origin, _, working = self._table
+            index = (values - np.datetime64(origin, "ns").astype(np.int64)) // HOUR_NS
+            position = np.searchsorted(working, index)
+            if (position < len(working)).all():
+                return (values + (working[position] - index) * HOUR_NS).astype("datetime64[ns]")
+            self._ensure_year(last_year + 1)
+
+
+def calendar_blocks(first_year, last_year):
+    """
+    first_year ~ last_year 를 덮는 BLOCK_YEARS 년 단위 구간 [(첫 해, 마지막 해), ...]
+
+    Raises
+    ------
+    ValueError : FIRST_CALENDAR_YEAR ~ LAST_CALENDAR_YEAR 밖의 연도
+
+    Examples
+    --------
+    >>> calendar_blocks(2020, 2041)
+    [(2020, 2039), (2040, 2059)]
+    """
+    if first_year < FIRST_CALENDAR_YEAR or last_year > LAST_CALENDAR_YEAR:
+        raise ValueError(
+            f"달력은 {FIRST_CALENDAR_YEAR} ~ {LAST_CALENDAR_YEAR} 년만 만들 수 있습니다 "
+            f"({first_year} ~ {last_year} 년 요청)"
+        )
+    blocks = []
+    year = first_year - first_year % BLOCK_YEARS
+    while year <= last_year:
+        blocks.append((max(year, FIRST_CALENDAR_YEAR), min(year + BLOCK_YEARS - 1, LAST_CALENDAR_YEAR)))
+        year += BLOCK_YEARS
+    return blocks
+
+
+def holiday_days(first_year, last_year):
+    """
+    연도 범위의 한국 공휴일 (datetime64[D] 배열, 근무 조건이 달라도 공유)
+
+    calendar_blocks 단위로 만들어 저장하므로 범위 앞뒤 블록의 공휴일도 들어 있다.
+    """
+    blocks = calendar_blocks(first_year, last_year)
+    return np.concatenate([_block_holiday_days(*block) for block in blocks])
+
+
+@lru_cache(maxsize=16)
+def _block_holiday_days(first_year, last_year):
+    def build():
+        import holidays  # import 가 느려 처음 표를 만들 때 불러온다
+
+        metrics.increment("schedule_holiday_table_builds_total")
+        kr_holidays = holidays.KR(years=range(first_year, last_year + 1))
+        return np.array(sorted(kr_holidays.keys()), dtype="datetime64[D]")
+
+    return calendar_store.load_or_build(f"holidays_{first_year}-{last_year}", build)
+
+
+@lru_cache(maxsize=64)
+def _cached_calendar(working_time_min, working_time_max, work_on_saturday,
+                     work_on_sunday, work_on_holiday, three_day_shift):
+    return new_working_calendar(
+        working_time_min, working_time_max, work_on_saturday,
+        work_on_sunday, work_on_holiday, three_day_shift,
+    )
+
+
+def new_working_calendar(working_time_min, working_time_max,
+                         work_on_saturday=False, work_on_sunday=False,
+                         work_on_holiday=False, three_day_shift=False):
+    """
+    공유 캐시(get_working_calendar)에 넣지 않는 WorkingCalendar
+
+    조건을 많이 바꿔 보는 계산(optimizer.find_cheapest_plan)이 warm-up 으로 미리 만든
+    달력을 캐시에서 밀어내지 않도록 쓴다. 표는 calendar_store 파일을 그대로 연다.
+    """
+    return WorkingCalendar(
+        DEFAULT_FIRST_YEAR, DEFAULT_LAST_YEAR, working_time_min, working_time_max,
+        bool(work_on_saturday), bool(work_on_sunday), bool(work_on_holiday), bool(three_day_shift),
+    )
+
+
+def get_working_calendar(working_time_min, working_time_max,
+                         work_on_saturday=False, work_on_sunday=False,
+                         work_on_holiday=False, three_day_shift=False):
+    """
+    조건별로 한 번만 만든 WorkingCalendar 반환
+
+    Examples
+    --------
+    >>> calendar = get_working_calendar(9, 16, work_on_saturday=True)
+    """
+    return _cached_calendar(
+        working_time_min, working_time_max, bool(work_on_saturday),
+        bool(work_on_sunday), bool(work_on_holiday), bool(three_day_shift),
+    )
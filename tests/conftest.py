@@ -0,0 +1,12 @@
+"""
+테스트용 환경 변수 (src.app 을 import 하기 전에 설정)
+
+캐시/달력 파일은 테스트마다 새 임시 폴더에 만들고 서버 시작 시 warm-up 은 하지 않는다.
+"""
+import os
+import tempfile
+
+_directory = tempfile.mkdtemp(prefix="production_schedule_tests.")
+os.environ.setdefault("SCHEDULE_WARMUP", "off")
+os.environ.setdefault("SCHEDULE_CACHE_PATH", os.path.join(_directory, "cache.sqlite3"))
+os.environ.setdefault("SCHEDULE_CALENDAR_DIR", os.path.join(_directory, "calendars"))
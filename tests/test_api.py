@@ -0,0 +1,95 @@
+"""
+/api/schedule, /export/schedule 라우트 확인 (flask test client)
+
+    python -m pytest tests
+"""
+import pytest
+
+from src.app import server
+
+PARAMS = {
+    "num_joints": 3, "start_time": "2022-08-01",
+    "injection_time": 1, "curing_time": 1, "cooling_time": 1, "mold_reset_time": 1,
+    "mold_preheating_time": 1, "drying_time": 1, "outsourcing_time": 1, "final_touch_time": 1,
+    "working_time_min": 9, "working_time_max": 16,
+}
+
+
+@pytest.fixture
+def client():
+    return server.test_client()
+
+
+def test_schedule(client):
+    response = client.post("/api/schedule", json=PARAMS)
+    assert response.status_code == 200
+    assert len(response.get_json()["start"]) == 3
+
+
+@pytest.mark.parametrize("absurd", [
+    {"curing_time": 1e9}, {"drying_time": 1e12}, {"injection_time": 1e20},
+    {"final_touch_time": 1e9}, {"mold_reset_time": 1e6},
+])
+def test_absurd_durations_are_rejected(client, absurd):
+    response = client.post("/api/schedule", json={**PARAMS, **absurd})
+    assert response.status_code == 400
+    assert response.get_json()["error"]
+
+    query = {name: str(value) for name, value in {**PARAMS, **absurd}.items()}
+    response = client.get("/export/schedule.csv", query_string=query)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("name, value", [
+    ("num_joints", 1.5), ("num_joints", "1.5"), ("num_joints", "inf"), ("num_joints", float("inf")),
+    ("num_molds", 2.5), ("injection_time", "nan"), ("injection_time", True),
+    ("work_on_saturday", "yes"), ("work_on_saturday", "maybe"), ("working_time_mode", 1),
+])
+def test_rejects_loose_values(client, name, value):
+    response = client.post("/api/schedule", json={**PARAMS, name: value})
+    assert response.status_code == 400, response.get_data(as_text=True)
+
+    query = {**{key: str(item) for key, item in PARAMS.items()}, name: str(value)}
+    response = client.get("/api/schedule", query_string=query)
+    assert response.status_code == 400, response.get_data(as_text=True)
+
+
+def test_accepts_integral_and_boolean_strings(client):
+    query = {**{key: str(item) for key, item in PARAMS.items()},
+             "num_joints": "3.0", "work_on_saturday": "true", "working_time_mode": "False"}
+    response = client.get("/api/schedule", query_string=query)
+    assert response.status_code == 200
+    params = response.get_json()["params"]
+    assert params["num_joints"] == 3
+    assert params["work_on_saturday"] is True and params["working_time_mode"] is False
+
+
+def test_etag_not_modified(client):
+    response = client.post("/api/schedule", json=PARAMS)
+    etag = response.headers["ETag"]
+    assert etag
+
+    response = client.post("/api/schedule", json=PARAMS, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert not response.get_data()
+
+    changed = client.post("/api/schedule", json={**PARAMS, "num_joints": 4}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_batch_reports_each_bad_scenario(client):
+    response = client.post("/api/schedule/batch", json={"scenarios": [PARAMS, {**PARAMS, "num_joints": 1.5}]})
+    assert response.status_code == 400
+    assert "시나리오 2" in response.get_json()["error"]
+
+
+def test_inline_optimizer_caps_joints():
+    from src.app import show_cheapest_plan
+
+    durations = [1] * 8
+    message = show_cheapest_plan(1, "2022-09-30", 0, 600, "2022-08-01", 9, 16, *durations, max_joints=500)
+    assert "500" in str(message.children)
+
+    result = show_cheapest_plan(1, "2022-09-30", 0, 3, "2022-08-01", 9, 16, *durations, max_joints=500)
+    assert "완료 예정" in str(result)
@@ -0,0 +1,51 @@
+"""
+calendar_store 에 저장되는 달력 표 파일 확인
+
+    python -m pytest tests
+"""
+import datetime
+
+import pytest
+
+from src import calendar_store
+from src.working_calendar import WorkingCalendar, calendar_blocks
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCHEDULE_CALENDAR_DIR", str(tmp_path))
+    monkeypatch.setattr(calendar_store, "_directory", None)
+    return tmp_path
+
+
+def test_widens_in_aligned_blocks(store):
+    calendar = WorkingCalendar(2022, 2022, 9, 16)
+    assert (calendar.first_year, calendar.last_year) == (2020, 2039)
+    # 몇 해씩 넘어가며 넓혀도 블록 파일만 생긴다
+    for year in (2041, 2045, 2063, 2064):
+        calendar.next_working(datetime.datetime(year, 3, 1))
+    assert (calendar.first_year, calendar.last_year) == (2020, 2079)
+    names = sorted(path.name for path in store.glob("*/hours_*"))
+    assert names == sorted(
+        f"hours_{first}-{last}_{calendar._table_key()}_{kind}.npy"
+        for first, last in [(2020, 2039), (2040, 2059), (2060, 2079)] for kind in ("mask", "working")
+    )
+
+    # 블록을 이은 표도 한 번에 만든 표와 같다
+    fresh = WorkingCalendar(2020, 2079, 9, 16)
+    assert (calendar._table[3] == fresh._table[3]).all()
+    assert (calendar._table[4] == fresh._table[4]).all()
+
+
+def test_rejects_years_outside_datetime64_range():
+    with pytest.raises(ValueError):
+        calendar_blocks(2020, 2300)
+
+
+def test_removes_stale_version_directories(store):
+    (store / "v1-holidays-0.1").mkdir()
+    (store / "v1-holidays-0.1" / "hours_2020-2030_three_day_shift_mask.npy").write_bytes(b"")
+    (store / "other").mkdir()
+
+    calendar_store.table_directory()
+    assert sorted(path.name for path in store.iterdir()) == ["other"]
@@ -0,0 +1,56 @@
+"""
+cli 가 실패한 시나리오를 건너뛰고 나머지를 계속 계산하는지 확인
+
+    python -m pytest tests
+"""
+import csv
+import json
+
+import pandas as pd
+import pytest
+
+from src import cli
+
+SCENARIO = dict(
+    num_joints=2, start_time="2022-08-01", injection_time=1, curing_time=1, cooling_time=1,
+    mold_reset_time=1, mold_preheating_time=1, drying_time=1, outsourcing_time=1,
+    final_touch_time=1, working_time_min=9, working_time_max=16,
+)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failed_scenarios_are_reported(tmp_path, workers):
+    lines = [
+        json.dumps(dict(SCENARIO, scenario="ok_1")),
+        "{not json",
+        json.dumps(dict(SCENARIO, scenario="loose", num_joints=1.5)),
+        json.dumps(dict(SCENARIO, scenario="too_long", start_time="2262-01-01", final_touch_time=300)),
+        json.dumps(dict(SCENARIO, scenario="ok_2")),
+    ]
+    scenarios = tmp_path / "scenarios.jsonl"
+    scenarios.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    output = tmp_path / "schedules.csv"
+
+    status = cli.main([str(scenarios), "--output", str(output), "--workers", str(workers)])
+
+    assert status == 1
+    df = pd.read_csv(output)
+    assert sorted(df["Scenario"].unique()) == ["ok_1", "ok_2"]
+    assert len(df) == 2 * 2 * 7
+    with open(str(output) + ".errors.csv", encoding="utf-8", newline="") as f:
+        failures = list(csv.DictReader(f))
+    assert [row["Scenario"] for row in failures] == ["2", "loose", "too_long"]
+    assert all(row["Error"] for row in failures)
+
+
+def test_no_error_file_when_all_succeed(tmp_path):
+    scenarios = tmp_path / "scenarios.csv"
+    with open(scenarios, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(SCENARIO))
+        writer.writeheader()
+        writer.writerow(SCENARIO)
+    output = tmp_path / "summary.csv"
+
+    assert cli.main([str(scenarios), "--output", str(output), "--workers", "1", "--summary"]) == 0
+    assert len(pd.read_csv(output)) == 1
+    assert not (tmp_path / "summary.csv.errors.csv").exists()
@@ -0,0 +1,33 @@
+"""
+export 의 iCalendar UID 확인
+
+    python -m pytest tests
+"""
+import re
+
+from src.export import iter_ics
+from src.production import calculate_production_time_batch
+
+
+def uids(df, product_name):
+    text = b"".join(iter_ics(df, product_name, chunk_size=5)).decode("utf-8")
+    return re.findall(r"^UID:(.+)\r$", text, flags=re.MULTILINE)
+
+
+def schedule(start_time, final_touch_time=1):
+    return calculate_production_time_batch(2, start_time, 1, 1, 1, 1, 1, 1, 1, final_touch_time, 9, 16)
+
+
+def test_uids_are_unique_across_schedules():
+    first = uids(schedule("2022-08-01"), "접속재")
+    assert len(first) == len(set(first)) == 2 * 7
+
+    other_start = uids(schedule("2022-09-01"), "접속재")
+    other_product = uids(schedule("2022-08-01"), "접속함")
+    assert not set(first) & set(other_start)
+    assert not set(first) & set(other_product)
+
+
+def test_uids_are_stable_for_the_same_schedule():
+    # 같은 제품/시작일이면 소요 시간이 바뀌어도 같은 event 를 고친다
+    assert uids(schedule("2022-08-01"), "154kV") == uids(schedule("2022-08-01", final_touch_time=2), "154kV")
@@ -0,0 +1,82 @@
+"""
+IncrementalScheduler 가 입력을 조금씩 바꿔도 calculate_production_time_batch 와 같은
+일정을 만드는지 확인 (무작위 입력 변경을 이어서 적용)
+
+    python -m pytest tests
+"""
+import random
+
+import pandas as pd
+import pytest
+
+from src.incremental import IncrementalScheduler
+from src.production import calculate_production_time_batch
+
+PARAMS = dict(
+    num_joints=20, start_time="2022-09-01", injection_time=1, curing_time=1, cooling_time=1,
+    mold_reset_time=1, mold_preheating_time=1, drying_time=1, outsourcing_time=1,
+    final_touch_time=1, working_time_min=9, working_time_max=16,
+    work_on_saturday=False, work_on_sunday=False, work_on_holiday=False, three_day_shift=False,
+    working_time_mode=False, num_molds=1,
+)
+
+# 입력값별로 바꿔 볼 값
+CHOICES = dict(
+    num_joints=[1, 5, 19, 20, 21, 40, 60],
+    start_time=["2022-09-01", "2022-09-08", "2023-01-20"],
+    injection_time=[1, 1.5, 6],
+    mold_reset_time=[0.75, 1, 2.5],
+    mold_preheating_time=[1, 3.5],
+    drying_time=[0.3, 1, 1.5],
+    outsourcing_time=[1, 2.25, 4],
+    final_touch_time=[0.5, 1, 1.2],
+    working_time_min=[7, 9],
+    working_time_max=[16, 17],
+    work_on_saturday=[False, True],
+    work_on_holiday=[False, True],
+    three_day_shift=[False, True],
+    working_time_mode=[False, True],
+    num_molds=[1, 2, 3],
+)
+
+
+def assert_same_schedule(actual, expected):
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True), expected.reset_index(drop=True), check_categorical=False,
+    )
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_random_edits_match_batch(seed):
+    rng = random.Random(seed)
+    scheduler = IncrementalScheduler()
+    params = dict(PARAMS)
+    for _ in range(25):
+        # 자주 바뀌는 num_joints 와 후공정 시간을 더 자주 고른다
+        names = rng.choice([
+            ["num_joints"], ["num_joints"], ["drying_time", "final_touch_time"],
+            [rng.choice(list(CHOICES))], rng.sample(list(CHOICES), 2),
+        ])
+        for name in names:
+            params[name] = rng.choice(CHOICES[name])
+        assert_same_schedule(scheduler.schedule(**params), calculate_production_time_batch(**params))
+
+
+def test_reuses_checkpoints():
+    scheduler = IncrementalScheduler()
+    scheduler.schedule(**dict(PARAMS, num_joints=30))
+    assert scheduler.num_checkpoints == 30
+
+    calls = []
+    df = scheduler.schedule(**dict(PARAMS, num_joints=32), progress=lambda done, total: calls.append(done))
+    assert scheduler.num_checkpoints == 32
+    assert calls and min(calls) > 30
+    assert_same_schedule(df, calculate_production_time_batch(**dict(PARAMS, num_joints=32)))
+
+    # 후공정 시간만 바뀌면 checkpoint 를 그대로 쓴다
+    scheduler.schedule(**dict(PARAMS, num_joints=10, drying_time=2))
+    assert scheduler.num_checkpoints == 32
+
+    # 금형 공정 시간이 바뀌면 처음부터
+    scheduler.schedule(**dict(PARAMS, num_joints=10, injection_time=2))
+    assert scheduler.num_checkpoints == 10
@@ -0,0 +1,62 @@
+"""
+metrics.install_profiler 가 요청이 겹쳐도 profiler 를 하나만 켜는지 확인
+
+    python -m pytest tests
+"""
+import threading
+
+import flask
+import pytest
+
+from src import metrics
+
+
+@pytest.fixture
+def profiled(tmp_path):
+    server = flask.Flask(__name__)
+    started = threading.Event()
+    release = threading.Event()
+
+    @server.route("/slow")
+    def slow():
+        started.set()
+        release.wait(10)
+        return "slow"
+
+    @server.route("/fast")
+    def fast():
+        return "fast"
+
+    @server.route("/error")
+    def error():
+        raise RuntimeError("error")
+
+    metrics.install_profiler(server, str(tmp_path))
+    return server, tmp_path, started, release
+
+
+def test_overlapping_requests_skip_profile(profiled):
+    server, directory, started, release = profiled
+    thread = threading.Thread(target=lambda: server.test_client().get("/slow"))
+    thread.start()
+    try:
+        assert started.wait(10)
+        response = server.test_client().get("/fast")
+        assert response.status_code == 200
+    finally:
+        release.set()
+        thread.join(10)
+
+    names = sorted(path.name for path in directory.iterdir())
+    assert len(names) == 1 and names[0].endswith("_slow.prof")
+
+    assert server.test_client().get("/fast").status_code == 200
+    assert len(list(directory.glob("*_fast.prof"))) == 1
+
+
+def test_error_releases_profiler(profiled):
+    server, directory, _, _ = profiled
+    server.testing = False
+    assert server.test_client().get("/error").status_code == 500
+    assert server.test_client().get("/fast").status_code == 200
+    assert len(list(directory.glob("*_fast.prof"))) == 1
@@ -0,0 +1,70 @@
+"""
+find_cheapest_plan 이 모든 후보 계획을 끝까지 계산한 결과와 같은 연장 근무를 찾는지 확인
+
+    python -m pytest tests
+"""
+import datetime
+
+import pytest
+
+from src.optimizer import candidate_plans, find_cheapest_plan, parse_deadline
+from src.production import calculate_schedule_arrays
+from src.working_calendar import get_working_calendar
+
+# (접속재 수, 시작일, 납기, 소요 시간 8 개, working_time_mode, 금형 수)
+CASES = [
+    (10, "2022-09-01", "2022-12-30", (1, 1, 1, 1, 1, 1, 1, 1), False, 1),
+    (10, "2022-09-01", "2022-09-14", (1, 1, 1, 1, 1, 1, 1, 1), False, 1),
+    (30, "2022-09-01", "2022-09-20", (1, 1, 1, 1, 1, 1, 1, 1), False, 1),
+    (30, "2022-09-01", "2022-09-16", (1, 1, 1, 1, 1, 1, 1, 1), False, 1),
+    (20, "2023-09-20", "2023-10-10", (1.5, 2, 1, 0.5, 1, 1, 2, 0.5), True, 1),
+    (40, "2024-02-05", "2024-02-20 18:00", (2, 1, 1, 1, 1, 0.5, 1, 1), False, 2),
+    (15, "2022-08-01", "2022-08-03", (1, 1, 1, 1, 1, 1, 1, 1), False, 1),
+]
+
+
+def brute_force(deadline, num_joints, start_time, durations, working_time_mode, num_molds,
+                working_time_min=9, working_time_max=16, max_extra_hours=2):
+    """후보 계획마다 전체 일정을 계산해 납기 안에 끝나는 것 중 가장 적은 연장 근무"""
+    deadline = parse_deadline(deadline)
+    start = datetime.datetime.strptime(start_time, '%Y-%m-%d')
+    base = get_working_calendar(working_time_min, working_time_max)
+    best = None
+    for plan in candidate_plans(working_time_min, working_time_max, max_extra_hours):
+        schedule = calculate_schedule_arrays(
+            num_joints, start_time, *durations, plan.working_time_min, plan.working_time_max,
+            plan.work_on_saturday, plan.work_on_sunday, plan.work_on_holiday, plan.three_day_shift,
+            working_time_mode=working_time_mode, num_molds=num_molds,
+        )
+        finish = schedule.last_finish()
+        if finish > deadline:
+            continue
+        calendar = get_working_calendar(*plan)
+        overtime = calendar.working_hours_between(start, finish) - base.working_hours_between(start, finish)
+        if best is None or overtime < best:
+            best = overtime
+    return best
+
+
+@pytest.mark.parametrize("num_joints, start_time, deadline, durations, working_time_mode, num_molds", CASES)
+def test_matches_brute_force(num_joints, start_time, deadline, durations, working_time_mode, num_molds):
+    result = find_cheapest_plan(
+        deadline, num_joints, start_time, *durations, 9, 16, max_extra_hours=2,
+        working_time_mode=working_time_mode, num_molds=num_molds,
+    )
+    expected = brute_force(deadline, num_joints, start_time, durations, working_time_mode, num_molds)
+
+    if expected is None:
+        assert result.plan is None
+        return
+    assert result.plan is not None
+    assert result.overtime_hours == expected
+    assert result.finish <= parse_deadline(deadline)
+    # 찾은 계획으로 다시 계산해도 같은 완료 시간
+    plan = result.plan
+    schedule = calculate_schedule_arrays(
+        num_joints, start_time, *durations, plan.working_time_min, plan.working_time_max,
+        plan.work_on_saturday, plan.work_on_sunday, plan.work_on_holiday, plan.three_day_shift,
+        working_time_mode=working_time_mode, num_molds=num_molds,
+    )
+    assert schedule.last_finish() == result.finish
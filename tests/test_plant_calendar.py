@@ -0,0 +1,127 @@
+"""
+PlantCalendar 정의 읽기/공정별 달력 확인
+
+    python -m pytest tests
+"""
+import datetime
+
+import numpy as np
+import pytest
+
+from src import plant_calendar
+from src.plant_calendar import PlantCalendar, calculate_schedule_with_calendar, load_plant_calendar
+
+
+def test_loads_documented_yaml_example(tmp_path):
+    yaml = pytest.importorskip("yaml")
+    docstring = plant_calendar.__doc__
+    example = docstring[docstring.index("    years:"):docstring.index("공정 이름은")]
+    path = tmp_path / "plant.yaml"
+    path.write_text(example, encoding="utf-8")
+    assert yaml.safe_load(example)["holidays"] is False
+
+    calendar = load_plant_calendar(str(path))
+    # 광복절(공휴일)은 쉬고 다음날 08:00 부터
+    assert calendar.next_working(datetime.datetime(2022, 8, 15, 9)) == datetime.datetime(2022, 8, 16, 8)
+    # 외주처는 2022-08-12 까지 휴무, 09:00 부터
+    assert calendar.stage("outsourcing").next_working(
+        datetime.datetime(2022, 8, 10, 9)
+    ) == datetime.datetime(2022, 8, 16, 9)
+
+
+@pytest.mark.parametrize("value, expected", [(False, "off"), (True, "work"), ("off", "off"), ("work", "work")])
+def test_holidays_accepts_yaml_booleans(value, expected):
+    calendar = PlantCalendar({"holidays": value, "years": [2022, 2022]})
+    assert calendar._definition["holidays"] == expected
+    assert calendar.is_working(datetime.datetime(2022, 8, 15, 10)) == (expected == "work")
+
+
+def dt(*args):
+    return datetime.datetime(*args)
+
+
+DEFINITION = {
+    "years": [2022, 2022],
+    "shifts": {"weekday": ["08:00-12:00", "13:00-17:00"], "saturday": ["08:00-12:00"], "sunday": []},
+    "shutdowns": [["2022-07-25", "2022-08-05"]],
+    "workdays": ["2022-08-07", "2022-08-15"],
+    "stages": {
+        "outsourcing": {"shifts": {"weekday": ["09:00-18:00"]}, "pickup_hour": 14},
+        "final_touch": {"shutdowns": [], "holidays": "work"},
+    },
+}
+
+
+def test_shifts_skip_lunch_and_nights():
+    calendar = PlantCalendar(DEFINITION)
+    # 2022-08-08 (월) 11:00 부터 3 시간: 점심 1 시간을 건너뛴다
+    assert calendar.add_working_hours(dt(2022, 8, 8, 11), 3) == dt(2022, 8, 8, 15)
+    assert calendar.working_hours_between(dt(2022, 8, 8, 11), dt(2022, 8, 8, 15)) == 3
+    assert calendar.next_working(dt(2022, 8, 8, 12, 30)) == dt(2022, 8, 8, 13)
+    # 금요일 16:00 부터 6 시간 -> 토요일 오전 4 시간 -> 광복절(workdays) 08:00 ~ 09:00
+    assert calendar.add_working_hours(dt(2022, 8, 12, 16), 6) == dt(2022, 8, 15, 9)
+
+
+def test_shutdowns_and_workdays():
+    calendar = PlantCalendar(DEFINITION)
+    assert not calendar.is_working(dt(2022, 7, 25, 9))
+    assert calendar.next_working(dt(2022, 7, 28, 9)) == dt(2022, 8, 6, 8)
+    # workdays 는 일요일/공휴일이어도 평일 구간으로 근무
+    assert calendar.is_working(dt(2022, 8, 7, 14))
+    assert calendar.is_working(dt(2022, 8, 15, 14))
+    assert not calendar.is_working(dt(2022, 9, 12, 9))      # 추석 연휴
+
+
+def test_stage_overrides_only_given_items():
+    calendar = PlantCalendar(DEFINITION)
+    outsourcing = calendar.stage("outsourcing")
+    final_touch = calendar.stage("final_touch")
+    assert calendar.stage("injection") is calendar
+    assert calendar.pickup_hour == 10 and outsourcing.pickup_hour == 14
+
+    # 외주처: shifts 는 통째로 바뀌고 (적지 않은 토요일은 기본값인 휴무) 휴무 기간은 공장과 같다
+    assert outsourcing.is_working(dt(2022, 8, 8, 12, 30))
+    assert outsourcing.next_working(dt(2022, 8, 8, 18)) == dt(2022, 8, 9, 9)
+    assert calendar.is_working(dt(2022, 8, 13, 9))
+    assert not outsourcing.is_working(dt(2022, 8, 13, 9))
+    assert not outsourcing.is_working(dt(2022, 8, 1, 10))
+    # 마무리: 휴무 기간 없음, 공휴일 근무, 구간은 공장과 같다
+    assert final_touch.is_working(dt(2022, 8, 1, 10))
+    assert final_touch.is_working(dt(2022, 10, 3, 10))
+    assert not calendar.is_working(dt(2022, 10, 3, 10))
+    assert not final_touch.is_working(dt(2022, 8, 1, 12, 30))
+
+
+def test_schedule_uses_stage_calendars():
+    calendar = PlantCalendar(DEFINITION)
+    df = calculate_schedule_with_calendar(3, "2022-08-08", 1, 1, 1, 1, 1, 1, 1, 1, calendar).to_frame()
+    process = df["Process"].astype(str)
+    outsourcing = df[process.str.startswith("외주가공_")]
+    final_touch = df[process.str.startswith("마무리 작업_")]
+    assert len(outsourcing) == 3
+    # 외주처 회수 시각(pickup_hour 14)
+    assert (outsourcing["Finish"].dt.hour == 14).all()
+    assert all(calendar.stage("outsourcing").is_working(time) for time in outsourcing["Start"])
+    assert all(calendar.stage("final_touch").is_working(time) for time in final_touch["Start"])
+
+
+def test_overnight_shift_and_year_widening():
+    calendar = PlantCalendar({"years": [2022, 2022], "shifts": {"weekday": ["22:00-06:00"]}})
+    assert calendar.is_working(dt(2022, 8, 9, 3))
+    assert calendar.add_working_hours(dt(2022, 8, 8, 22), 10) == dt(2022, 8, 10, 0)
+    # 범위 밖 날짜는 달력을 넓혀 계산한다
+    assert calendar.next_working(dt(2022, 12, 31, 7)) == dt(2023, 1, 2, 22)
+    start = np.array(["2022-12-30T23:00"], dtype="datetime64[ns]")
+    # 금요일 밤 구간(토요일 06:00 까지) 7 시간 + 월요일 밤 1 시간
+    assert calendar.add_working_hours_array(start, 8)[0] == np.datetime64("2023-01-02T23:00")
+
+
+@pytest.mark.parametrize("definition, match", [
+    ({"stages": {"painting": {}}}, "알 수 없는 공정"),
+    ({"stages": {"outsourcing": {"stages": {"injection": {}}}}}, "stages"),
+    ({"colour": "red"}, "알 수 없는 달력 항목"),
+    ({"holidays": "sometimes"}, "holidays"),
+])
+def test_invalid_definitions(definition, match):
+    with pytest.raises(ValueError, match=match):
+        PlantCalendar(definition)
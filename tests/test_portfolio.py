@@ -0,0 +1,30 @@
+"""
+schedule_portfolio 의 주문별 일정 확인
+
+    python -m pytest tests
+"""
+from src.portfolio import schedule_portfolio
+
+ORDER = dict(
+    num_joints=3, start_time="2022-08-01", injection_time=1, curing_time=1, cooling_time=1,
+    mold_reset_time=1, mold_preheating_time=1, drying_time=1, outsourcing_time=1,
+    final_touch_time=1, working_time_min=9, working_time_max=16,
+)
+
+
+def test_labels_do_not_overlap_across_orders():
+    df = schedule_portfolio([
+        dict(ORDER, product_name="154kV", mold="A"),
+        dict(ORDER, product_name="154kV", mold="A"),
+        dict(ORDER, product_name="345kV", mold="B"),
+    ], max_workers=1)
+
+    assert len(df) == 3 * 3 * 7
+    assert not df.duplicated(["Number", "Process"]).any()
+    assert sorted(df["Order"].unique()) == [1, 2, 3]
+    first = df[df["Order"] == 1]
+    assert set(first["Number"].astype(str)) == {"1/1", "1/2", "1/3"}
+    assert first["Process"].astype(str).str.startswith("1/사출_").sum() == 3
+    # 같은 금형의 두 번째 주문은 첫 주문이 금형을 비운 뒤 시작한다
+    second = df[df["Order"] == 2]
+    assert second["Start"].min() > first[first["Process"].astype(str).str.contains("탈형")]["Start"].min()
@@ -0,0 +1,54 @@
+"""
+calculate_production_time_with_resources 의 자원 수 확인
+
+자원 수에 제한이 없으면 calculate_production_time_batch 와 같은 일정이어야 한다.
+
+    python -m pytest tests
+"""
+import itertools
+
+import pandas as pd
+import pytest
+
+from src.production import calculate_production_time_batch
+from src.resources import calculate_production_time_with_resources
+
+PARAMS = (5, "2022-08-01", 1, 1, 1, 1, 1, 1, 1, 1, 9, 16)
+
+FLAG_COMBINATIONS = list(itertools.product([False, True], repeat=4))
+
+
+@pytest.mark.parametrize("start_time", ["2022-08-01", "2022-09-08", "2023-12-29"])
+@pytest.mark.parametrize("durations", [
+    (1, 1, 1, 1, 1, 1, 1, 1),
+    (1.5, 0.25, 2, 0.75, 3.5, 1.5, 2.25, 0.5),
+])
+@pytest.mark.parametrize("flags", FLAG_COMBINATIONS)
+def test_unlimited_matches_batch(start_time, durations, flags):
+    params = (12, start_time, *durations, 9, 16, *flags)
+    expected = calculate_production_time_batch(*params)
+    # 자원이 접속재 수만큼 있어도 기다릴 일이 없다
+    for capacity in [{}, dict(vendor_batch_size=1), dict(drying_racks=12, finishing_stations=12)]:
+        actual = calculate_production_time_with_resources(*params, **capacity)
+        pd.testing.assert_frame_equal(
+            actual[["Start", "Finish"]].reset_index(drop=True),
+            expected[["Start", "Finish"]].reset_index(drop=True),
+        )
+        assert list(actual["Process"].astype(str)) == list(expected["Process"].astype(str))
+        assert list(actual["Number"].astype(str)) == list(expected["Number"].astype(str))
+
+
+@pytest.mark.parametrize("name", ["drying_racks", "vendor_batch_size", "finishing_stations"])
+@pytest.mark.parametrize("value", [0, -1, 1.5, "2", True])
+def test_rejects_invalid_capacity(name, value):
+    with pytest.raises(ValueError, match=name):
+        calculate_production_time_with_resources(*PARAMS, **{name: value})
+
+
+def test_single_station():
+    df = calculate_production_time_with_resources(
+        *PARAMS, drying_racks=1, vendor_batch_size=1, finishing_stations=1)
+    drying = df[df["Process"].astype(str).str.startswith("건조_")].sort_values("Start")
+    assert len(drying) == 5
+    # 건조대가 1개면 앞 접속재의 건조가 끝나야 다음 건조를 시작한다
+    assert (drying["Start"].iloc[1:].values >= drying["Finish"].iloc[:-1].values).all()
@@ -0,0 +1,41 @@
+"""
+ScheduleCache 기본 경로/권한 확인
+
+    python -m pytest tests
+"""
+import os
+import stat
+
+import pytest
+
+from src import schedule_cache
+from src.schedule_cache import ScheduleCache, default_cache_path
+
+
+def test_default_path_is_private(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    path = default_cache_path()
+    directory = os.path.dirname(path)
+    assert directory == str(tmp_path / "production_schedule")
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+
+    cache = ScheduleCache()
+    cache.set("schedule", (1,), {"a": 1})
+    assert cache.get("schedule", (1,)) == {"a": 1}
+
+
+def test_tightens_existing_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    (tmp_path / "production_schedule").mkdir(mode=0o777)
+    os.chmod(tmp_path / "production_schedule", 0o777)
+    default_cache_path()
+    assert stat.S_IMODE(os.stat(tmp_path / "production_schedule").st_mode) == 0o700
+
+
+def test_refuses_file_owned_by_someone_else(tmp_path, monkeypatch):
+    cache = ScheduleCache(str(tmp_path / "cache.sqlite3"))
+    cache.set("schedule", (1,), 1)
+    cache._local.connection = None
+    monkeypatch.setattr(schedule_cache.os, "getuid", lambda: os.stat(cache.path).st_uid + 1, raising=False)
+    with pytest.raises(PermissionError):
+        cache.get("schedule", (1,))
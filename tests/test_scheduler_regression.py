@@ -0,0 +1,115 @@
+"""
+calculate_production_time 이 예전 한 시간씩 기다리던 loop 와 같은 일정을 만드는지 확인
+
+reference_production_time 은 WorkingCalendar 도입 전 코드의 동작을 그대로 옮긴 것이다
+(작업 시간이 아니면 timedelta(hours=1) 씩 더하며 check_if_working_day 를 다시 확인).
+여러 해의 시작일(명절, 연휴 포함) x 근무 조건 16 가지 x 소수 소요 시간을 비교한다.
+
+    python -m pytest tests
+"""
+import datetime
+import itertools
+
+import holidays
+import pytest
+
+from src.production import calculate_production_time, calculate_production_time_batch
+
+FLAG_COMBINATIONS = list(itertools.product([False, True], repeat=4))
+
+# 2019 ~ 2026 의 약 7 주 간격 시작일 + 설/추석/연말 연휴 직전
+START_DATES = [
+    (datetime.date(2019, 1, 3) + datetime.timedelta(days=47 * i)).isoformat() for i in range(60)
+] + [
+    "2022-09-08", "2023-01-20", "2023-09-27", "2024-02-08", "2024-12-31", "2025-10-02",
+]
+
+# (사출, 경화, 냉각, 탈형/조립, 금형 예열 [시간], 건조, 외주 가공, 마무리 [일])
+DURATIONS = [
+    (1, 1, 1, 1, 1, 1, 1, 1),
+    (1.5, 0.25, 2, 0.75, 3.5, 1.5, 2.25, 0.5),
+    (6, 12, 4, 2.5, 1, 0.3, 4, 1.2),
+]
+
+WORKING_WINDOWS = [(9, 16), (7, 17)]
+
+_holidays = holidays.KR()
+
+
+def reference_working_day(date_time, working_time_min, working_time_max,
+                          work_on_saturday, work_on_sunday, work_on_holiday, three_day_shift):
+    """예전 check_if_working_day (분기를 하나로 합쳤을 뿐 규칙은 같음)"""
+    if three_day_shift:
+        return True
+    if not work_on_saturday and date_time.weekday() == 5:
+        return False
+    if not work_on_sunday and date_time.weekday() == 6:
+        return False
+    if not work_on_holiday and date_time in _holidays:
+        return False
+    return working_time_min <= date_time.hour <= working_time_max
+
+
+def reference_production_time(
+    num_joints, start_time, injection_time, curing_time, cooling_time, mold_reset_time,
+    mold_preheating_time, drying_time, outsourcing_time, final_touch_time,
+    working_time_min, working_time_max, *flags,
+):
+    """예전 calculate_production_time 의 (Start, Finish) 목록"""
+    def wait(time):
+        while not reference_working_day(time, working_time_min, working_time_max, *flags):
+            time = time + datetime.timedelta(hours=1)
+        return time
+
+    start, finish = [], []
+    time = datetime.datetime.strptime(start_time, '%Y-%m-%d')
+    for _ in range(num_joints):
+        time = wait(time)
+        for duration in (injection_time, curing_time, cooling_time):
+            start.append(time)
+            time = time + datetime.timedelta(hours=duration)
+            finish.append(time)
+
+        time = wait(time)
+        start.append(time)
+        time = time + datetime.timedelta(hours=mold_reset_time)
+        finish.append(time)
+
+        start.append(time)
+        time_2 = time + datetime.timedelta(days=drying_time)
+        finish.append(time_2)
+
+        time_2 = wait(time_2)
+        start.append(time_2)
+        time_2 = (time_2 + datetime.timedelta(days=outsourcing_time)).replace(hour=10)
+        finish.append(time_2)
+
+        time_2 = wait(time_2)
+        start.append(time_2)
+        time_2 = time_2 + datetime.timedelta(days=final_touch_time)
+        finish.append(time_2)
+
+        time = time + datetime.timedelta(hours=mold_preheating_time)
+    return start, finish
+
+
+@pytest.mark.parametrize("flags", FLAG_COMBINATIONS, ids=lambda flags: "".join(str(int(f)) for f in flags))
+def test_matches_hour_by_hour_loop(flags):
+    for start_time, durations, window in itertools.product(START_DATES, DURATIONS, WORKING_WINDOWS):
+        args = (3, start_time, *durations, *window, *flags)
+        expected_start, expected_finish = reference_production_time(*args)
+
+        df = calculate_production_time(*args)
+        assert list(df["Start"]) == expected_start, args
+        assert list(df["Finish"]) == expected_finish, args
+
+
+@pytest.mark.parametrize("flags", FLAG_COMBINATIONS, ids=lambda flags: "".join(str(int(f)) for f in flags))
+def test_batch_matches_hour_by_hour_loop(flags):
+    for start_time, durations in itertools.product(START_DATES[::4], DURATIONS):
+        args = (5, start_time, *durations, 9, 16, *flags)
+        expected_start, expected_finish = reference_production_time(*args)
+
+        df = calculate_production_time_batch(*args)
+        assert [t.to_pydatetime() for t in df["Start"]] == expected_start, args
+        assert [t.to_pydatetime() for t in df["Finish"]] == expected_finish, args
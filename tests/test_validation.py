@@ -0,0 +1,44 @@
+"""
+validate_schedule_inputs 의 소요시간/전체 기간 상한 확인
+
+    python -m pytest tests
+"""
+import datetime
+import itertools
+
+import pytest
+
+from src.production import calculate_schedule_arrays
+from src.validation import estimate_horizon_days, validate_schedule_inputs
+
+DURATIONS = dict(
+    injection_time=1, curing_time=1, cooling_time=1, mold_reset_time=1,
+    mold_preheating_time=1, drying_time=1, outsourcing_time=1, final_touch_time=1,
+)
+
+
+@pytest.mark.parametrize("absurd", [
+    {"curing_time": 1e9}, {"drying_time": 1e12}, {"injection_time": 8761}, {"final_touch_time": 366},
+])
+def test_rejects_long_durations(absurd):
+    assert validate_schedule_inputs(3, "2022-08-01", 9, 16, **{**DURATIONS, **absurd})
+
+
+def test_rejects_horizon_past_datetime64_range():
+    assert validate_schedule_inputs(10**9, "2022-08-01", 9, 16, **DURATIONS)
+    assert validate_schedule_inputs(300, "2200-01-01", 9, 16, **{**DURATIONS, "mold_reset_time": 8760})
+    assert not validate_schedule_inputs(5000, "2022-08-01", 9, 16, **DURATIONS)
+
+
+@pytest.mark.parametrize("window", [(0, 0), (9, 16), (0, 23)])
+def test_horizon_estimate_is_an_upper_bound(window):
+    durations = {**DURATIONS, "injection_time": 30, "mold_reset_time": 9, "outsourcing_time": 4.5}
+    start = datetime.datetime(2023, 1, 20)   # 설 연휴 직전
+    for num_joints, num_molds, working_time_mode in itertools.product([1, 40], [1, 3], [False, True]):
+        schedule = calculate_schedule_arrays(
+            num_joints, f"{start:%Y-%m-%d}", **durations,
+            working_time_min=window[0], working_time_max=window[1],
+            working_time_mode=working_time_mode, num_molds=num_molds,
+        )
+        days = (schedule.last_finish() - start) / datetime.timedelta(days=1)
+        assert days <= estimate_horizon_days(num_joints, num_molds, *window, **durations)
@@ -0,0 +1,25 @@
+"""
+WorkingCalendar 에 작업 시간이 없을 때의 오류 확인
+
+    python -m pytest tests
+"""
+import datetime
+
+import numpy as np
+import pytest
+
+from src.working_calendar import WorkingCalendar
+
+START = datetime.datetime(2022, 8, 1, 9)
+
+
+@pytest.mark.parametrize("call", [
+    lambda calendar: calendar.next_working(START),
+    lambda calendar: calendar.next_working_array(np.array([START], dtype="datetime64[ns]")),
+    lambda calendar: calendar.add_working_hours(START, 2),
+    lambda calendar: calendar.add_working_hours_array(np.array([START], dtype="datetime64[ns]"), 2),
+])
+def test_no_working_hours(call):
+    calendar = WorkingCalendar(2022, 2022, 17, 9)
+    with pytest.raises(ValueError, match="작업 가능 시간이 없습니다 .working_time_min=17, working_time_max=9."):
+        call(calendar)
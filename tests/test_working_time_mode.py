@@ -0,0 +1,89 @@
+"""
+working_time_mode (LABOR_STAGES 는 작업 시간만 소요 시간으로 셈) 계산 확인
+
+reference_add_working_hours 는 한 시간 칸씩 넘어가며 작업 시간 칸에 있는 시간만
+세는 단순한 loop 이다.
+
+    python -m pytest tests
+"""
+import datetime
+import itertools
+
+import numpy as np
+import pytest
+
+from src.production import calculate_production_time_batch
+from src.working_calendar import get_working_calendar
+
+from .test_scheduler_regression import FLAG_COMBINATIONS, reference_working_day
+
+HOUR = datetime.timedelta(hours=1)
+
+STARTS = [
+    datetime.datetime(2022, 8, 1, 9), datetime.datetime(2022, 8, 5, 15, 30),
+    datetime.datetime(2022, 8, 12, 16, 45), datetime.datetime(2022, 9, 8, 14),
+    datetime.datetime(2022, 12, 31, 3), datetime.datetime(2023, 1, 20, 11, 20),
+]
+HOURS = [0.25, 1, 2.5, 6, 7.75, 8, 13, 40]
+
+
+def reference_add_working_hours(time, hours, working_time_min, working_time_max, *flags):
+    remaining = datetime.timedelta(hours=hours)
+    while remaining > datetime.timedelta(0):
+        slot = time.replace(minute=0, second=0, microsecond=0)
+        slot_end = slot + HOUR
+        if reference_working_day(slot, working_time_min, working_time_max, *flags):
+            step = min(remaining, slot_end - time)
+            remaining -= step
+            time += step
+        else:
+            time = slot_end
+    return time
+
+
+@pytest.mark.parametrize("flags", FLAG_COMBINATIONS, ids=lambda flags: "".join(str(int(f)) for f in flags))
+def test_add_working_hours_matches_loop(flags):
+    for window in [(9, 16), (7, 17)]:
+        calendar = get_working_calendar(*window, *flags)
+        for start, hours in itertools.product(STARTS, HOURS):
+            expected = reference_add_working_hours(start, hours, *window, *flags)
+            assert calendar.add_working_hours(start, hours) == expected, (start, hours, window)
+
+        starts = np.array(STARTS, dtype="datetime64[ns]")
+        for hours in HOURS:
+            expected = [reference_add_working_hours(start, hours, *window, *flags) for start in STARTS]
+            actual = calendar.add_working_hours_array(starts, hours)
+            assert list(actual) == list(np.array(expected, dtype="datetime64[ns]")), hours
+
+
+@pytest.mark.parametrize("flags", FLAG_COMBINATIONS[::3])
+def test_working_hours_between_inverts_add(flags):
+    calendar = get_working_calendar(9, 16, *flags)
+    for start, hours in itertools.product(STARTS, [1, 6, 8, 13, 40]):
+        start = calendar.next_working(start.replace(minute=0))
+        finish = calendar.add_working_hours(start, hours)
+        assert calendar.working_hours_between(start, finish) == hours
+
+
+def test_zero_hours_and_three_day_shift():
+    calendar = get_working_calendar(9, 16)
+    night = datetime.datetime(2022, 8, 1, 22)
+    assert calendar.add_working_hours(night, 0) == night
+
+    shift = get_working_calendar(9, 16, three_day_shift=True)
+    assert shift.add_working_hours(night, 7.5) == night + datetime.timedelta(hours=7.5)
+
+
+def test_labor_stages_in_schedule():
+    # 작업 시간대가 15, 16 시 칸(하루 2 시간)이면 6 시간 사출은 사흘째 17 시에 끝난다
+    args = (1, "2022-08-01", 6, 1, 1, 1.5, 1, 1, 1, 1, 15, 16)
+    df = calculate_production_time_batch(*args, working_time_mode=True)
+    injection, mold_reset = df.iloc[0], df.iloc[3]
+    assert injection["Start"] == datetime.datetime(2022, 8, 1, 15)
+    assert injection["Finish"] == datetime.datetime(2022, 8, 3, 17)
+    # 경화/냉각은 그대로 이어지고 탈형/조립(1.5 시간)은 다음 작업 시간에 이어서 끝난다
+    assert mold_reset["Start"] == datetime.datetime(2022, 8, 4, 15)
+    assert mold_reset["Finish"] == datetime.datetime(2022, 8, 4, 16, 30)
+
+    df = calculate_production_time_batch(*args, working_time_mode=False)
+    assert df.iloc[0]["Finish"] == datetime.datetime(2022, 8, 1, 21)